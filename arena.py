@@ -0,0 +1,360 @@
+# Arène : partie libre à N joueurs (16 à 64 agents sur de grands labyrinthes), sans affichage
+# python arena.py --players 32 --width 201 --height 201 --steps 500 playerExample1 playerExample2
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import functools
+import importlib
+import math
+import os
+import time
+import events
+from engine import ChallengeEngine, PlayerStats, BasePlayer
+
+class ArenaResult:
+    def __init__(self, steps: int, names: list[str], scores: list[int], stats: list[PlayerStats]) -> None:
+        self.steps = steps
+        self.names = names
+        self.scores = scores
+        self.stats = stats
+
+    def ranking(self):
+        """
+            Les numéros des joueurs (à partir de 1), du meilleur score au moins bon.
+        """
+        return sorted(range(1, len(self.scores) + 1), key=lambda n: -self.scores[n - 1])
+
+    def format(self):
+        lines = ['{:>3}  {:<30} {:>7} {:>8} {:>8}'.format('#', 'Joueur', 'Score', 'Pénalité', 'Retards')]
+        for rank, n in enumerate(self.ranking()):
+            s = self.stats[n - 1]
+            lines.append('{:>3}  {:<30} {:>7} {:>8} {:>8}'.format(
+                rank + 1, (str(n) + '. ' + self.names[n - 1])[:30], self.scores[n - 1], s.penalty, s.timeouts
+            ))
+        return '\n'.join(lines)
+
+class ArenaEngine(ChallengeEngine):
+    """
+        Partie libre à N joueurs, avec les règles et les réglages de ChallengeEngine.
+
+        Les joueurs sont numérotés de 1 à N et gardés dans des listes (positions, types, scores, stats, indexées à partir
+        de 0). L'occupation du labyrinthe est tenue à jour à chaque déplacement dans occupancy (position -> indices des
+        joueurs sur cette case) : les réapparitions évitent les cases occupées sans parcourir les joueurs, et les
+        croisements sont résolus en un seul passage sur les cases occupées. Les joueurs sont aussi rangés dans une grille
+        de seaux (buckets) d'environ un joueur chacun, pour trouver l'adversaire le plus proche sans parcourir tous les
+        joueurs. Le coût d'une étape du moteur est donc linéaire en nombre de joueurs.
+
+        Règles propres à l'arène :
+            - les joueurs sur une même case ramassent tous son contenu, qui n'est consommé qu'une fois ;
+            - sur une case où sont présents exactement deux types, chaque joueur du type gagnant gagne scoreCrossValue
+                par joueur battu, et les joueurs battus réapparaissent sur des cases libres. Avec un seul type, ou les
+                trois (Pierre, Ciseaux et Feuille se battent en cycle), personne ne gagne ;
+            - en mode simultané, les joueurs qui échangent leurs cases se croisent de la même manière.
+
+        Les joueurs gardent l'interface de BasePlayer.play : enemyPosition, enemyType et enemyScore décrivent
+        l'adversaire le plus proche (distance de Manhattan), ou valent None, myType et 0 si le joueur est seul.
+        Les mesures (collectMetrics) comptent la réflexion du joueur 1 dans player1Think et celle des autres joueurs dans
+        player2Think. L'enregistrement des parties (replayPath) et des vidéos (videoPath) n'est possible qu'à deux joueurs,
+        comme les paquets de scénarios (scenarioPack), qui contiennent les positions de deux joueurs.
+    """
+    # Réglages refusés avant la création de la partie : aucun fichier de sortie n'est ouvert
+    TWO_PLAYER_PARAMS = {
+        'replayPath': 'Replays are only available for two-player games',
+        'videoPath': 'Videos are only available for two-player games',
+        'scenarioPack': 'Scenario packs are only available for two-player games',
+    }
+
+    def __init__(self, *args, **kwargs) -> None:
+        for name, message in self.TWO_PLAYER_PARAMS.items():
+            if kwargs.get(name):
+                raise ValueError(message)
+        self.players = []
+        self.playerIndex = {}
+        self.positions = []
+        self.types = []
+        self.scores = []
+        self.stats = []
+        self.occupancy = {}
+        self.buckets = {}
+        self.bucketSize = 1
+        super().__init__(*args, **kwargs)
+
+    def generatePlayers(self):
+        """
+            Les joueurs ne sont placés que par registerPlayers : la génération ne tire que le labyrinthe et les bonus.
+        """
+
+    def registerPlayers(self, *players: BasePlayer): # pylint: disable=arguments-differ
+        """
+            Place les joueurs, dans l'ordre, sur des cases libres et non occupées, avec un type aléatoire.
+        """
+        if self.players:
+            raise AttributeError('Players already set !')
+        self.bucketSize = max(1, math.isqrt(self.width * self.height // max(1, len(players))))
+        for i, player in enumerate(players):
+            if player in self.playerIndex:
+                raise ValueError('The same player object is registered twice')
+            self.players.append(player)
+            self.playerIndex[player] = i
+            self.positions.append((-1, -1))
+            self.types.append(self.random.choice(self.TYPES))
+            self.scores.append(0)
+            self.stats.append(PlayerStats())
+            self.movePlayer(i, self.genPlayerPosition())
+        if self.playerWorkers or self.simultaneousMoves:
+            from workers import PlayerWorker # pylint: disable=import-outside-toplevel
+            for player in players:
+                self.workers[player] = PlayerWorker(player, self.maze, self.readOnlyMaze)
+
+    def occupiedCells(self):
+        return self.occupancy
+
+    def movePlayer(self, i: int, p):
+        """
+            Tout déplacement d'un joueur doit passer par ici, pour garder occupancy et buckets à jour.
+        """
+        old = self.positions[i]
+        if old == p:
+            return
+        players = self.occupancy.get(old)
+        if players is not None:
+            players.remove(i)
+            if not players:
+                del self.occupancy[old]
+        self.positions[i] = p
+        self.occupancy.setdefault(p, []).append(i)
+        oldBucket, bucket = self.bucketOf(old), self.bucketOf(p)
+        if oldBucket != bucket:
+            players = self.buckets.get(oldBucket)
+            if players is not None and i in players:
+                players.remove(i)
+                if not players:
+                    del self.buckets[oldBucket]
+            self.buckets.setdefault(bucket, []).append(i)
+
+    def bucketOf(self, p):
+        return (p[0] // self.bucketSize, p[1] // self.bucketSize)
+
+    def respawnPlayer(self, i: int):
+        self.movePlayer(i, (-1, -1))
+        p = self.genPlayerPosition()
+        self.movePlayer(i, p)
+        return p
+
+    def playerNumber(self, player: BasePlayer):
+        return self.playerIndex[player] + 1
+
+    def playerName(self, n: int):
+        return self.players[n - 1].name
+
+    def statsFor(self, player: BasePlayer):
+        return self.stats[self.playerIndex[player]]
+
+    def nearestOpponent(self, i: int):
+        """
+            L'indice du joueur le plus proche de i (distance de Manhattan, le plus petit indice en cas d'égalité), -1 si i
+            est seul. Les seaux sont parcourus par anneaux autour de celui de i, jusqu'à ce qu'aucun anneau plus lointain ne
+            puisse contenir un joueur plus proche.
+        """
+        if len(self.players) < 2:
+            return -1
+        x, y = self.positions[i]
+        bx, by = self.bucketOf((x, y))
+        size = self.bucketSize
+        best = (self.width + self.height + 2, -1)
+        lastRing = max(self.width, self.height) // size + 2
+        ring = 0
+        # Un joueur de l'anneau r est à une distance d'au moins (r - 1) * size + 1
+        while ring <= lastRing and (ring - 1) * size + 1 <= best[0]:
+            for key in ringBuckets(bx, by, ring):
+                for j in self.buckets.get(key, ()):
+                    if j != i:
+                        px, py = self.positions[j]
+                        best = min(best, (abs(px - x) + abs(py - y), j))
+            ring += 1
+        return best[1]
+
+    def playerArgs(self, i: int):
+        """
+            Les arguments de BasePlayer.play pour le joueur i, après le labyrinthe.
+        """
+        j = self.nearestOpponent(i)
+        if j < 0:
+            return (self.positions[i], None, self.types[i], self.types[i], self.scores[i], 0)
+        return (self.positions[i], self.positions[j], self.types[i], self.types[j], self.scores[i], self.scores[j])
+
+    def step(self):
+        self.beginStep()
+        if self.simultaneousMoves and self.workers:
+            self.stepSimultaneous()
+        else:
+            self.stepSequential()
+
+    def stepSequential(self):
+        """
+            Les joueurs jouent l'un après l'autre, dans l'ordre, chacun en voyant les coups des précédents.
+        """
+        for i, player in enumerate(self.players):
+            args = self.playerArgs(i)
+            s, p = self.judgePlayer(player, args[0], functools.partial(self.callPlayer, player, *args))
+            self.scores[i] += s
+            self.movePlayer(i, p)
+        # Les parties à N joueurs ne sont ni enregistrées ni filmées : endStep n'a pas de coups à garder
+        self.endStep(None, None)
+
+    def stepSimultaneous(self):
+        """
+            Tous les joueurs réfléchissent en même temps (chacun dans son processus) sur le même état, puis tous les coups
+            sont appliqués ensemble.
+        """
+        previous = list(self.positions)
+        for i, player in enumerate(self.players):
+            self.workers[player].send(self.maze, self.maxTime, *self.playerArgs(i))
+
+        # Les processus trop lents ne sont relancés qu'une fois toutes les réponses lues
+        moves = []
+        for i, player in enumerate(self.players):
+            s, p = self.judgePlayer(player, previous[i], functools.partial(self.workers[player].receive, False))
+            self.scores[i] += s
+            moves.append(p)
+        for player in self.players:
+            self.workers[player].recover()
+        for i, p in enumerate(moves):
+            self.movePlayer(i, p)
+        self.endStep(None, None, swaps=self.swapGroups(previous))
+
+    def swapGroups(self, previous: list):
+        """
+            Les groupes de joueurs qui ont échangé leurs cases pendant l'étape (a -> b d'un côté, b -> a de l'autre).
+        """
+        edges = {}
+        for i, a in enumerate(previous):
+            b = self.positions[i]
+            if a != b:
+                edges.setdefault((a, b), []).append(i)
+        groups = []
+        for (a, b), players in edges.items():
+            if a < b and (b, a) in edges:
+                groups.append(players + edges[(b, a)])
+        return groups
+
+    def processPoints(self, swaps: list = ()): # pylint: disable=arguments-renamed
+        """
+            Ramassage des cellules, puis résolution des croisements : un passage sur les joueurs, puis un passage sur les
+            cases occupées par plusieurs joueurs (et sur les groupes swaps du mode simultané).
+        """
+        consumed = {}
+        for i, pos in enumerate(self.positions):
+            x, y = pos
+            first = pos not in consumed
+            cell = int(self.maze[y, x]) if first else consumed[pos]
+            consumed[pos] = cell
+            if not cell:
+                continue
+            if cell == -2:
+                self.types[i] = (self.types[i] + self.random.choice([1, 2])) % len(self.TYPES)
+                if self.events.kinds[events.EVENT_REFRESH]:
+                    self.emitEvent(events.EVENT_REFRESH, i + 1, position=pos, type=self.types[i])
+            else:
+                self.scores[i] += cell
+                if self.events.kinds[events.EVENT_PICKUP]:
+                    self.emitEvent(events.EVENT_PICKUP, i + 1, position=pos, value=cell)
+            if first:
+                self.onCellConsumed(x, y, cell)
+                self.replaceMazeCell(x, y)
+        if not self.enableRPCGame:
+            return
+
+        groups = [list(players) for players in self.occupancy.values() if len(players) > 1]
+        groups.extend(swaps)
+        respawned = set()
+        for group in groups:
+            self.resolveCross([i for i in group if i not in respawned], respawned)
+
+    def resolveCross(self, group: list, respawned: set):
+        present = {self.types[i] for i in group}
+        if len(present) != 2:
+            return
+        a, b = present
+        winnerType = a if self.compareTypes(a, b) > 0 else b
+        winners = [i for i in group if self.types[i] == winnerType]
+        losers = [i for i in group if self.types[i] != winnerType]
+        respawn = []
+        for i in losers:
+            respawn.append(self.respawnPlayer(i))
+            respawned.add(i)
+        for i in winners:
+            self.scores[i] += self.scoreCrossValue * len(losers)
+            if not self.lastCross:
+                self.lastCross = i + 1
+            if self.events.kinds[events.EVENT_CROSS]:
+                self.emitEvent(events.EVENT_CROSS, i + 1, position=self.positions[i], losers=[j + 1 for j in losers], respawn=respawn)
+            self.onCross(i + 1)
+
+    def result(self):
+        return ArenaResult(
+            steps=self.currentStep,
+            names=[p.name for p in self.players],
+            scores=list(self.scores),
+            stats=self.stats,
+        )
+
+def ringBuckets(bx: int, by: int, ring: int):
+    """
+        Les seaux à la distance ring (distance de Tchebychev en seaux) du seau (bx, by).
+    """
+    if ring == 0:
+        yield (bx, by)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (bx + dx, by - ring)
+        yield (bx + dx, by + ring)
+    for dy in range(-ring + 1, ring):
+        yield (bx - ring, by + dy)
+        yield (bx + ring, by + dy)
+
+def main():
+    parser = argparse.ArgumentParser(description='Partie libre à N joueurs, sans affichage')
+    parser.add_argument('modules', nargs='+', help='Modules des joueurs (classe Player), répartis à tour de rôle')
+    parser.add_argument('--players', type=int, default=16)
+    parser.add_argument('--width', type=int, default=101)
+    parser.add_argument('--height', type=int, default=101)
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--regenerate', action='store_true', help='Régénérer les cellules consommées')
+    args = parser.parse_args()
+
+    arena = ArenaEngine(
+        width=args.width, height=args.height, steps=args.steps, randomSeed=args.seed,
+        regenerateCells=args.regenerate, playSounds=False, consoleEvents=False,
+    )
+    classes = [importlib.import_module(m).Player for m in args.modules]
+    arena.registerPlayers(*(classes[i % len(classes)](arena.cloneConfig()) for i in range(args.players)))
+    start = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        result = arena.runHeadless()
+    elapsed = time.perf_counter() - start
+    print(result.format())
+    print('{} étapes, {} joueurs : {:.1f} ms / étape'.format(result.steps, args.players, elapsed * 1000 / max(1, result.steps)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# Icônes, sons et polices de l'affichage, chargés à la première utilisation et partagés par tout le processus
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import os
+import pygame
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+ICONS_PATH = os.path.join(BASE_PATH, 'icons')
+SOUNDS_PATH = os.path.join(BASE_PATH, 'sounds')
+
+IMAGE_FILES = {
+    'star1': '1.png',
+    'star2': '2.png',
+    'star3': '3.png',
+    'refresh': 'refresh.png',
+    'p1': 'p1.png',
+    'p2': 'p2.png',
+}
+
+SOUND_FILES = {
+    'star1': 'Score1.ogg',
+    'star2': 'Score2.ogg',
+    'star3': 'Score3.ogg',
+    'refresh': 'Refresh.ogg',
+    'cross': 'Cross.ogg',
+}
+
+imageCache = {}
+soundCache = {}
+fontCache = {}
+
+def image(name: str):
+    """
+        L'icône name (voir IMAGE_FILES), convertie pour l'affichage si une fenêtre est ouverte.
+    """
+    surface = imageCache.get(name)
+    if surface is None:
+        surface = pygame.image.load(os.path.join(ICONS_PATH, IMAGE_FILES[name]))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        imageCache[name] = surface
+    return surface
+
+def sound(name: str):
+    """
+        Le son name (voir SOUND_FILES). Le mixeur audio n'est initialisé qu'au premier son chargé.
+    """
+    if not pygame.mixer.get_init():
+        # Les sons d'un mixeur arrêté (pygame.quit) ne sont plus utilisables
+        soundCache.clear()
+        pygame.mixer.init()
+    s = soundCache.get(name)
+    if s is None:
+        s = pygame.mixer.Sound(os.path.join(SOUNDS_PATH, SOUND_FILES[name]))
+        soundCache[name] = s
+    return s
+
+def font(size: int):
+    """
+        La police par défaut de pygame à la taille donnée.
+    """
+    if not pygame.font.get_init():
+        fontCache.clear()
+        pygame.font.init()
+    f = fontCache.get(size)
+    if f is None:
+        f = pygame.font.Font(None, size)
+        fontCache[size] = f
+    return f
+
+def clear():
+    """
+        Oublie toutes les ressources chargées ; à appeler avant pygame.quit(), qui les rend inutilisables.
+    """
+    imageCache.clear()
+    soundCache.clear()
+    fontCache.clear()
+
+class Images(dict):
+    """
+        Dictionnaire nom -> icône qui charge chaque icône au premier accès (pour MazeRenderer).
+    """
+    def __missing__(self, name: str):
+        surface = image(name)
+        self[name] = surface
+        return surface
@@ -0,0 +1,297 @@
+# Simulation de K parties en parallèle avec NumPy (une opération vectorisée par étape pour toutes les parties)
+# Utile pour évaluer rapidement des joueurs aléatoires ou scriptés
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import numpy as np
+from engine import ChallengeConfig, ChallengeEngine, ChallengeResult, BasePlayer, BatchPlayer
+
+DIRECTIONS = np.array(((1, 0), (-1, 0), (0, 1), (0, -1)))
+
+class BatchEngine:
+    """
+        K parties de même taille, stockées dans des tableaux empilés :
+            - mazes: (K, H, W)
+            - player1Positions, player2Positions: (K, 2), au format (x, y)
+            - player1Types, player2Types, player1Scores, player2Scores: (K,)
+
+        Chaque partie garde son propre ChallengeEngine (dont le labyrinthe est une vue sur mazes[k]) et donc son propre
+        générateur aléatoire. Les cas courants (déplacements, ramassage des points, croisements sans vainqueur) sont traités
+        en une seule opération vectorisée pour toutes les parties. Les rares événements qui consomment le générateur
+        aléatoire (changement de type, réapparition après un croisement, régénération des cellules, coup invalide) sont
+        délégués à la partie concernée, dans le même ordre que ChallengeEngine.processPoints : les résultats sont donc
+        identiques à ceux du moteur pour les mêmes graines et les mêmes coups.
+    """
+    def __init__(self, config: ChallengeConfig, seeds: list[int]) -> None:
+        kwargs = config.configKwargs()
+        kwargs['playSounds'] = False
+        kwargs['consoleEvents'] = False
+        self.games = []
+        for seed in seeds:
+            kwargs['randomSeed'] = seed
+            g = ChallengeEngine(**kwargs)
+            g.registerPlayers(BasePlayer(g.cloneConfig()), BasePlayer(g.cloneConfig()))
+            self.games.append(g)
+
+        g = self.games[0]
+        self.config = g.cloneConfig()
+        self.steps = g.steps
+        self.width, self.height = g.width, g.height
+        self.currentStep = 0
+
+        self.mazes = np.stack([g.maze for g in self.games])
+        self.freeCells = np.stack([g.freeCells.cells for g in self.games])
+        self.freeWhere = np.stack([g.freeCells.where for g in self.games])
+        self.freeCounts = np.stack([g.freeCells.count for g in self.games])
+        for k, g in enumerate(self.games):
+            g.maze = self.mazes[k]
+            g.freeCells.cells = self.freeCells[k]
+            g.freeCells.where = self.freeWhere[k]
+            g.freeCells.count = self.freeCounts[k]
+
+        self.player1Positions = np.array([g.player1Position for g in self.games], dtype=np.int64)
+        self.player2Positions = np.array([g.player2Position for g in self.games], dtype=np.int64)
+        self.player1Types = np.array([g.player1Type for g in self.games], dtype=np.int64)
+        self.player2Types = np.array([g.player2Type for g in self.games], dtype=np.int64)
+        self.player1Scores = np.zeros(len(self.games), dtype=np.int64)
+        self.player2Scores = np.zeros(len(self.games), dtype=np.int64)
+
+        self.indices = np.arange(len(self.games))
+
+    def __len__(self):
+        return len(self.games)
+
+    def validMoves(self, positions, moves):
+        dx = moves[:, 0] - positions[:, 0]
+        dy = moves[:, 1] - positions[:, 1]
+        inside = (moves[:, 0] >= 0) & (moves[:, 0] < self.width) & (moves[:, 1] >= 0) & (moves[:, 1] < self.height)
+        x = np.clip(moves[:, 0], 0, self.width - 1)
+        y = np.clip(moves[:, 1], 0, self.height - 1)
+        return inside & (np.abs(dx) + np.abs(dy) == 1) & (self.mazes[self.indices, y, x] != -1)
+
+    def randomMoves(self, positions, rng: np.random.Generator):
+        """
+            Un coup valide aléatoire pour chaque partie (joueur de référence vectorisé).
+        """
+        neighbours = positions[:, None, :] + DIRECTIONS[None, :, :]
+        isOpen = self.mazes[self.indices[:, None], neighbours[:, :, 1], neighbours[:, :, 0]] != -1
+        choice = np.argmax(rng.random(isOpen.shape) * isOpen, axis=1)
+        return neighbours[self.indices, choice]
+
+    def applyMoves(self, positions, moves, scores, player):
+        valid = self.validMoves(positions, moves)
+        positions[valid] = moves[valid]
+        for k in np.flatnonzero(~valid):
+            g = self.games[k]
+            scores[k] += g.scoreOnBadMove
+            positions[k] = g.randomMove(tuple(int(v) for v in positions[k]))
+            stats = g.player1Stats if player == 1 else g.player2Stats
+            stats.badMoves += 1
+            stats.penalty += g.scoreOnBadMove
+
+    def addFreeCells(self, k, x, y):
+        """
+            Équivalent vectorisé de FreeCells.add, pour des parties k toutes distinctes.
+        """
+        i = y * self.width + x
+        n = self.freeCounts[k, 0]
+        self.freeCells[k, n] = i
+        self.freeWhere[k, i] = n
+        self.freeCounts[k, 0] = n + 1
+
+    def syncToGame(self, k):
+        g = self.games[k]
+        g.player1Position = (int(self.player1Positions[k, 0]), int(self.player1Positions[k, 1]))
+        g.player2Position = (int(self.player2Positions[k, 0]), int(self.player2Positions[k, 1]))
+        g.player1Type, g.player2Type = int(self.player1Types[k]), int(self.player2Types[k])
+        g.player1Score, g.player2Score = int(self.player1Scores[k]), int(self.player2Scores[k])
+
+    def syncFromGame(self, k):
+        g = self.games[k]
+        self.player1Positions[k] = g.player1Position
+        self.player2Positions[k] = g.player2Position
+        self.player1Types[k], self.player2Types[k] = g.player1Type, g.player2Type
+        self.player1Scores[k], self.player2Scores[k] = g.player1Score, g.player2Score
+
+    def processPoints(self):
+        g = self.games[0]
+        k = self.indices
+        x1, y1 = self.player1Positions[:, 0], self.player1Positions[:, 1]
+        x2, y2 = self.player2Positions[:, 0], self.player2Positions[:, 1]
+        cell1 = self.mazes[k, y1, x1]
+        cell2 = self.mazes[k, y2, x2]
+        same = (x1 == x2) & (y1 == y2)
+
+        # compareTypes vectorisé : t1 gagne si t2 == (t1 + 1) % 3
+        diff = (self.player2Types - self.player1Types) % len(ChallengeEngine.TYPES)
+        cross = same & (diff != 0) if g.enableRPCGame else np.zeros(len(k), dtype=bool)
+
+        events = (cell1 == -2) | (cell2 == -2) | cross
+        if g.regenerateCells:
+            events |= (cell1 != 0) | (cell2 != 0)
+
+        fast = ~events
+        has1 = fast & (cell1 != 0)
+        has2 = fast & (cell2 != 0)
+        self.player1Scores[has1] += cell1[has1]
+        self.player2Scores[has2] += cell2[has2]
+        self.mazes[k[has1], y1[has1], x1[has1]] = 0
+        self.addFreeCells(k[has1], x1[has1], y1[has1])
+        has2 &= ~same
+        self.mazes[k[has2], y2[has2], x2[has2]] = 0
+        self.addFreeCells(k[has2], x2[has2], y2[has2])
+
+        for i in np.flatnonzero(events):
+            self.syncToGame(i)
+            self.games[i].processPoints()
+            self.syncFromGame(i)
+
+    def step(self, moves1, moves2):
+        """
+            moves1, moves2: (K, 2), les positions (x, y) visées par chaque joueur dans chaque partie.
+        """
+        self.currentStep += 1
+        self.applyMoves(self.player1Positions, np.asarray(moves1), self.player1Scores, 1)
+        self.applyMoves(self.player2Positions, np.asarray(moves2), self.player2Scores, 2)
+        self.processPoints()
+
+    def run(self, policy1, policy2):
+        """
+            policy1, policy2: fonctions (batch, myPositions, enemyPositions) -> (K, 2), appelées une fois par étape pour toutes les parties.
+        """
+        while self.currentStep < self.steps:
+            moves1 = policy1(self, self.player1Positions, self.player2Positions)
+            moves2 = policy2(self, self.player2Positions, self.player1Positions)
+            self.step(moves1, moves2)
+        return self.results()
+
+    def runPlayers(self, players1: list[BasePlayer], players2: list[BasePlayer]):
+        """
+            players1, players2: le joueur 1 et le joueur 2 de chaque partie. Un même objet peut jouer dans plusieurs
+            parties, dans l'un ou l'autre rôle : à chaque étape, toutes ses décisions sont regroupées en un seul appel
+            de BatchPlayer.playBatch (les autres joueurs sont appelés partie par partie avec play). Comme avec run, les
+            deux joueurs décident sur le même état ; le temps de réflexion n'est pas limité.
+        """
+        groups = {}
+        for side, players in ((0, players1), (1, players2)):
+            for k, player in enumerate(players):
+                groups.setdefault(id(player), (player, [], []))[1 + side].append(k)
+        groups = [(player, np.array(k1, dtype=np.int64), np.array(k2, dtype=np.int64)) for player, k1, k2 in groups.values()]
+        for k, g in enumerate(self.games):
+            g.player1, g.player2 = players1[k], players2[k]
+
+        while self.currentStep < self.steps:
+            moves1 = np.empty_like(self.player1Positions)
+            moves2 = np.empty_like(self.player2Positions)
+            for player, k1, k2 in groups:
+                k = np.concatenate((k1, k2))
+                n = len(k1)
+                try:
+                    moves = decide(
+                        player,
+                        self.mazes[k],
+                        np.concatenate((self.player1Positions[k1], self.player2Positions[k2])),
+                        np.concatenate((self.player2Positions[k1], self.player1Positions[k2])),
+                        np.concatenate((self.player1Types[k1], self.player2Types[k2])),
+                        np.concatenate((self.player2Types[k1], self.player1Types[k2])),
+                        np.concatenate((self.player1Scores[k1], self.player2Scores[k2])),
+                        np.concatenate((self.player2Scores[k1], self.player1Scores[k2])),
+                    )
+                    moves1[k1] = moves[:n]
+                    moves2[k2] = moves[n:]
+                except Exception: # pylint: disable=broad-except
+                    self.applyException(k1, self.player1Positions, self.player1Scores, moves1, 1)
+                    self.applyException(k2, self.player2Positions, self.player2Scores, moves2, 2)
+            self.step(moves1, moves2)
+        return self.results()
+
+    def applyException(self, ks, positions, scores, moves, player):
+        """
+            Le joueur a levé une exception dans les parties ks : pénalité et coup aléatoire, comme ChallengeEngine.judgePlayer.
+        """
+        for k in ks:
+            g = self.games[k]
+            scores[k] += g.scoreOnException
+            moves[k] = g.randomMove(tuple(int(v) for v in positions[k]))
+            stats = g.player1Stats if player == 1 else g.player2Stats
+            stats.exceptions += 1
+            stats.penalty += g.scoreOnException
+
+    def results(self):
+        results = []
+        for k, g in enumerate(self.games):
+            self.syncToGame(k)
+            g.currentStep = self.currentStep
+            results.append(ChallengeResult(
+                steps=self.currentStep,
+                player1Name=g.player1.name,
+                player2Name=g.player2.name,
+                player1Score=self.player1Scores[k].item(),
+                player2Score=self.player2Scores[k].item(),
+                player1Stats=g.player1Stats,
+                player2Stats=g.player2Stats,
+            ))
+        return results
+
+def randomPolicy(seed: int = None):
+    rng = np.random.default_rng(seed)
+    def policy(batch: BatchEngine, myPositions, enemyPositions):
+        return batch.randomMoves(myPositions, rng)
+    return policy
+
+def decide(player: BasePlayer, mazes, myPositions, enemyPositions, myTypes, enemyTypes, myScores, enemyScores):
+    """
+        Les coups (N, 2) de player dans N parties : un appel de playBatch pour un BatchPlayer, sinon un appel de play par partie.
+    """
+    if isinstance(player, BatchPlayer):
+        moves = np.asarray(player.playBatch(mazes, myPositions, enemyPositions, myTypes, enemyTypes, myScores, enemyScores))
+        if moves.shape != myPositions.shape:
+            raise ValueError('playBatch returned moves of shape ' + str(moves.shape) + ', expected ' + str(myPositions.shape))
+        return moves
+    return np.array([
+        player.play(mazes[i], tuple(myPositions[i].tolist()), tuple(enemyPositions[i].tolist()),
+                    int(myTypes[i]), int(enemyTypes[i]), int(myScores[i]), int(enemyScores[i]))
+        for i in range(len(mazes))
+    ], dtype=np.int64).reshape(-1, 2)
+
+def runTournament(modules: list[str], seeds: list[int], config: ChallengeConfig, onResult=None):
+    """
+        Toutes les parties de tournament.runTournament (chaque paire, dans les deux rôles, pour chaque graine) jouées
+        ensemble dans un seul BatchEngine. Un joueur BatchPlayer n'est créé qu'une fois et décide pour toutes ses parties
+        en un appel par étape ; les autres joueurs ont un objet par partie. Les deux joueurs décident sur le même état.
+    """
+    from tournament import GameResult, Leaderboard, loadPlayerClass, pairings # pylint: disable=import-outside-toplevel
+    games = [(seed, m1, m2) for seed in seeds for m1, m2 in pairings(modules)]
+    batch = BatchEngine(config, [seed for seed, _, _ in games])
+    classes = {m: loadPlayerClass(m) for m in modules}
+    shared = {m: cls(batch.config) for m, cls in classes.items() if issubclass(cls, BatchPlayer)}
+
+    def player(module, k):
+        return shared[module] if module in shared else classes[module](batch.games[k].cloneConfig())
+
+    players1 = [player(m1, k) for k, (_, m1, _) in enumerate(games)]
+    players2 = [player(m2, k) for k, (_, _, m2) in enumerate(games)]
+    leaderboard = Leaderboard()
+    for (seed, m1, m2), result in zip(games, batch.runPlayers(players1, players2)):
+        game = GameResult(m1, m2, seed, result)
+        leaderboard.add(game)
+        if onResult:
+            onResult(game)
+    return leaderboard
@@ -0,0 +1,336 @@
+# Mesures de performance du moteur
+# Exemple: python benchmark.py mazes --sizes 101,501,1001,2001
+# Suivi des régressions: python benchmark.py suite --json avant.json, puis python benchmark.py suite --baseline avant.json
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import mazes
+import numpy as np
+from engine import ChallengeEngine, BasePlayer, TYPE_CISEAUX, TYPE_PIERRE
+
+# Les moteurs mesurés n'affichent aucun événement et ne jouent aucun son : seul leur coût est mesuré
+QUIET_SETTINGS = dict(consoleEvents=False, playSounds=False)
+
+def timeit(fn, repeat: int = 3):
+    """
+        Meilleur temps (en secondes) sur plusieurs exécutions.
+    """
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        t = time.perf_counter() - t
+        best = t if best is None else min(best, t)
+    return best
+
+def benchMazes(sizes: list[int], algorithms: list[str], repeat: int = 3):
+    print('{:<12} {:>8} {:>12} {:>14}'.format('Algorithme', 'Taille', 'Temps (s)', 'Cellules/s'))
+    for size in sizes:
+        for algorithm in algorithms:
+            t = timeit(lambda: mazes.generate(algorithm, size, size, random.Random(0)), repeat)
+            cells = ((size - 1) // 2) ** 2
+            print('{:<12} {:>8} {:>12.4f} {:>14.0f}'.format(algorithm, size, t, cells / t))
+
+class NeighbourPlayer(BasePlayer):
+    """
+        Joueur quasi gratuit : le coût mesuré est celui du moteur, pas celui du joueur.
+    """
+    def play(self, maze, myPosition, enemyPosition, myType, enemyType, myScore, enemyScore):
+        x, y = myPosition
+        for p in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if maze[p[1]][p[0]] != -1:
+                return p
+        return myPosition
+
+def benchMazeView(sizes: list[int], steps: int = 200, repeat: int = 3):
+    print('{:<10} {:>8} {:>16} {:>14}'.format('Mode', 'Taille', 'µs / étape', 'Étapes/s'))
+    for size in sizes:
+        for readOnly in (False, True):
+            def run():
+                challenge = ChallengeEngine(
+                    width=size, height=size, steps=steps, randomSeed=0, readOnlyMaze=readOnly, mazeAlgorithm='eller',
+                    **QUIET_SETTINGS,
+                )
+                challenge.registerPlayers(NeighbourPlayer(challenge.cloneConfig()), NeighbourPlayer(challenge.cloneConfig()))
+                t = time.perf_counter()
+                challenge.runHeadless()
+                return time.perf_counter() - t
+            t = min(run() for _ in range(repeat))
+            print('{:<10} {:>8} {:>16.1f} {:>14.0f}'.format('vue' if readOnly else 'copie', size, t / steps * 1e6, steps / t))
+
+def benchWorkers(sizes: list[int], calls: int = 500):
+    """
+        Surcoût d'un appel de joueur dans son processus (playerWorkers=True) par rapport au temps de réflexion du joueur.
+    """
+    from workers import PlayerWorker # pylint: disable=import-outside-toplevel
+    print('{:>8} {:>20} {:>22}'.format('Taille', 'µs / appel (direct)', 'µs / appel (processus)'))
+    for size in sizes:
+        challenge = ChallengeEngine(width=size, height=size, steps=calls, randomSeed=0, mazeAlgorithm='eller', **QUIET_SETTINGS)
+        player = NeighbourPlayer(challenge.cloneConfig())
+        args = (challenge.player1Position, challenge.player2Position, 0, 0, 0, 0)
+
+        t = time.perf_counter()
+        for _ in range(calls):
+            player.play(challenge.playerMaze(), *args)
+        direct = (time.perf_counter() - t) / calls * 1e6
+
+        worker = PlayerWorker(player, challenge.maze)
+        try:
+            for _ in range(calls):
+                worker.play(challenge.maze, 1000, *args)
+            total = (worker.overheadNs + worker.thinkNs) / worker.calls / 1000
+        finally:
+            worker.close()
+        print('{:>8} {:>20.1f} {:>22.1f}'.format(size, direct, total))
+
+def emptyEngine(size: int, **kwargs):
+    """
+        Un moteur dont le labyrinthe ne contient aucune cellule bonus.
+    """
+    return ChallengeEngine(
+        width=size, height=size, steps=1000, randomSeed=0,
+        countScore1=0, countScore2=0, countScoreMin=0, countRefresh=0, **QUIET_SETTINGS, **kwargs
+    )
+
+def perCall(fn, calls: int, repeat: int = 3):
+    """
+        Meilleur temps moyen par appel, en microsecondes.
+    """
+    return timeit(lambda: [fn() for _ in range(calls)], repeat) / calls * 1e6
+
+def perCallAfter(setup, fn, calls: int, repeat: int = 3):
+    """
+        Meilleur temps moyen par appel de fn, en microsecondes, setup() étant appelée (sans être mesurée) avant chaque
+        appel.
+    """
+    best = None
+    for _ in range(repeat):
+        total = 0
+        for _ in range(calls):
+            setup()
+            t = time.perf_counter_ns()
+            fn()
+            total += time.perf_counter_ns() - t
+        best = total if best is None else min(best, total)
+    return best / calls / 1000
+
+class Suite:
+    """
+        Ensemble de mesures nommées. Chaque résultat a une unité et un sens (plus haut ou plus bas est meilleur), pour
+        pouvoir comparer deux exécutions.
+    """
+    def __init__(self, repeat: int = 3) -> None:
+        self.repeat = repeat
+        self.results = {}
+
+    def add(self, name: str, value: float, unit: str, higherIsBetter: bool = False):
+        self.results[name] = {'value': value, 'unit': unit, 'higherIsBetter': higherIsBetter}
+        print('{:<36} {:>14.2f} {}'.format(name, value, unit))
+
+    def benchGenMaze(self, sizes: list[int]):
+        for size in sizes:
+            t = timeit(lambda: ChallengeEngine.genMaze(size, size, random.Random(0)), self.repeat)
+            self.add('genMaze.' + str(size), t * 1000, 'ms')
+
+    def benchCells(self, size: int, fill: float = 0.95, calls: int = 20000):
+        """
+            generateMazeCells jusqu'à remplir fill des cellules vides, puis genPlayerPosition sur le labyrinthe rempli.
+        """
+        best = None
+        for _ in range(self.repeat):
+            c = emptyEngine(size)
+            count = int(fill * c.emptyCellsCount)
+            t = time.perf_counter()
+            c.generateMazeCellsForScore1(count)
+            t = time.perf_counter() - t
+            best = t if best is None else min(best, t)
+        self.add('generateMazeCells.' + str(size), best / count * 1e6, 'µs/cell')
+        self.add('genPlayerPosition.' + str(size), perCall(c.genPlayerPosition, calls, self.repeat), 'µs')
+
+    def benchProcessPoints(self, size: int, calls: int = 5000):
+        """
+            processPoints quand le joueur 1 est sur une cellule bonus (ramassage, puis régénération d'une cellule), et
+            quand les deux joueurs de types différents sont sur la même case vide (croisement, puis réapparition).
+        """
+        c = ChallengeEngine(width=size, height=size, steps=1000, randomSeed=0, regenerateCells=True, **QUIET_SETTINGS)
+        c.registerPlayers(NeighbourPlayer(c.cloneConfig()), NeighbourPlayer(c.cloneConfig()))
+        rnd = random.Random(0)
+
+        def position(i):
+            return (int(i % c.width), int(i // c.width))
+
+        def onBonus():
+            # Le nombre de cellules bonus ne change pas : chaque cellule ramassée est régénérée ailleurs
+            bonuses = np.flatnonzero(c.maze.ravel() > 0)
+            c.player1Position = position(rnd.choice(bonuses))
+            c.player2Position = c.genPlayerPosition()
+        self.add('processPoints.pickup.' + str(size), perCallAfter(onBonus, c.processPoints, calls, self.repeat), 'µs')
+
+        def onCross():
+            c.player1Position = c.player2Position = c.freeCells.position(c.freeCells.cells[0])
+            c.player1Type, c.player2Type = TYPE_PIERRE, TYPE_CISEAUX
+        self.add('processPoints.cross.' + str(size), perCallAfter(onCross, c.processPoints, calls, self.repeat), 'µs')
+
+    def benchRunPlayer(self, size: int, calls: int = 2000):
+        """
+            Surcoût de runPlayer (copie du labyrinthe, minuterie, validation du coup) par rapport à l'appel direct du joueur.
+        """
+        c = ChallengeEngine(width=size, height=size, steps=1000, randomSeed=0, **QUIET_SETTINGS)
+        player = NeighbourPlayer(c.cloneConfig())
+        c.registerPlayers(player)
+        args = (c.player1Position, c.player2Position, 0, 0, 0, 0)
+        direct = perCall(lambda: player.play(c.maze, *args), calls, self.repeat)
+        total = perCall(lambda: c.runPlayer(player, *args), calls, self.repeat)
+        self.add('runPlayer.overhead.' + str(size), total - direct, 'µs')
+
+    def benchSteps(self, size: int, steps: int = 1000):
+        def run():
+            c = ChallengeEngine(width=size, height=size, steps=steps, randomSeed=0, **QUIET_SETTINGS)
+            c.registerPlayers(NeighbourPlayer(c.cloneConfig()), NeighbourPlayer(c.cloneConfig()))
+            c.runHeadless()
+        self.add('runHeadless.' + str(size), steps / timeit(run, self.repeat), 'steps/s', True)
+
+    def benchDraw(self, size: int, frames: int = 100):
+        """
+            Temps d'une image complète (drawAll) et d'une image après une étape (drawChanges), sans fenêtre visible.
+        """
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        try:
+            from viewer import Challenge # pylint: disable=import-outside-toplevel
+        except ImportError:
+            print('{:<36} {:>14}'.format('draw', 'pygame absent'))
+            return
+        c = Challenge(width=size, height=size, steps=frames * self.repeat, randomSeed=0, delayToRun=0, **QUIET_SETTINGS)
+        c.registerPlayers(NeighbourPlayer(c.cloneConfig()), NeighbourPlayer(c.cloneConfig()))
+        c.runTime = time.time()
+        c.runTimeElapsed = True
+        self.add('drawAll.' + str(size), perCall(c.drawAll, frames // 10 or 1, self.repeat) / 1000, 'ms')
+
+        def frame():
+            c.step()
+            c.drawChanges()
+        self.add('drawChanges.' + str(size), perCall(frame, frames, self.repeat) / 1000, 'ms')
+        c.close()
+
+    def run(self, sizes: list[int], draw: bool = True):
+        print('{:<36} {:>14}'.format('Mesure', 'Valeur'))
+        self.benchGenMaze(sizes)
+        for size in sizes:
+            self.benchCells(size)
+            self.benchProcessPoints(size)
+            self.benchRunPlayer(size)
+            self.benchSteps(size)
+        if draw:
+            self.benchDraw(min(sizes))
+
+    def report(self):
+        return {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': self.results,
+        }
+
+def compareResults(baseline: dict, results: dict, threshold: float):
+    """
+        Retourne la liste des mesures plus lentes que baseline de plus de threshold (0.1 = 10 %).
+    """
+    regressions = []
+    print()
+    print('{:<36} {:>12} {:>12} {:>9}'.format('Mesure', 'Référence', 'Actuel', 'Écart'))
+    for name, r in results.items():
+        b = baseline.get(name)
+        if b is None or not b['value']:
+            continue
+        change = r['value'] / b['value'] - 1
+        # Écart positif = plus lent
+        slowdown = -change if r['higherIsBetter'] else change
+        flag = ''
+        if slowdown > threshold:
+            regressions.append(name)
+            flag = '  RÉGRESSION'
+        print('{:<36} {:>12.2f} {:>12.2f} {:>+8.1f}%{}'.format(name, b['value'], r['value'], slowdown * 100, flag))
+    return regressions
+
+def runSuite(args):
+    suite = Suite(args.repeat)
+    suite.run(args.sizes, not args.no_draw)
+    report = suite.report()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compareResults(baseline, report['results'], args.threshold)
+        if regressions:
+            print()
+            print('Régressions au-delà de {:.0f} % : {}'.format(args.threshold * 100, ', '.join(regressions)))
+            return 1
+    return 0
+
+def parseInts(value: str):
+    return [int(v) for v in value.split(',')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Mesures de performance du moteur.')
+    sub = parser.add_subparsers(dest='benchmark', required=True)
+
+    p = sub.add_parser('mazes', help='Temps de génération des labyrinthes selon la taille')
+    p.add_argument('--sizes', type=parseInts, default=[101, 301, 1001, 2001])
+    p.add_argument('--algorithms', type=lambda v: v.split(','), default=list(mazes.ALGORITHMS))
+    p.add_argument('--repeat', type=int, default=3)
+
+    p = sub.add_parser('mazeview', help='Coût par étape du labyrinthe transmis aux joueurs : copie ou vue en lecture seule')
+    p.add_argument('--sizes', type=parseInts, default=[41, 201, 1001])
+    p.add_argument('--steps', type=int, default=200)
+    p.add_argument('--repeat', type=int, default=3)
+
+    p = sub.add_parser('workers', help="Surcoût d'un appel de joueur exécuté dans son propre processus")
+    p.add_argument('--sizes', type=parseInts, default=[41, 201, 1001])
+    p.add_argument('--calls', type=int, default=500)
+
+    p = sub.add_parser('suite', help='Mesures des chemins critiques du moteur, avec export JSON et détection des régressions')
+    p.add_argument('--sizes', type=parseInts, default=[41, 201])
+    p.add_argument('--repeat', type=int, default=5)
+    p.add_argument('--json', default=None, help='Fichier où écrire les résultats')
+    p.add_argument('--baseline', default=None, help='Résultats de référence (JSON) à comparer')
+    p.add_argument('--threshold', type=float, default=0.10, help='Ralentissement toléré avant échec (0.10 = 10 %%)')
+    p.add_argument('--no-draw', action='store_true', help="Ne mesure pas l'affichage")
+
+    args = parser.parse_args()
+    if args.benchmark == 'suite':
+        sys.exit(runSuite(args))
+    elif args.benchmark == 'mazes':
+        benchMazes(args.sizes, args.algorithms, args.repeat)
+    elif args.benchmark == 'mazeview':
+        benchMazeView(args.sizes, args.steps, args.repeat)
+    elif args.benchmark == 'workers':
+        benchWorkers(args.sizes, args.calls)
+
+if __name__ == "__main__":
+    main()
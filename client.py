@@ -0,0 +1,131 @@
+# Joueur distant pour server.py : python client.py playerExample1 --port 7000 [--connections 4]
+# Le client garde sa connexion d'une partie à l'autre et joue toutes les parties que le serveur lui attribue
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import multiprocessing
+import socket
+import traceback
+import numpy as np
+import protocol
+from engine import ChallengeConfig, applyChanges, readOnlyView
+from mazetree import MazeTree
+from tournament import loadPlayerClass
+
+class RemoteGame:
+    """
+        Une partie côté client : le joueur et sa copie du labyrinthe, tenue à jour avec les modifications reçues.
+    """
+    def __init__(self, playerClass, config: dict, maze: np.ndarray) -> None:
+        self.config = ChallengeConfig(**config)
+        self.maze = maze
+        self.config.mazeTree = MazeTree(maze)
+        self.player = playerClass(self.config)
+        self.view = readOnlyView(maze) if self.config.readOnlyMaze else None
+
+    def play(self, args: tuple, indices: np.ndarray, values: np.ndarray):
+        applyChanges(self.maze, indices, values)
+        maze = self.view if self.view is not None else np.copy(self.maze)
+        return self.player.play(maze, *args)
+
+def recvExactly(sock: socket.socket, size: int):
+    data = bytearray(size)
+    view = memoryview(data)
+    n = 0
+    while n < size:
+        k = sock.recv_into(view[n:])
+        if not k:
+            raise EOFError
+        n += k
+    return data
+
+def connect(host: str, port: int, unixPath: str = None):
+    if unixPath:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(unixPath)
+    else:
+        sock = socket.create_connection((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+def run(module: str, host: str = '127.0.0.1', port: int = 7000, unixPath: str = None, name: str = None):
+    """
+        Joue les parties envoyées par le serveur jusqu'à ce qu'il ferme la connexion ; retourne le nombre de parties.
+    """
+    playerClass = loadPlayerClass(module)
+    games = {}
+    played = 0
+    with connect(host, port, unixPath) as sock:
+        sock.sendall(protocol.hello(name or module))
+        while True:
+            try:
+                size, kind = protocol.FRAME.unpack(recvExactly(sock, protocol.FRAME.size))
+                body = memoryview(recvExactly(sock, size - 1))
+                played += handle(sock, playerClass, games, kind, body)
+            except (EOFError, ConnectionError):
+                return played
+
+def handle(sock: socket.socket, playerClass, games: dict, kind: int, body: memoryview):
+    """
+        Traite un message du serveur ; retourne 1 à la fin d'une partie.
+    """
+    if kind == protocol.PLAY:
+        game = games[protocol.CALL.unpack_from(body)[0]]
+        matchId, callId, args, indices, values = protocol.parsePlay(body, game.maze.dtype)
+        try:
+            p = game.play(args, indices, values)
+        except Exception: # pylint: disable=broad-except
+            sock.sendall(protocol.error(matchId, callId, traceback.format_exc()))
+            return 0
+        sock.sendall(protocol.move(matchId, callId, p))
+    elif kind == protocol.MATCH:
+        matchId, _, config, maze = protocol.parseMatch(body)
+        games[matchId] = RemoteGame(playerClass, config, maze)
+    elif kind == protocol.END:
+        matchId, _, _ = protocol.END_BODY.unpack_from(body)
+        games.pop(matchId, None)
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Joueur distant pour server.py')
+    parser.add_argument('player', help='Module du joueur (ex: playerExample1)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7000)
+    parser.add_argument('--unix', default=None, help='Socket Unix à la place de TCP')
+    parser.add_argument('--name', default=None, help='Nom affiché dans le classement (par défaut: le module)')
+    parser.add_argument('--connections', type=int, default=1, help='Nombre de connexions, chacune dans son processus')
+    args = parser.parse_args()
+
+    if args.connections <= 1:
+        run(args.player, args.host, args.port, args.unix, args.name)
+        return
+    processes = [
+        multiprocessing.Process(target=run, args=(args.player, args.host, args.port, args.unix, args.name))
+        for _ in range(args.connections)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+if __name__ == '__main__':
+    main()
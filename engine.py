@@ -0,0 +1,1068 @@
+# Moteur de jeu, sans aucune dépendance à pygame
+# Utilisé par challenge.py pour l'affichage, et directement pour les simulations sans fenêtre
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import copy
+import functools
+import inspect
+import os
+import random
+import numpy as np
+import signal
+import time
+import traceback
+import mazes
+import events
+from mazetree import MazeTree
+
+TYPE_PIERRE = 0
+TYPE_CISEAUX = 1
+TYPE_FEUILLE = 2
+
+ColorValue = tuple[int, int, int]
+
+class TimeoutError(Exception):
+    pass
+
+def timeout_handler(signum, frame):
+    raise TimeoutError("Timed out")
+
+def readOnlyView(a: np.ndarray):
+    """
+        Vue sans copie sur un tableau contigu, en lecture seule.
+        Le tampon sous-jacent est lui-même en lecture seule : contrairement à a.view() avec writeable=False, le drapeau
+        ne peut pas être réactivé depuis la vue.
+    """
+    return np.frombuffer(memoryview(a).toreadonly(), dtype=a.dtype).reshape(a.shape)
+
+def applyChanges(maze: np.ndarray, indices: np.ndarray, values: np.ndarray):
+    """
+        Applique à maze (contigu) des modifications de cellules, indices plats et nouvelles valeurs, dans l'ordre : une
+        cellule modifiée plusieurs fois garde sa dernière valeur (l'affectation NumPy avec des indices répétés ne garantit
+        pas laquelle est gardée). Retourne les indices des cellules modifiées, sans doublon.
+    """
+    if not len(indices):
+        return indices
+    cells, last = np.unique(indices[::-1], return_index=True)
+    maze.reshape(-1)[cells] = values[::-1][last]
+    return cells
+
+def mazeDtype(minValue: int, maxValue: int):
+    """
+        Le plus petit type entier signé pouvant contenir toutes les valeurs de cellules (int8 avec les réglages par défaut).
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= minValue and maxValue <= info.max:
+            return dtype
+    return np.int64
+
+class ChallengeConfig:
+    def __init__(
+        self, width: int,
+        height: int,
+        steps: int,
+        stepDelay: int = 50,
+        delayToRun: int = 3,
+        randomSeed: int = None,
+        wallColor: ColorValue = (0, 0, 0),
+        floorColor: ColorValue = (255, 255, 255),
+        bgColor: ColorValue = (0, 0, 0),
+        title: str = 'Challenge CSI',
+        player1Color: ColorValue = (0,0,255),
+        player2Color: ColorValue = (255,0,0),
+        scoreColor: ColorValue = (255, 255, 255),
+        miscColor: ColorValue = (255, 255, 255),
+        windowWidth: int = 1200,
+        windowHeight: int = 700,
+        marginLeft: int = 280,
+        marginRight: int = 10,
+        marginTop: int = 10,
+        marginBottom: int = 10,
+        score1Value: int = 3,
+        score2Value: int = 11,
+        scoreMinValue: int = -10,
+        scoreNegativeValue: int = -4,
+        scoreCrossValue: int = 17,
+        scoreOnException: int = -50,
+        scoreOnBadMove: int = -20,
+        scoreOnTimeout: int = -15,
+        countScore1: float = 0.25,
+        countScore2: float = 0.10,
+        countScoreMin: float = 0.15,
+        countRefresh: float = 0.05,
+        maxTime: int = 500,
+        enableRPCGame: bool = True,
+        regenerateCells: bool = False,
+        playSounds: bool = True,
+        mazeAlgorithm: str = 'backtracker',
+        mazePath: str = None,
+        scenarioPack: str = None,
+        targetFps: int = 60,
+        fastForward: bool = False,
+        readOnlyMaze: bool = False,
+        playerWorkers: bool = False,
+        simultaneousMoves: bool = False,
+        replayPath: str = None,
+        videoPath: str = None,
+        videoFps: int = 30,
+        collectMetrics: bool = False,
+        metricsPath: str = None,
+        profileDir: str = None,
+        eventLevel: int = events.LEVEL_MOVE,
+        eventLog: str = None,
+        consoleEvents: bool = True,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.steps = steps
+        self.stepDelay = stepDelay
+        self.delayToRun = delayToRun
+        self.randomSeed = randomSeed
+        self.wallColor = wallColor
+        self.floorColor = floorColor
+        self.bgColor = bgColor
+        self.windowWidth = windowWidth
+        self.windowHeight = windowHeight
+        self.targetFps = targetFps
+        self.fastForward = fastForward
+
+        self.marginLeft = marginLeft
+        self.marginRight = marginRight
+        self.marginTop = marginTop
+        self.marginBottom = marginBottom
+
+        self.score1Value = score1Value
+        self.score2Value = score2Value
+        self.scoreMinValue = scoreMinValue
+        self.scoreNegativeValue = scoreNegativeValue
+        self.scoreCrossValue = scoreCrossValue
+        self.scoreOnException = scoreOnException
+        self.scoreOnBadMove = scoreOnBadMove
+        self.scoreOnTimeout = scoreOnTimeout
+
+        self.countScore1 = countScore1
+        self.countScore2 = countScore2
+        self.countScoreMin = countScoreMin
+        self.countRefresh = countRefresh
+
+        self.title = title
+        self.scoreColor = scoreColor
+        self.miscColor = miscColor
+
+        self.maxTime = maxTime
+
+        self.enableRPCGame = enableRPCGame
+        self.regenerateCells = regenerateCells
+        self.playSounds = playSounds
+        self.mazeAlgorithm = mazeAlgorithm
+        self.mazePath = mazePath
+        self.scenarioPack = scenarioPack
+        self.readOnlyMaze = readOnlyMaze
+        self.playerWorkers = playerWorkers
+        self.simultaneousMoves = simultaneousMoves
+        self.replayPath = replayPath
+        self.videoPath = videoPath
+        self.videoFps = videoFps
+        self.collectMetrics = collectMetrics
+        self.metricsPath = metricsPath
+        self.profileDir = profileDir
+        self.eventLevel = eventLevel
+        self.eventLog = eventLog
+        self.consoleEvents = consoleEvents
+
+        self.player1Color = player1Color
+        self.player2Color = player2Color
+
+        # Index des distances du labyrinthe (voir mazetree.py), partagé par le moteur et les configurations des joueurs
+        self.mazeTree = None
+
+    def configKwargs(self):
+        constructorSignature = inspect.signature(ChallengeConfig.__init__)
+        kwargs = {}
+        for param in constructorSignature.parameters.values():
+            if param.name == 'self':
+                continue
+            kwargs[param.name] = copy.deepcopy(getattr(self, param.name))
+        return kwargs
+
+    def cloneConfig(self):
+        config = ChallengeConfig(**self.configKwargs())
+        config.mazeTree = self.mazeTree
+        return config
+
+    def forwardModel(self, maze: np.ndarray):
+        """
+            Modèle du jeu pour explorer les coups à venir à partir du labyrinthe reçu dans BasePlayer.play (voir forward.py).
+        """
+        from forward import ForwardModel # pylint: disable=import-outside-toplevel
+        return ForwardModel(self, maze)
+
+class PlayerStats:
+    def __init__(self) -> None:
+        self.penalty = 0
+        self.timeouts = 0
+        self.badMoves = 0
+        self.exceptions = 0
+
+class ChallengeResult:
+    def __init__(
+        self,
+        steps: int,
+        player1Name: str,
+        player2Name: str,
+        player1Score: int,
+        player2Score: int,
+        player1Stats: PlayerStats,
+        player2Stats: PlayerStats,
+    ) -> None:
+        self.steps = steps
+        self.player1Name = player1Name
+        self.player2Name = player2Name
+        self.player1Score = player1Score
+        self.player2Score = player2Score
+        self.player1Stats = player1Stats
+        self.player2Stats = player2Stats
+
+    @property
+    def winner(self):
+        """
+            1 ou 2 pour le joueur gagnant, 0 en cas d'égalité.
+        """
+        if self.player1Score > self.player2Score:
+            return 1
+        if self.player2Score > self.player1Score:
+            return 2
+        return 0
+
+class FreeCells:
+    """
+        Index des cellules vides (valeur 0) du labyrinthe, maintenu à chaque modification de cellule.
+        cells[:count] contient les indices (y * width + x) des cellules vides et where[i] la place de i dans cells (-1 si
+        la cellule n'est pas vide). Ajout, suppression (par échange avec le dernier élément) et tirage uniforme en O(1).
+        Les indices sont en int32 tant que le labyrinthe le permet, et l'index est construit par blocs de lignes, sans
+        tableau temporaire de la taille du labyrinthe.
+    """
+    BLOCK_CELLS = 1 << 22
+
+    def __init__(self, maze: np.ndarray) -> None:
+        height, self.width = maze.shape
+        dtype = np.int32 if maze.size <= np.iinfo(np.int32).max else np.int64
+        self.cells = np.empty(maze.size, dtype=dtype)
+        self.where = np.full(maze.size, -1, dtype=dtype)
+        n = 0
+        rows = max(1, self.BLOCK_CELLS // max(1, self.width))
+        for y in range(0, height, rows):
+            flat = np.flatnonzero(maze[y:y + rows] == 0)
+            flat += y * self.width
+            self.cells[n:n + len(flat)] = flat
+            self.where[flat] = np.arange(n, n + len(flat))
+            n += len(flat)
+        self.count = np.array([n], dtype=np.int64)
+
+    @classmethod
+    def fromCells(cls, maze: np.ndarray, cells: np.ndarray):
+        """
+            Reconstruit l'index à partir de cells[:count] d'un index existant, dans le même ordre (voir scenarios.py).
+        """
+        self = cls.__new__(cls)
+        self.width = maze.shape[1]
+        dtype = np.int32 if maze.size <= np.iinfo(np.int32).max else np.int64
+        self.cells = np.empty(maze.size, dtype=dtype)
+        self.cells[:len(cells)] = cells
+        self.where = np.full(maze.size, -1, dtype=dtype)
+        self.where[cells] = np.arange(len(cells))
+        self.count = np.array([len(cells)], dtype=np.int64)
+        return self
+
+    def __len__(self):
+        return int(self.count[0])
+
+    def __contains__(self, i):
+        return self.where[i] >= 0
+
+    def position(self, i):
+        return (int(i % self.width), int(i // self.width))
+
+    def add(self, i):
+        if self.where[i] >= 0:
+            return
+        n = self.count[0]
+        self.cells[n] = i
+        self.where[i] = n
+        self.count[0] = n + 1
+
+    def remove(self, i):
+        j = self.where[i]
+        if j < 0:
+            return
+        n = self.count[0] - 1
+        last = self.cells[n]
+        self.cells[j] = last
+        self.where[last] = j
+        self.where[i] = -1
+        self.count[0] = n
+
+    def sample(self, rnd: random.Random):
+        return self.position(self.cells[rnd.randrange(len(self))])
+
+    def removeAll(self, indices: np.ndarray):
+        """
+            Retire d'un coup les cellules indices (toutes dans l'index) ; les autres gardent leur ordre. L'index est
+            compacté sur place, par blocs.
+        """
+        self.where[indices] = -1
+        n = len(self)
+        kept = 0
+        for start in range(0, n, self.BLOCK_CELLS):
+            block = self.cells[start:min(n, start + self.BLOCK_CELLS)]
+            block = block[self.where[block] >= 0]
+            self.cells[kept:kept + len(block)] = block
+            self.where[block] = np.arange(kept, kept + len(block), dtype=self.where.dtype)
+            kept += len(block)
+        self.count[0] = kept
+
+class ChallengeEngine(ChallengeConfig):
+    TYPES = [TYPE_PIERRE, TYPE_CISEAUX, TYPE_FEUILLE]
+    TYPE_LABELS = ['Pierre', 'Ciseaux', 'Feuille']
+    # À partir de ce nombre de cellules vides, les bonus de la génération sont placés en bloc (generateBonusCells)
+    BULK_CELLS = 1 << 20
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.currentStep = 0
+
+        self.useAlarmSignal = os.name != 'nt'
+
+        self.player1 = None
+        self.player2 = None
+        self.workers = {}
+        self.recorder = None
+        self.videoRecorder = None
+        self.lastCross = 0
+        self.metrics = None
+        self.playerHook = None
+
+        self.events = events.EventStream(self.eventLevel)
+        if self.consoleEvents:
+            self.events.addSink(events.ConsoleSink())
+        if self.eventLog:
+            self.events.addSink(events.ThreadedSink(events.JsonLinesSink(self.eventLog)))
+
+        self.player1Score = 0
+        self.player2Score = 0
+
+        self.player1Stats = PlayerStats()
+        self.player2Stats = PlayerStats()
+
+        self.random = random.Random(self.randomSeed)
+        self.mazeView = None
+        self.mazeViewSource = None
+        self.initState()
+
+        if self.replayPath:
+            from replay import ReplayRecorder # pylint: disable=import-outside-toplevel
+            self.recorder = ReplayRecorder(self)
+        if self.collectMetrics or self.metricsPath or self.profileDir:
+            import metrics # pylint: disable=import-outside-toplevel
+            if self.collectMetrics or self.metricsPath:
+                self.metrics = metrics.StepMetrics()
+            if self.profileDir:
+                self.playerHook = metrics.CProfileHook()
+
+    @property
+    def mazeTree(self):
+        """
+            Index des distances du labyrinthe (voir mazetree.py), créé au premier accès : les parties où aucun joueur ne
+            s'en sert (tournois, balayages, paquets de scénarios) ne le construisent jamais.
+        """
+        if self.sharedMazeTree is None:
+            self.sharedMazeTree = MazeTree(self.maze)
+        return self.sharedMazeTree
+
+    @mazeTree.setter
+    def mazeTree(self, mazeTree: MazeTree):
+        self.sharedMazeTree = mazeTree
+
+    @property
+    def emptyCellsCount(self):
+        return len(self.freeCells)
+
+    def initState(self):
+        """
+            Place la partie dans son état initial : lu dans le paquet de scénarios (scenarioPack) quand il contient la
+            graine de la partie, généré sinon. Les sous-classes qui partent d'un état connu (relecture) la redéfinissent.
+        """
+        scenario = None
+        if self.scenarioPack and self.randomSeed is not None:
+            import scenarios # pylint: disable=import-outside-toplevel
+            scenario = scenarios.load(self.scenarioPack).find(self)
+        if scenario is not None:
+            scenario.apply(self)
+        else:
+            self.generate()
+
+    def generate(self):
+        """
+            Génère le labyrinthe, les positions et types des joueurs, puis les bonus.
+        """
+        dtype = mazeDtype(min(self.scoreMinValue, -2), max(self.score2Value, 0))
+        self.maze = self.genMaze(self.width, self.height, self.random, self.mazeAlgorithm, dtype, self.mazePath)
+        self.width, self.height = len(self.maze[0]), len(self.maze)
+        self.freeCells = FreeCells(self.maze)
+        self.generatePlayers()
+
+        if self.emptyCellsCount >= self.BULK_CELLS:
+            self.generateBonusCells()
+            return
+        self.generateMazeCellsForScore1(int(self.countScore1 * self.emptyCellsCount))
+        self.generateMazeCellsForScore2(int(self.countScore2 * self.emptyCellsCount))
+        self.generateMazeCellsForScoreMin(int(self.countScoreMin * self.emptyCellsCount))
+        if self.enableRPCGame:
+            self.generateMazeCellsForRefresh(int(self.countRefresh * self.emptyCellsCount))
+
+    def generateBonusCells(self):
+        """
+            Les bonus de la génération des grands labyrinthes, en bloc : autant de cellules de chaque sorte qu'avec les
+            appels un par un de generateMazeCellsFor*, tirées uniformément parmi les cellules vides hors des joueurs,
+            mais avec un générateur NumPy (initialisé par self.random) et sans passer par setCell. N'est utilisée que
+            pendant la génération, avant toute partie enregistrée (replayPath) ou vidéo (videoPath).
+        """
+        kinds = [
+            (1, self.score1Value, self.countScore1),
+            (self.score1Value + 1, self.score2Value, self.countScore2),
+            (self.scoreMinValue, -3, self.countScoreMin),
+        ]
+        if self.enableRPCGame:
+            kinds.append((-2, -2, self.countRefresh))
+        counts = []
+        empty = self.emptyCellsCount
+        for _, _, fraction in kinds:
+            counts.append(int(fraction * empty))
+            empty -= counts[-1]
+
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        occupied = [y * self.width + x for x, y in self.occupiedCells() if x >= 0]
+        for i in occupied:
+            self.freeCells.remove(i)
+        n = len(self.freeCells)
+        if sum(counts) > n:
+            raise RuntimeError('No free cell left in the maze')
+        starts = range(0, n, FreeCells.BLOCK_CELLS)
+        sizes = [min(FreeCells.BLOCK_CELLS, n - start) for start in starts]
+        remaining = np.array(counts, dtype=np.int64)
+        flat = self.maze.reshape(-1)
+        chosen = []
+        for start, size, k in zip(starts, sizes, rng.multivariate_hypergeometric(sizes, sum(counts))):
+            if not k:
+                continue
+            # Les cellules tirées sont dans un ordre aléatoire : les premières reçoivent la première sorte de bonus, etc.
+            cells = self.freeCells.cells[start + rng.choice(size, k, replace=False)]
+            perKind = rng.multivariate_hypergeometric(remaining, k)
+            remaining -= perKind
+            flat[cells] = np.concatenate([rng.integers(lo, hi + 1, m) for (lo, hi, _), m in zip(kinds, perKind)])
+            chosen.append(cells)
+        if chosen:
+            self.freeCells.removeAll(np.concatenate(chosen))
+        for i in occupied:
+            self.freeCells.add(i)
+
+    def occupiedCells(self):
+        """
+            Les cases des joueurs, où la génération ne place aucun bonus.
+        """
+        return (self.player1Position, self.player2Position)
+
+    def generatePlayers(self):
+        """
+            Les positions et types des deux joueurs, tirés avant les bonus (qui ne sont jamais placés sous un joueur).
+        """
+        self.player1Position = (0, 0)
+        self.player2Position = (0, 0)
+
+        self.player1Position = self.genPlayerPosition()
+        self.player2Position = self.genPlayerPosition()
+
+        self.player1Type = self.random.choice(self.TYPES)
+        self.player2Type = self.random.choice(self.TYPES)
+
+    @staticmethod
+    def compareTypes(t1, t2):
+        if t1 == t2:
+            return 0
+        if t1 == TYPE_PIERRE:
+            if t2 == TYPE_CISEAUX:
+                return 1
+            else:
+                return -1
+        elif t1 == TYPE_CISEAUX:
+            if t2 == TYPE_PIERRE:
+                return -1
+            else:
+                return 1
+        else:
+            if t2 == TYPE_PIERRE:
+                return 1
+            else:
+                return -1
+
+    @staticmethod
+    def genMaze(width, height, rnd: random.Random, algorithm: str = 'backtracker', dtype=np.int8, path: str = None):
+        """
+            Les murs valent -1 et les passages 0. Le labyrinthe est stocké en entiers compacts (int8 par défaut).
+            Avec path, le labyrinthe est un fichier .npy projeté en mémoire (np.memmap), écrit ligne par ligne : seules
+            les pages utilisées restent en mémoire, ce qui permet des labyrinthes de 10 000 x 10 000 (de préférence avec
+            l'algorithme eller, qui ne garde jamais le labyrinthe entier en mémoire pendant la génération).
+        """
+        if path is None:
+            return mazes.generate(algorithm, width, height, rnd).astype(dtype) * dtype(-1)
+        maze = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=mazes.shape(width, height))
+        for i, row in enumerate(mazes.generateRows(algorithm, width, height, rnd)):
+            np.negative(row, out=maze[i], casting='unsafe')
+        maze.flush()
+        return maze
+
+    def genPlayerPosition(self):
+        occupied = self.occupiedCells()
+        if len(self.freeCells) <= len(occupied):
+            if all(self.freeCells.position(i) in occupied for i in self.freeCells.cells[:len(self.freeCells)]):
+                raise RuntimeError('No free cell left in the maze')
+        while True:
+            p = self.freeCells.sample(self.random)
+            if p not in occupied:
+                return p
+
+    def setCell(self, x, y, value):
+        """
+            Toute modification d'une cellule du labyrinthe doit passer par ici, pour garder l'index des cellules vides à jour.
+        """
+        old = self.maze[y, x]
+        self.maze[y, x] = value
+        if old == 0 and value != 0:
+            self.freeCells.remove(y * self.width + x)
+        elif old != 0 and value == 0:
+            self.freeCells.add(y * self.width + x)
+        if self.recorder is not None:
+            self.recorder.cellChanged(y * self.width + x, value)
+        if self.videoRecorder is not None:
+            self.videoRecorder.cellChanged(y * self.width + x, value)
+
+    def generateMazeCells(self, minValue, maxValue, count):
+        for _ in range(count):
+            x, y = self.genPlayerPosition()
+            self.setCell(x, y, self.random.randrange(minValue, maxValue + 1))
+
+    def generateMazeCellsForScore1(self, count):
+        self.generateMazeCells(1, self.score1Value, count)
+
+    def generateMazeCellsForScore2(self, count):
+        self.generateMazeCells(self.score1Value + 1, self.score2Value, count)
+
+    def generateMazeCellsForScoreMin(self, count):
+        self.generateMazeCells(self.scoreMinValue, -3, count)
+
+    def generateMazeCellsForRefresh(self, count):
+        if self.enableRPCGame:
+            self.generateMazeCells(-2, -2, count)
+
+    def isValidPosFrom(self, p0, p1):
+        if p0 == p1:
+            return False
+        if self.maze[p1[1]][p1[0]] == -1:
+            return False
+        if p0[0] == p1[0]:
+            return abs(p1[1] - p0[1]) == 1
+        elif p0[1] == p1[1]:
+            return abs(p1[0] - p0[0]) == 1
+        else:
+            return False
+
+    # pylint: disable=unused-argument
+    def onCellConsumed(self, x, y, cell):
+        """
+            Appelée juste avant qu'une cellule bonus ne soit consommée (utilisée par l'affichage pour les sons).
+        """
+
+    def onCross(self, winner):
+        """
+            Appelée lorsqu'un joueur (1 ou 2) gagne un croisement.
+        """
+
+    def processPoints(self, crossed: bool = False):
+        """
+            crossed: les joueurs ont échangé leurs cases pendant cette étape (mode simultané) ; ils se sont donc croisés
+            et le croisement est résolu comme s'ils étaient sur la même case.
+        """
+        x1, y1 = self.player1Position
+        cell1 = int(self.maze[y1, x1])
+        x2, y2 = self.player2Position
+        cell2 = int(self.maze[y2, x2])
+        if cell1:
+            if cell1 == -2:
+                if self.enableRPCGame:
+                    pass
+                self.player1Type = (self.player1Type + self.random.choice([1, 2])) % len(self.TYPES)
+                if self.events.kinds[events.EVENT_REFRESH]:
+                    self.emitEvent(events.EVENT_REFRESH, 1, position=self.player1Position, type=self.player1Type)
+            else:
+                self.player1Score += cell1
+                if self.events.kinds[events.EVENT_PICKUP]:
+                    self.emitEvent(events.EVENT_PICKUP, 1, position=self.player1Position, value=cell1)
+            self.onCellConsumed(x1, y1, cell1)
+            self.replaceMazeCell(x1, y1)
+        if cell2:
+            if cell2 == -2:
+                if self.enableRPCGame:
+                    pass
+                self.player2Type = (self.player2Type + self.random.choice([1, 2])) % len(self.TYPES)
+                if self.events.kinds[events.EVENT_REFRESH]:
+                    self.emitEvent(events.EVENT_REFRESH, 2, position=self.player2Position, type=self.player2Type)
+            else:
+                self.player2Score += cell2
+                if self.events.kinds[events.EVENT_PICKUP]:
+                    self.emitEvent(events.EVENT_PICKUP, 2, position=self.player2Position, value=cell2)
+            if self.player1Position != self.player2Position:
+                self.onCellConsumed(x2, y2, cell2)
+                self.replaceMazeCell(x2, y2)
+        if self.player2 and self.enableRPCGame and (crossed or self.player1Position == self.player2Position):
+            c = self.compareTypes(self.player1Type, self.player2Type)
+            if c > 0:
+                self.player1Score += self.scoreCrossValue
+                self.player2Position = (-1, -1)
+                self.player2Position = self.genPlayerPosition()
+                self.lastCross = 1
+                if self.events.kinds[events.EVENT_CROSS]:
+                    self.emitEvent(events.EVENT_CROSS, 1, position=self.player1Position, respawn=self.player2Position)
+                self.onCross(1)
+            elif c < 0:
+                self.player2Score += self.scoreCrossValue
+                self.player1Position = (-1, -1)
+                self.player1Position = self.genPlayerPosition()
+                self.lastCross = 2
+                if self.events.kinds[events.EVENT_CROSS]:
+                    self.emitEvent(events.EVENT_CROSS, 2, position=self.player2Position, respawn=self.player1Position)
+                self.onCross(2)
+
+    def randomMove(self, pos0):
+        x, y = pos0
+        moves = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+        self.random.shuffle(moves)
+        for p in moves:
+            if self.isValidPosFrom(pos0, p):
+                return p
+        return pos0
+
+    def replaceMazeCell(self, x, y):
+        oldCell = int(self.maze[y, x])
+        self.setCell(x, y, 0)
+        if not self.regenerateCells:
+            return
+        if oldCell == -2:
+            self.generateMazeCellsForRefresh(1)
+        elif oldCell < 0:
+            self.generateMazeCellsForScoreMin(1)
+        elif oldCell > 0:
+            if oldCell <= self.score1Value:
+                self.generateMazeCellsForScore1(1)
+            else:
+                self.generateMazeCellsForScore2(1)
+
+    def registerPlayers(self, player1: BasePlayer, player2: BasePlayer = None):
+        if self.player1 or self.player2:
+            raise AttributeError('Players already set !')
+        self.player1 = player1
+        self.player2 = player2
+        if self.playerWorkers or self.simultaneousMoves:
+            from workers import PlayerWorker # pylint: disable=import-outside-toplevel
+            for player in (player1, player2):
+                if player:
+                    self.workers[player] = PlayerWorker(player, self.maze, self.readOnlyMaze)
+
+    def close(self):
+        """
+            Arrête les processus des joueurs (playerWorkers=True) et écrit la partie enregistrée (replayPath), les mesures
+            (metricsPath), les profils des joueurs (profileDir), les derniers événements et les dernières images de la
+            vidéo (videoPath).
+        """
+        for worker in self.workers.values():
+            worker.close()
+        self.workers = {}
+        if self.recorder is not None:
+            self.recorder.save(self.replayPath)
+            self.recorder = None
+        if self.metrics is not None:
+            self.metrics.endStep()
+            if self.metricsPath:
+                self.metrics.export(self.metricsPath)
+        if self.playerHook is not None and self.profileDir:
+            self.playerHook.dump(self.profileDir)
+        self.events.close()
+        if self.videoRecorder is not None:
+            recorder, self.videoRecorder = self.videoRecorder, None
+            recorder.close()
+
+    def playerMaze(self):
+        """
+            Le labyrinthe tel que transmis aux joueurs : une copie, ou avec readOnlyMaze une vue en lecture seule sur le
+            labyrinthe du moteur (sans copie, et qui reflète donc toujours l'état courant).
+        """
+        if not self.readOnlyMaze:
+            return np.copy(self.maze)
+        if self.mazeViewSource is not self.maze:
+            self.mazeView = readOnlyView(self.maze)
+            self.mazeViewSource = self.maze
+        return self.mazeView
+
+    def statsFor(self, player: BasePlayer):
+        return self.player1Stats if player is self.player1 else self.player2Stats
+
+    def playerNumber(self, player: BasePlayer):
+        return 1 if player is self.player1 else 2
+
+    def playerName(self, n: int):
+        p = self.player1 if n == 1 else self.player2
+        return p.name if p else ''
+
+    def callPlayer(self, player: BasePlayer, *args):
+        """
+            Appelle player.play, dans son processus si playerWorkers=True (échéance précise), sinon directement
+            (interrompu par SIGALRM, à la seconde près, hors Windows).
+        """
+        worker = self.workers.get(player)
+        if worker:
+            return worker.play(self.maze, self.maxTime, *args)
+        if self.useAlarmSignal:
+            signal.signal(signal.SIGALRM, timeout_handler)
+            signal.alarm(1 + (self.maxTime // 1000))
+        maze = self.playerMaze()
+        if self.playerHook is not None:
+            with self.playerHook(player):
+                return player.play(maze, *args)
+        return player.play(maze, *args)
+
+    def runPlayer(self, player: BasePlayer, myPos, enemyPos, myType, enemyType, myScore, enemyScore):
+        return self.judgePlayer(player, myPos, lambda: self.callPlayer(player, myPos, enemyPos, myType, enemyType, myScore, enemyScore))
+
+    def judgePlayer(self, player: BasePlayer, myPos, getMove):
+        """
+            Obtient le coup du joueur avec getMove() et retourne (pénalité, position) : un coup aléatoire est joué en cas
+            de dépassement du temps, de position invalide ou d'exception.
+        """
+        stats = self.statsFor(player)
+        n = self.playerNumber(player)
+        try:
+            if self.events.kinds[events.EVENT_MOVE]:
+                self.emitEvent(events.EVENT_MOVE, n, position=myPos)
+
+            start_time = time.perf_counter_ns()
+            try:
+                p = getMove()
+            except TimeoutError:
+                if self.events.kinds[events.EVENT_TIMEOUT]:
+                    self.emitEvent(events.EVENT_TIMEOUT, n, position=myPos)
+                stats.timeouts += 1
+                stats.penalty += self.scoreOnTimeout
+                return (self.scoreOnTimeout, self.randomMove(myPos))
+            finally:
+                if self.useAlarmSignal:
+                    signal.alarm(0)
+                elapsed = time.perf_counter_ns() - start_time
+                self.recordTime('player1Think' if n == 1 else 'player2Think', elapsed)
+            if player not in self.workers and elapsed / 1e6 > self.maxTime:
+                if self.events.kinds[events.EVENT_TIMEOUT]:
+                    self.emitEvent(events.EVENT_TIMEOUT, n, position=myPos, elapsedMs=elapsed / 1e6)
+                stats.timeouts += 1
+                stats.penalty += self.scoreOnTimeout
+                return (self.scoreOnTimeout, self.randomMove(myPos))
+            if not self.isValidPosFrom(myPos, p):
+                if self.events.kinds[events.EVENT_BAD_MOVE]:
+                    self.emitEvent(events.EVENT_BAD_MOVE, n, position=myPos, move=p)
+                stats.badMoves += 1
+                stats.penalty += self.scoreOnBadMove
+                return (self.scoreOnBadMove, self.randomMove(myPos))
+            return (0, p)
+        except Exception as e:
+            if self.events.kinds[events.EVENT_EXCEPTION]:
+                self.emitEvent(events.EVENT_EXCEPTION, n, position=myPos, message=str(e), traceback=traceback.format_exc())
+            stats.exceptions += 1
+            stats.penalty += self.scoreOnException
+            return (self.scoreOnException, self.randomMove(myPos))
+
+    def stepSimultaneous(self):
+        """
+            Les deux joueurs réfléchissent en même temps (chacun dans son processus) sur le même état, puis les deux coups
+            sont appliqués ensemble (voir applySimultaneousMoves).
+        """
+        p1, p2 = self.player1Position, self.player2Position
+        worker1, worker2 = self.workers[self.player1], self.workers[self.player2]
+        worker1.send(self.maze, self.maxTime, p1, p2, self.player1Type, self.player2Type, self.player1Score, self.player2Score)
+        worker2.send(self.maze, self.maxTime, p2, p1, self.player2Type, self.player1Type, self.player2Score, self.player1Score)
+
+        # Les processus trop lents ne sont relancés qu'une fois les deux réponses lues
+        move1 = self.judgePlayer(self.player1, p1, functools.partial(worker1.receive, False))
+        move2 = self.judgePlayer(self.player2, p2, functools.partial(worker2.receive, False))
+        worker1.recover()
+        worker2.recover()
+        self.endStep(move1, move2, crossed=self.applySimultaneousMoves(move1, move2))
+
+    def emitEvent(self, kind: str, player: int, **data):
+        """
+            Ajoute un événement de la partie pour le joueur 1 ou 2 (voir events.py). L'appelant teste d'abord
+            self.events.kinds[kind] : sans récepteur qui attend l'événement, ses données (trace d'une exception, listes de
+            joueurs) ne sont jamais construites.
+        """
+        self.events.emit(self.currentStep, kind, player, self.playerName(player), **data)
+
+    def recordTime(self, channel: str, ns: int):
+        """
+            Ajoute ns nanosecondes au canal donné de l'étape en cours (collectMetrics=True, voir metrics.py).
+        """
+        if self.metrics is not None:
+            self.metrics.add(channel, ns)
+
+    def startVideo(self):
+        """
+            Démarre l'enregistrement vidéo (videoPath, voir video.py) à la première étape, une fois les joueurs connus.
+            Les images que le rendu n'a pas le temps de dessiner sont abandonnées : la partie n'attend jamais le rendu.
+        """
+        import video # pylint: disable=import-outside-toplevel
+        self.videoRecorder = video.VideoRecorder(self, self.maze, [self.playerName(1), self.playerName(2)], self.videoPath, self.videoFps)
+        self.captureFrame()
+
+    def captureFrame(self):
+        self.videoRecorder.capture(
+            self.currentStep,
+            (self.player1Position, self.player2Position),
+            (self.player1Type, self.player2Type),
+            (self.player1Score, self.player2Score),
+        )
+
+    def step(self):
+        self.beginStep()
+        if self.simultaneousMoves and self.player2:
+            self.stepSimultaneous()
+        else:
+            self.stepSequential()
+
+    def stepSequential(self):
+        """
+            Le joueur 1 joue, puis le joueur 2 joue en voyant le nouvel état.
+        """
+        move1 = self.applyMove(1, self.runPlayer(
+            self.player1, self.player1Position, self.player2Position,
+            self.player1Type, self.player2Type,
+            self.player1Score, self.player2Score
+        ))
+        move2 = (0, (-1, -1))
+        if self.player2:
+            move2 = self.applyMove(2, self.runPlayer(
+                self.player2, self.player2Position, self.player1Position,
+                self.player2Type, self.player1Type,
+                self.player2Score, self.player1Score
+            ))
+        self.endStep(move1, move2)
+
+    # Une étape se découpe en beginStep, puis l'obtention et le jugement des coups (judgePlayer), leur application
+    # (applyMove ou applySimultaneousMoves) et endStep. Seule l'obtention des coups change d'une façon de jouer à l'autre
+    # (appel direct, processus des joueurs, clients distants de server.py).
+
+    def beginStep(self):
+        if self.videoPath and self.videoRecorder is None:
+            self.startVideo()
+        self.currentStep += 1
+        self.lastCross = 0
+        if self.metrics is not None:
+            self.metrics.beginStep(self.currentStep)
+
+    def applyMove(self, n: int, move):
+        """
+            Applique au joueur n (1 ou 2) le coup (pénalité, position) retourné par judgePlayer, et le retourne.
+        """
+        s, p = move
+        if n == 1:
+            self.player1Score += s
+            self.player1Position = p
+        else:
+            self.player2Score += s
+            self.player2Position = p
+        return move
+
+    def applySimultaneousMoves(self, move1, move2):
+        """
+            Applique ensemble les coups des deux joueurs, jugés sur le même état, et retourne crossed pour endStep
+            (processPoints) :
+                - si les deux joueurs arrivent sur la même case, ils ramassent tous les deux son contenu, puis le croisement
+                    est résolu comme d'habitude ;
+                - s'ils échangent leurs cases, ils se croisent (crossed vaut True) : le croisement est résolu de la même
+                    manière.
+        """
+        p1, p2 = self.player1Position, self.player2Position
+        self.applyMove(1, move1)
+        self.applyMove(2, move2)
+        return move1[1] == p2 and move2[1] == p1
+
+    def endStep(self, move1, move2, **points):
+        """
+            Résout l'étape une fois les coups appliqués (processPoints, avec les arguments points), puis l'enregistre
+            (replayPath, videoPath) et envoie ses événements. move1, move2: (pénalité, position) de chaque joueur
+            ((0, (-1, -1)) sans joueur 2).
+        """
+        start = time.perf_counter_ns()
+        self.processPoints(**points)
+        self.recordTime('processPoints', time.perf_counter_ns() - start)
+        if self.recorder is not None:
+            self.recorder.recordStep(move1, move2, self.lastCross)
+        if self.videoRecorder is not None:
+            self.captureFrame()
+        self.events.flush()
+
+    def result(self):
+        return ChallengeResult(
+            steps=self.currentStep,
+            player1Name=self.player1.name if self.player1 else None,
+            player2Name=self.player2.name if self.player2 else None,
+            player1Score=self.player1Score,
+            player2Score=self.player2Score,
+            player1Stats=self.player1Stats,
+            player2Stats=self.player2Stats,
+        )
+
+    def runHeadless(self):
+        """
+            Joue toutes les étapes restantes le plus vite possible, sans affichage, et retourne un ChallengeResult.
+            La partie n'attend jamais la vidéo éventuelle (videoPath) : les images que le rendu n'a pas le temps de dessiner
+            sont abandonnées, comme à l'écran.
+        """
+        try:
+            while self.currentStep < self.steps:
+                self.step()
+        finally:
+            self.close()
+        return self.result()
+
+class BasePlayer:
+    def __init__(self, config: ChallengeConfig) -> None:
+        """
+            challengeConfig: Various information about the challenge that you can access (including width, height, stepsMax, etc.).
+        """
+        self.name = 'No name given'
+        self.config = config
+
+    # pylint: disable=unused-argument
+    def play(
+        self,
+        maze: np.array,
+        myPosition: tuple[int, int],
+        enemyPosition: tuple[int, int],
+        myType: int,
+        enemyType: int,
+        myScore: int,
+        enemyScore: int,
+    ):
+        """
+        Joue un coup dans le jeu en retournant la prochaine position où devra aller le joueur.
+
+        Parameters:
+            maze (numpy.ndarray): Un tableau numpy 2D d'entiers (int8 avec les réglages par défaut) représentant le labyrinthe où le jeu se déroule.
+                Pour obtenir la cellule à la position (x, y), utilisez `maze[y][x]`.
+            myPosition (tuple[int, int]): Un tuple représentant la position actuelle du joueur dans le labyrinthe.
+            enemyPosition (tuple[int, int]): Un tuple représentant la position actuelle du joueur adverse.
+            myType (int): Un entier représentant le type de joueur contrôlé par la fonction (l'un de : TYPE_PIERRE, TYPE_CISEAU, TYPE_FEUILLE).
+            enemyType (int): Un entier représentant le type de joueur adverse (l'un de : TYPE_PIERRE, TYPE_CISEAU, TYPE_FEUILLE).
+            myScore (int): Un entier représentant le score actuel du joueur contrôlé.
+            enemyScore (int): Un entier représentant le score actuel du joueur adverse.
+
+        Returns:
+            tuple[int, int]: Un tuple représentant le prochain mouvement à effectuer par le joueur contrôlé par la fonction.
+                Le tuple contient deux entiers représentant les coordonnées (x, y) de la prochaine position.
+
+        Remarques :
+            - La fonction est censée analyser l'état du jeu fourni par les paramètres et décider du prochain mouvement.
+            - La fonction doit retourner une position valide, qui différe de la position précédente d'une seule case (sur les x ou y exclusivement).
+            - Si vous renvoyez un mauvais mouvement (aller dans un mur par exemple), une pénalité de score est appliquée et un mouvement aléatoire est joué.
+            - Si une exception se produit, une pénalité de score est appliquée et un mouvement aléatoire est joué.
+            - Si la fonction est trop lente, une pénalité de score est appliquée et un mouvement aléatoire est joué.
+            - Les types de cellules du labyrinthe sont les suivants :
+                - (-1) indique un mur
+                - (-2) indique une cellule de rafraîchissement, passer par cette cellule changera le type du joueur de manière aléatoire.
+                - tout autre nombre est une cellule libre où le joueur obtient le score donné (peut être positif ou négatif !)
+            - Si votre type de joueur est gagnant sur le type de l'adversaire (exemple Feuille > Pierre), alors si vous passez sur
+                la même case que l'adversaire, vous gagnez un bonus de points et l'adversaire est déplacé vers une case aléatoire dans le labyrinth.
+            - Pour simuler les coups à venir : model = self.config.forwardModel(maze), puis
+                state = model.initialState(myPosition, enemyPosition, myType, enemyType, myScore, enemyScore) et
+                forward.step(state, myMove, enemyMove) (voir forward.py).
+            - self.config.mazeTree.distance(a, b) et self.config.mazeTree.nextStepTowards(a, b) donnent la distance entre deux
+                cases et le premier pas du chemin de a vers b, en temps constant (voir mazetree.py).
+        """
+        return (1, 1)
+
+class BatchPlayer(BasePlayer):
+    """
+        Joueur qui décide pour plusieurs parties en un seul appel (voir batch.py) : playBatch reçoit les états empilés de
+        toutes les parties où il doit jouer, par exemple pour évaluer une politique vectorisée une seule fois par étape.
+        Dans une partie ordinaire (ChallengeEngine, tournament.py), play appelle playBatch avec une seule partie.
+    """
+    def play(
+        self,
+        maze: np.array,
+        myPosition: tuple[int, int],
+        enemyPosition: tuple[int, int],
+        myType: int,
+        enemyType: int,
+        myScore: int,
+        enemyScore: int,
+    ):
+        moves = self.playBatch(
+            maze[None],
+            np.array([myPosition]),
+            np.array([enemyPosition if enemyPosition is not None else (-1, -1)]),
+            np.array([myType]),
+            np.array([enemyType]),
+            np.array([myScore]),
+            np.array([enemyScore]),
+        )
+        return (int(moves[0][0]), int(moves[0][1]))
+
+    # pylint: disable=unused-argument
+    def playBatch(
+        self,
+        mazes: np.ndarray,
+        myPositions: np.ndarray,
+        enemyPositions: np.ndarray,
+        myTypes: np.ndarray,
+        enemyTypes: np.ndarray,
+        myScores: np.ndarray,
+        enemyScores: np.ndarray,
+    ):
+        """
+        Joue un coup dans chacune des N parties données, avec les mêmes règles que BasePlayer.play.
+
+        Parameters:
+            mazes (numpy.ndarray): (N, H, W), les labyrinthes (des copies) ; la cellule (x, y) de la partie i est mazes[i, y, x].
+            myPositions, enemyPositions (numpy.ndarray): (N, 2), les positions (x, y) du joueur et de l'adversaire.
+            myTypes, enemyTypes, myScores, enemyScores (numpy.ndarray): (N,), les types et scores.
+
+        Returns:
+            numpy.ndarray: (N, 2), la prochaine position (x, y) dans chaque partie.
+
+        Remarque : self.config.mazeTree n'est celui de la partie que lorsque le joueur ne joue qu'une partie.
+        """
+        return myPositions + (1, 0)
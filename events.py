@@ -0,0 +1,221 @@
+# Flux d'événements de la partie (coups, points ramassés, croisements, pénalités), envoyés par lots à des récepteurs
+# Réglé par ChallengeConfig(eventLevel=..., eventLog='partie.jsonl', consoleEvents=...)
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import collections
+import json
+import queue
+import sys
+import threading
+
+# Niveaux de détail : un événement n'est créé que si son niveau est au moins celui du flux
+LEVEL_MOVE = 10
+LEVEL_INFO = 20
+LEVEL_PENALTY = 30
+LEVEL_ERROR = 40
+
+# Types d'événements et leur niveau
+EVENT_MOVE = 'move'             # un joueur va jouer
+EVENT_PICKUP = 'pickup'         # un joueur ramasse une cellule à points (value)
+EVENT_REFRESH = 'refresh'       # un joueur passe sur une cellule de rafraîchissement (type : le nouveau type)
+EVENT_CROSS = 'cross'           # un joueur gagne un croisement (respawn : la nouvelle position du perdant)
+EVENT_TIMEOUT = 'timeout'       # le joueur a trop tardé
+EVENT_BAD_MOVE = 'badMove'      # position invalide (position -> move)
+EVENT_EXCEPTION = 'exception'   # le joueur a levé une exception (message, traceback)
+EVENT_DROPPED = 'dropped'       # dernier enregistrement d'un ThreadedSink dont des événements ont été perdus (events, error)
+
+LEVELS = {
+    EVENT_MOVE: LEVEL_MOVE,
+    EVENT_PICKUP: LEVEL_INFO,
+    EVENT_REFRESH: LEVEL_INFO,
+    EVENT_CROSS: LEVEL_INFO,
+    EVENT_TIMEOUT: LEVEL_PENALTY,
+    EVENT_BAD_MOVE: LEVEL_PENALTY,
+    EVENT_EXCEPTION: LEVEL_ERROR,
+    EVENT_DROPPED: LEVEL_ERROR,
+}
+
+class Event:
+    """
+        player : 1 ou 2, name : le nom du joueur, data : les champs propres au type d'événement.
+    """
+    __slots__ = ('step', 'kind', 'player', 'name', 'data')
+
+    def __init__(self, step: int, kind: str, player: int, name: str, data: dict) -> None:
+        self.step = step
+        self.kind = kind
+        self.player = player
+        self.name = name
+        self.data = data
+
+    @property
+    def level(self):
+        return LEVELS[self.kind]
+
+    def asDict(self):
+        d = {'step': self.step, 'kind': self.kind, 'player': self.player, 'name': self.name}
+        d.update(self.data)
+        return d
+
+class EventSink:
+    """
+        Récepteur d'événements : receive est appelée avec la liste des événements d'une étape.
+    """
+    def receive(self, events: list[Event]):
+        pass
+
+    def close(self):
+        pass
+
+class NullSink(EventSink):
+    pass
+
+class RingBufferSink(EventSink):
+    """
+        Garde en mémoire les capacity derniers événements.
+    """
+    def __init__(self, capacity: int = 10000) -> None:
+        self.events = collections.deque(maxlen=capacity)
+
+    def receive(self, events: list[Event]):
+        self.events.extend(events)
+
+class JsonLinesSink(EventSink):
+    """
+        Écrit un objet JSON par ligne, avec un tampon d'écriture.
+    """
+    def __init__(self, path: str) -> None:
+        self.file = open(path, 'w', encoding='utf-8', buffering=1 << 16) # pylint: disable=consider-using-with
+
+    def receive(self, events: list[Event]):
+        self.file.write(''.join(json.dumps(e.asDict(), ensure_ascii=False, default=str) + '\n' for e in events))
+
+    def close(self):
+        self.file.close()
+
+class ConsoleSink(EventSink):
+    """
+        Les messages historiques du moteur, en français. Les autres types d'événements ne sont pas affichés.
+    """
+    def receive(self, events: list[Event]):
+        lines = []
+        for e in events:
+            name = e.name
+            if e.kind == EVENT_MOVE:
+                lines.append('Le joueur "' + name + '" joue')
+            elif e.kind == EVENT_TIMEOUT:
+                lines.append('Le joueur ' + name + ' a trop tardé ... Une pénalité de score est appliquée.')
+            elif e.kind == EVENT_BAD_MOVE:
+                lines.append('Le joueur ' + name + ' a retourné une position invalide (' + str(tuple(e.data['position'])) + '->' + str(e.data['move']) + ') ... Une pénalité de score est appliquée.')
+            elif e.kind == EVENT_EXCEPTION:
+                lines.append('Le joueur ' + name + ' a émi une exception ... Une pénalité de score est appliquée.')
+                lines.append('Exception:  ' + e.data['message'])
+                sys.stdout.write('\n'.join(lines) + '\n')
+                lines = []
+                sys.stderr.write(e.data['traceback'])
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+
+class ThreadedSink(EventSink):
+    """
+        Transmet les lots à un autre récepteur depuis un fil d'exécution dédié : la boucle de jeu n'attend l'écriture que
+        si maxBatches lots sont déjà en attente, et aucun lot n'est perdu. Seuls les lots que le récepteur n'a pas pu
+        écrire (exception) sont comptés dans dropped ; close les signale alors par un dernier événement EVENT_DROPPED et
+        un message sur stderr.
+    """
+    def __init__(self, sink: EventSink, maxBatches: int = 1000) -> None:
+        self.sink = sink
+        self.queue = queue.Queue(maxBatches)
+        self.dropped = 0
+        self.error = None
+        self.lastStep = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            events = self.queue.get()
+            if events is None:
+                break
+            try:
+                self.sink.receive(events)
+            except Exception as e: # pylint: disable=broad-except
+                self.dropped += len(events)
+                self.error = self.error or repr(e)
+
+    def receive(self, events: list[Event]):
+        self.lastStep = events[-1].step
+        self.queue.put(events)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.dropped:
+            sys.stderr.write('Événements : {} événements perdus ({})\n'.format(self.dropped, self.error))
+            try:
+                self.sink.receive([Event(self.lastStep, EVENT_DROPPED, 0, '', {'events': self.dropped, 'error': self.error})])
+            except Exception: # pylint: disable=broad-except
+                pass
+        self.sink.close()
+
+class EventStream:
+    """
+        Accumule les événements d'une étape et les envoie en un seul lot à chaque récepteur (flush).
+        Le moteur teste wants(kind) avant de construire un événement : sous le niveau choisi, ou sans récepteur, un
+        événement ne coûte qu'une recherche dans un dictionnaire.
+    """
+    def __init__(self, level: int = LEVEL_MOVE, sinks: list[EventSink] = None) -> None:
+        self.level = level
+        self.sinks = list(sinks or [])
+        self.pending = []
+        self.updateKinds()
+
+    def updateKinds(self):
+        self.kinds = {kind: bool(self.sinks) and l >= self.level for kind, l in LEVELS.items()}
+
+    def setLevel(self, level: int):
+        self.level = level
+        self.updateKinds()
+
+    def addSink(self, sink: EventSink):
+        self.sinks.append(sink)
+        self.updateKinds()
+
+    def wants(self, kind: str):
+        return self.kinds[kind]
+
+    def emit(self, step: int, kind: str, player: int, name: str, **data):
+        if self.kinds[kind]:
+            self.pending.append(Event(step, kind, player, name, data))
+
+    def flush(self):
+        if not self.pending:
+            return
+        events, self.pending = self.pending, []
+        for sink in self.sinks:
+            sink.receive(events)
+
+    def close(self):
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+        self.updateKinds()
@@ -0,0 +1,230 @@
+# Modèle du jeu pour les joueurs qui veulent explorer les coups à venir (MCTS, recherche en faisceau, ...)
+# Obtenu avec self.config.forwardModel(maze) dans BasePlayer.play
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import random
+import numpy as np
+from engine import ChallengeConfig, ChallengeEngine
+
+class GameState:
+    """
+        Un état du jeu, léger et copiable. Le labyrinthe est partagé par tous les états d'un même ForwardModel : chaque
+        état ne garde que les cellules modifiées (dictionnaire indice -> valeur), lui-même partagé entre un état et ses
+        copies jusqu'à la première modification (copie à l'écriture).
+    """
+    __slots__ = (
+        'model', 'changes', 'ownsChanges', 'currentStep',
+        'player1Position', 'player2Position',
+        'player1Type', 'player2Type',
+        'player1Score', 'player2Score',
+    )
+
+    def __init__(self, model: ForwardModel, changes: dict, currentStep: int, player1Position, player2Position,
+                 player1Type: int, player2Type: int, player1Score: int, player2Score: int) -> None:
+        self.model = model
+        self.changes = changes
+        self.ownsChanges = False
+        self.currentStep = currentStep
+        self.player1Position = player1Position
+        self.player2Position = player2Position
+        self.player1Type = player1Type
+        self.player2Type = player2Type
+        self.player1Score = player1Score
+        self.player2Score = player2Score
+
+    def copy(self):
+        self.ownsChanges = False
+        return GameState(
+            self.model, self.changes, self.currentStep,
+            self.player1Position, self.player2Position,
+            self.player1Type, self.player2Type,
+            self.player1Score, self.player2Score,
+        )
+
+    def cell(self, x: int, y: int):
+        i = y * self.model.width + x
+        return self.changes.get(i, self.model.cells[i])
+
+    def setCell(self, x: int, y: int, value: int):
+        if not self.ownsChanges:
+            self.changes = dict(self.changes)
+            self.ownsChanges = True
+        self.changes[y * self.model.width + x] = value
+
+    def maze(self):
+        """
+            Le labyrinthe de cet état, sous forme de tableau numpy (copie).
+        """
+        maze = np.array(self.model.cells, dtype=self.model.dtype).reshape(self.model.height, self.model.width)
+        flat = maze.ravel()
+        for i, value in self.changes.items():
+            flat[i] = value
+        return maze
+
+class ForwardModel:
+    """
+        Les règles du moteur (ChallengeEngine.processPoints, isValidPosFrom, replaceMazeCell) appliquées à des GameState.
+
+        Les événements aléatoires (changement de type sur une cellule de rafraîchissement, réapparition après un
+        croisement, régénération des cellules) suivent les mêmes lois que dans le moteur, mais sont tirés avec le
+        générateur rnd donné à step : le moteur garde son propre générateur, le tirage réel peut donc différer.
+    """
+    def __init__(self, config: ChallengeConfig, maze: np.ndarray) -> None:
+        self.config = config
+        self.height, self.width = maze.shape
+        self.dtype = maze.dtype
+        self.cells = maze.ravel().tolist()
+        self.emptyCells = [i for i, v in enumerate(self.cells) if v == 0]
+        self.random = random.Random()
+
+    def initialState(self, myPosition, enemyPosition, myType: int, enemyType: int, myScore: int, enemyScore: int, currentStep: int = 0):
+        """
+            L'état vu par le joueur : le joueur 1 de l'état est toujours le joueur qui appelle (comme dans BasePlayer.play).
+            enemyPosition vaut None s'il n'y a pas d'adversaire.
+        """
+        return GameState(
+            self, {}, currentStep,
+            tuple(myPosition), tuple(enemyPosition) if enemyPosition is not None else None,
+            myType, enemyType, myScore, enemyScore,
+        )
+
+    def isValidPosFrom(self, state: GameState, p0, p1):
+        x, y = p1
+        if not (0 <= x < self.width and 0 <= y < self.height) or state.cell(x, y) == -1:
+            return False
+        return abs(p1[0] - p0[0]) + abs(p1[1] - p0[1]) == 1
+
+    def validMoves(self, state: GameState, pos):
+        x, y = pos
+        return [p for p in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)) if self.isValidPosFrom(state, pos, p)]
+
+    def randomMove(self, state: GameState, pos, rnd: random.Random):
+        x, y = pos
+        moves = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+        rnd.shuffle(moves)
+        for p in moves:
+            if self.isValidPosFrom(state, pos, p):
+                return p
+        return pos
+
+    def randomEmptyCell(self, state: GameState, occupied, rnd: random.Random):
+        """
+            Une cellule vide tirée uniformément, hors des positions occupied (voir ChallengeEngine.genPlayerPosition).
+            Tirage avec rejet parmi les cellules vides du labyrinthe d'origine et les cellules vidées depuis.
+        """
+        cleared = [i for i, v in state.changes.items() if v == 0]
+        n = len(self.emptyCells)
+        free = n + len(cleared)
+        for _ in range(100 * free):
+            j = rnd.randrange(free)
+            i = self.emptyCells[j] if j < n else cleared[j - n]
+            p = (i % self.width, i // self.width)
+            if state.changes.get(i, self.cells[i]) == 0 and p not in occupied:
+                return p
+        candidates = [p for p in ((i % self.width, i // self.width) for i in self.emptyCells + cleared)
+                      if state.cell(p[0], p[1]) == 0 and p not in occupied]
+        if not candidates:
+            raise RuntimeError('No free cell left in the maze')
+        return rnd.choice(candidates)
+
+    def regenerateCell(self, state: GameState, oldCell: int, rnd: random.Random):
+        c = self.config
+        if oldCell == -2:
+            if not c.enableRPCGame:
+                return
+            low, high = -2, -2
+        elif oldCell < 0:
+            low, high = c.scoreMinValue, -3
+        elif oldCell <= c.score1Value:
+            low, high = 1, c.score1Value
+        else:
+            low, high = c.score1Value + 1, c.score2Value
+        x, y = self.randomEmptyCell(state, (state.player1Position, state.player2Position), rnd)
+        state.setCell(x, y, rnd.randrange(low, high + 1))
+
+    def replaceCell(self, state: GameState, x: int, y: int, oldCell: int, rnd: random.Random):
+        state.setCell(x, y, 0)
+        if self.config.regenerateCells:
+            self.regenerateCell(state, oldCell, rnd)
+
+    def step(self, state: GameState, move1, move2=None, rnd: random.Random = None):
+        """
+            Retourne l'état après que les joueurs ont joué move1 et move2 (state n'est pas modifié). Un coup invalide est
+            remplacé par un coup aléatoire avec la pénalité scoreOnBadMove, comme dans le moteur. En mode simultané, deux
+            joueurs qui échangent leurs cases se croisent.
+        """
+        c = self.config
+        rnd = rnd or self.random
+        s = state.copy()
+        s.currentStep += 1
+
+        p1, p2 = state.player1Position, state.player2Position
+        move1 = tuple(move1)
+        if not self.isValidPosFrom(s, p1, move1):
+            s.player1Score += c.scoreOnBadMove
+            move1 = self.randomMove(s, p1, rnd)
+        s.player1Position = move1
+        if p2 is not None:
+            move2 = tuple(move2)
+            if not self.isValidPosFrom(s, p2, move2):
+                s.player2Score += c.scoreOnBadMove
+                move2 = self.randomMove(s, p2, rnd)
+            s.player2Position = move2
+        crossed = c.simultaneousMoves and p2 is not None and move1 == p2 and move2 == p1
+
+        x1, y1 = move1
+        cell1 = s.cell(x1, y1)
+        if p2 is not None:
+            x2, y2 = move2
+            cell2 = s.cell(x2, y2)
+        if cell1:
+            if cell1 == -2:
+                s.player1Type = (s.player1Type + rnd.choice([1, 2])) % len(ChallengeEngine.TYPES)
+            else:
+                s.player1Score += cell1
+            self.replaceCell(s, x1, y1, cell1, rnd)
+        if p2 is None:
+            return s
+
+        if cell2:
+            if cell2 == -2:
+                s.player2Type = (s.player2Type + rnd.choice([1, 2])) % len(ChallengeEngine.TYPES)
+            else:
+                s.player2Score += cell2
+            if move1 != move2:
+                self.replaceCell(s, x2, y2, cell2, rnd)
+        if c.enableRPCGame and (crossed or move1 == move2):
+            r = compareTypes(s.player1Type, s.player2Type)
+            if r > 0:
+                s.player1Score += c.scoreCrossValue
+                s.player2Position = self.randomEmptyCell(s, (s.player1Position,), rnd)
+            elif r < 0:
+                s.player2Score += c.scoreCrossValue
+                s.player1Position = self.randomEmptyCell(s, (s.player2Position,), rnd)
+        return s
+
+compareTypes = ChallengeEngine.compareTypes
+
+def step(state: GameState, move1, move2=None, rnd: random.Random = None):
+    """
+        Fonction pure : l'état suivant de state (voir ForwardModel.step).
+    """
+    return state.model.step(state, move1, move2, rnd)
@@ -14,13 +14,31 @@ def main():
         height=30,
         delayToRun=5, # Nombre de secondes avant de démarrer la simulation
         steps=1000, # Nombre d'étapes à simuler
-        stepDelay=0, # Durée en millisecondes pour passer à l'étape suivante (augmenter pour ralentir)
+        stepDelay=20, # Durée en millisecondes pour passer à l'étape suivante (augmenter pour ralentir, 0 pour aller le plus vite possible)
+        targetFps=60, # Nombre maximal d'images affichées par seconde (les étapes intermédiaires ne sont pas affichées)
+        fastForward=False, # Mettre à True pour démarrer en avance rapide (touche F pendant la partie)
+        # Caméra : molette ou Page haut / Page bas pour zoomer, W A S D ou glisser pour se déplacer, 1 / 2 pour suivre un joueur, 0 pour tout voir
 
         # Mode de jeu
         enableRPCGame=True, # Mettre à False pour désactiver le mode Papier-Pierre-Ciseaux
         regenerateCells=False, # Mettre à True pour immediatement ajouter d'autres bonus, lorsqu'ils sont consommés
+        simultaneousMoves=False, # Mettre à True pour que les deux joueurs jouent en même temps (chacun dans son processus), sans voir le coup de l'autre
         randomSeed=None, # Mettre un nombre, pour générer une partie identique à chaque fois,
         playSounds=False, # Mettre à False pour ne pas jouer les sons
+        readOnlyMaze=False, # Mettre à True pour transmettre aux joueurs le labyrinthe en lecture seule, sans copie (plus rapide sur les grands labyrinthes)
+        scenarioPack=None, # Dossier créé par scenarios.py build : la partie démarre sans génération si sa graine (randomSeed) y figure
+        mazePath=None, # Fichier .npy où garder le labyrinthe, projeté en mémoire (très grands labyrinthes, de préférence avec mazeAlgorithm='eller')
+        videoPath=None, # Fichier vidéo (.mp4, avec ffmpeg) ou dossier d'images PNG où enregistrer la partie, rendue dans un processus séparé
+
+        # Mesures de performance
+        collectMetrics=False, # Mettre à True pour afficher à la fin de la partie le temps passé par étape (joueurs, moteur, affichage, attente)
+        metricsPath=None, # Fichier .csv ou .json où écrire le temps de chaque étape
+        profileDir=None, # Dossier où écrire un profil cProfile de chaque joueur (lisible avec pstats)
+
+        # Événements de la partie (voir events.py)
+        consoleEvents=True, # Mettre à False pour ne plus afficher les messages des joueurs dans la console
+        eventLog=None, # Fichier JSON Lines où écrire les événements (coups, points, croisements, pénalités)
+        eventLevel=10, # Niveau minimal des événements : 10 (tous), 20 (points et croisements), 30 (pénalités), 40 (exceptions)
 
         # Réglage des scores et des pénalités
         score1Value=3, # Score maximal (etoiles jaunes)
@@ -33,6 +51,7 @@ def main():
         scoreOnBadMove=-35, # Pénalité si un coup illégal est retourné
         scoreOnException=-50, # Pénalité si une exception survient
         scoreOnTimeout=-13, # Pénalité si le joueur met trop de temps à jouer
+        playerWorkers=False, # Mettre à True pour exécuter chaque joueur dans son propre processus (limite de temps précise, fonctionne aussi sous Windows)
         maxTime=500, # Si le joueur prend plus de temps que ce qui est donné ici en millisecondes, alors un coup aléatoire est joué et une pénalité est appliquée
     )
 
@@ -0,0 +1,199 @@
+# Algorithmes de génération de labyrinthes parfaits (un seul chemin entre deux cellules)
+# L'algorithme est choisi par ChallengeConfig.mazeAlgorithm
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import random
+import numpy as np
+
+# Tous les générateurs prennent le nombre de cellules (w, h) et retournent un tableau uint8 de taille (2h+1, 2w+1),
+# où 1 indique un mur et 0 un passage.
+
+def backtracker(w: int, h: int, rnd: random.Random):
+    """
+        Parcours en profondeur itératif, sur un bytearray plat.
+        Consomme le générateur aléatoire exactement comme l'ancienne version de ChallengeEngine.genMaze : une graine donne
+        toujours le même labyrinthe.
+    """
+    W = 2 * w + 1
+    grid = bytearray(b'\x01') * ((2 * h + 1) * W)
+    visited = bytearray(w * h)
+
+    visited[0] = 1
+    grid[W + 1] = 0
+
+    stack = [(0, 0)]
+    while stack:
+        y, x = stack[-1]
+
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+        rnd.shuffle(directions)
+
+        for dy, dx in directions:
+            ny, nx = y + dy, x + dx
+            if 0 <= nx < w and 0 <= ny < h and not visited[ny * w + nx]:
+                visited[ny * w + nx] = 1
+                grid[(2 * ny + 1) * W + 2 * nx + 1] = 0
+                grid[(2 * y + 1 + dy) * W + 2 * x + 1 + dx] = 0
+                stack.append((ny, nx))
+                break
+        else:
+            stack.pop()
+
+    return np.frombuffer(grid, dtype=np.uint8).reshape(2 * h + 1, W).copy()
+
+def ellerRows(w: int, h: int, rnd: random.Random):
+    """
+        Algorithme d'Eller : produit le labyrinthe ligne par ligne (deux lignes du tableau à chaque fois), avec une
+        mémoire en O(w). Permet d'écrire de très grands labyrinthes directement dans leur stockage final.
+    """
+    W = 2 * w + 1
+    yield np.ones(W, dtype=np.uint8)
+
+    sets = list(range(w))
+    members = {i: [i] for i in range(w)}
+    nextSet = w
+    for y in range(h):
+        last = y == h - 1
+        cells = np.ones(W, dtype=np.uint8)
+        cells[1:W:2] = 0
+
+        for x in range(w - 1):
+            a, b = sets[x], sets[x + 1]
+            if a != b and (last or rnd.random() < 0.5):
+                cells[2 * x + 2] = 0
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for i in members[b]:
+                    sets[i] = a
+                members[a].extend(members.pop(b))
+        yield cells
+
+        if last:
+            break
+
+        down = np.ones(W, dtype=np.uint8)
+        nextSets = [-1] * w
+        nextMembers = {}
+        for s, xs in members.items():
+            rnd.shuffle(xs)
+            for i, x in enumerate(xs):
+                if i == 0 or rnd.random() < 0.5:
+                    down[2 * x + 1] = 0
+                    nextSets[x] = s
+                    nextMembers.setdefault(s, []).append(x)
+        for x in range(w):
+            if nextSets[x] < 0:
+                nextSets[x] = nextSet
+                nextMembers[nextSet] = [x]
+                nextSet += 1
+        sets, members = nextSets, nextMembers
+        yield down
+
+    yield np.ones(W, dtype=np.uint8)
+
+def eller(w: int, h: int, rnd: random.Random):
+    walls = np.empty((2 * h + 1, 2 * w + 1), dtype=np.uint8)
+    for i, row in enumerate(ellerRows(w, h, rnd)):
+        walls[i] = row
+    return walls
+
+def kruskal(w: int, h: int, rnd: random.Random):
+    """
+        Algorithme de Kruskal : les murs intérieurs sont visités dans un ordre aléatoire et ouverts s'ils séparent deux
+        ensembles distincts (union-find avec compression de chemin et union par taille).
+    """
+    H, W = 2 * h + 1, 2 * w + 1
+    walls = np.ones((H, W), dtype=np.uint8)
+    walls[1:H:2, 1:W:2] = 0
+
+    # Arête e : les cellules a[e] et b[e], et le mur (wy[e], wx[e]) qui les sépare
+    ys, xs = np.mgrid[0:h, 0:w - 1]
+    ha, hb = (ys * w + xs).ravel(), (ys * w + xs + 1).ravel()
+    hy, hx = (2 * ys + 1).ravel(), (2 * xs + 2).ravel()
+    ys, xs = np.mgrid[0:h - 1, 0:w]
+    va, vb = (ys * w + xs).ravel(), ((ys + 1) * w + xs).ravel()
+    vy, vx = (2 * ys + 2).ravel(), (2 * xs + 1).ravel()
+    a, b = np.concatenate((ha, va)), np.concatenate((hb, vb))
+    wy, wx = np.concatenate((hy, vy)), np.concatenate((hx, vx))
+
+    order = np.random.default_rng(rnd.getrandbits(64)).permutation(len(a))
+
+    parent = list(range(w * h))
+    size = [1] * (w * h)
+    opened = np.zeros(len(a), dtype=bool)
+    remaining = w * h - 1
+    for e, ca, cb in zip(order.tolist(), a[order].tolist(), b[order].tolist()):
+        while parent[ca] != ca:
+            parent[ca] = parent[parent[ca]]
+            ca = parent[ca]
+        while parent[cb] != cb:
+            parent[cb] = parent[parent[cb]]
+            cb = parent[cb]
+        if ca == cb:
+            continue
+        if size[ca] < size[cb]:
+            ca, cb = cb, ca
+        parent[cb] = ca
+        size[ca] += size[cb]
+        opened[e] = True
+        remaining -= 1
+        if not remaining:
+            break
+
+    walls[wy[opened], wx[opened]] = 0
+    return walls
+
+ALGORITHMS = {
+    'backtracker': backtracker,
+    'eller': eller,
+    'kruskal': kruskal,
+}
+
+def checkAlgorithm(algorithm: str):
+    if algorithm not in ALGORITHMS:
+        raise ValueError('Unknown maze algorithm: ' + str(algorithm) + ' (available: ' + ', '.join(ALGORITHMS) + ')')
+
+def shape(width: int, height: int):
+    """
+        La taille (lignes, colonnes) du tableau des murs produit pour width x height.
+    """
+    w, h = (width - 1) // 2, (height - 1) // 2
+    return (2 * h + 1, 2 * w + 1)
+
+def generate(algorithm: str, width: int, height: int, rnd: random.Random):
+    """
+        Retourne le tableau des murs (uint8, 1 = mur) d'un labyrinthe d'au plus width x height cases.
+    """
+    checkAlgorithm(algorithm)
+    w, h = (width - 1) // 2, (height - 1) // 2
+    return ALGORITHMS[algorithm](w, h, rnd)
+
+def generateRows(algorithm: str, width: int, height: int, rnd: random.Random):
+    """
+        Les lignes du tableau des murs, une par une : avec eller, le labyrinthe entier n'est jamais en mémoire, ce qui
+        permet de l'écrire directement dans un fichier projeté en mémoire. Même labyrinthe que generate.
+    """
+    checkAlgorithm(algorithm)
+    w, h = (width - 1) // 2, (height - 1) // 2
+    if algorithm == 'eller':
+        yield from ellerRows(w, h, rnd)
+    else:
+        yield from ALGORITHMS[algorithm](w, h, rnd)
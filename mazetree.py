@@ -0,0 +1,164 @@
+# Index des distances dans un labyrinthe parfait
+# Fourni aux joueurs par self.config.mazeTree
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+class MazeTree:
+    """
+        Les labyrinthes générés sont parfaits : les cases qui ne sont pas des murs forment un arbre. L'arbre est enraciné
+        sur la première case libre, puis parcouru une seule fois pour construire :
+            - parent et depth : le parent et la profondeur de chaque case (indices y * width + x) ;
+            - le tour eulérien de l'arbre, avec first et last, la première et la dernière apparition de chaque case ;
+            - une table creuse des minimums de profondeur sur le tour eulérien, pour trouver le plus proche ancêtre commun
+                de deux cases en temps constant.
+
+        distance et nextStepTowards sont ensuite en temps constant, au lieu d'un parcours en largeur du labyrinthe.
+        Les murs ne changent jamais pendant une partie : l'index reste valable quel que soit le contenu des cases.
+        L'index (et la carte des murs) n'est construit qu'à la première requête : créer un MazeTree ne coûte rien.
+    """
+    def __init__(self, maze: np.ndarray) -> None:
+        self.height, self.width = maze.shape
+        self.maze = maze
+        self.walls = None
+        self.parent = None
+        self.depth = None
+        self.first = None
+        self.last = None
+        self.euler = None
+        self.table = None
+
+    def build(self):
+        if self.table is not None:
+            return
+        self.walls = np.asarray(self.maze) == -1
+        self.maze = None
+        W = self.width
+        free = (~self.walls).ravel().tolist()
+        size = len(free)
+        if True not in free:
+            raise ValueError('The maze has no free cell')
+        root = free.index(True)
+
+        parent = [-1] * size
+        depth = [-1] * size
+        first = [-1] * size
+        last = [-1] * size
+        nextDir = [0] * size
+        offsets = (1, -1, W, -W)
+        euler = []
+
+        depth[root] = 0
+        first[root] = 0
+        stack = [root]
+        while stack:
+            v = stack[-1]
+            euler.append(v)
+            d = nextDir[v]
+            child = -1
+            while d < 4:
+                u = v + offsets[d]
+                d += 1
+                if free[u] and u != parent[v]:
+                    if depth[u] >= 0:
+                        raise ValueError('The maze is not perfect (it contains a cycle)')
+                    child = u
+                    break
+            nextDir[v] = d
+            if child < 0:
+                last[v] = len(euler) - 1
+                stack.pop()
+            else:
+                parent[child] = v
+                depth[child] = depth[v] + 1
+                first[child] = len(euler)
+                stack.append(child)
+        if len(euler) != 2 * sum(free) - 1:
+            raise ValueError('The maze is not connected')
+
+        self.parent = np.array(parent, dtype=np.int32)
+        self.depth = np.array(depth, dtype=np.int32)
+        self.first = np.array(first, dtype=np.int32)
+        self.last = np.array(last, dtype=np.int32)
+        self.euler = np.array(euler, dtype=np.int32)
+
+        # table[k][i] : la case la moins profonde de euler[i:i + 2^k]
+        level = self.euler
+        table = [level]
+        k = 1
+        while 2 * k <= len(self.euler):
+            a, b = level[:-k], level[k:]
+            level = np.where(self.depth[a] <= self.depth[b], a, b)
+            table.append(level)
+            k *= 2
+        self.table = table
+
+    def index(self, pos):
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height) or self.walls[y, x]:
+            raise ValueError('Not a free cell: ' + str(pos))
+        return y * self.width + x
+
+    def position(self, i):
+        return (int(i % self.width), int(i // self.width))
+
+    def lcaIndex(self, i, j):
+        l, r = self.first[i], self.first[j]
+        if l > r:
+            l, r = r, l
+        k = int(r - l + 1).bit_length() - 1
+        level = self.table[k]
+        a, b = level[l], level[r - (1 << k) + 1]
+        return a if self.depth[a] <= self.depth[b] else b
+
+    def lca(self, a, b):
+        """
+            Le plus proche ancêtre commun des cases a et b (positions (x, y)).
+        """
+        self.build()
+        return self.position(self.lcaIndex(self.index(a), self.index(b)))
+
+    def distance(self, a, b):
+        """
+            Le nombre de coups pour aller de a à b.
+        """
+        self.build()
+        i, j = self.index(a), self.index(b)
+        if i == j:
+            return 0
+        return int(self.depth[i] + self.depth[j] - 2 * self.depth[self.lcaIndex(i, j)])
+
+    def nextStepTowards(self, a, b):
+        """
+            La case voisine de a sur le chemin de a vers b (a si a == b).
+        """
+        self.build()
+        i, j = self.index(a), self.index(b)
+        if i == j:
+            return tuple(a)
+        fj = self.first[j]
+        if not self.first[i] <= fj <= self.last[i]:
+            # b n'est pas dans le sous-arbre de a : le chemin remonte vers le parent
+            return self.position(self.parent[i])
+        for u in (i + 1, i - 1, i + self.width, i - self.width):
+            if self.parent[u] == i and self.first[u] <= fj <= self.last[u]:
+                return self.position(u)
+        raise RuntimeError('Inconsistent maze tree')
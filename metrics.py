@@ -0,0 +1,164 @@
+# Mesures du temps passé à chaque étape : réflexion des joueurs, moteur, affichage et attente
+# Activé par ChallengeConfig(collectMetrics=True) ou ChallengeConfig(metricsPath='partie.json')
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import contextlib
+import cProfile
+import csv
+import json
+import math
+import os
+import re
+
+CHANNELS = ('player1Think', 'player2Think', 'processPoints', 'render', 'idle')
+
+class StreamingHistogram:
+    """
+        Histogramme à pas logarithmiques (environ 4 % de précision) : les centiles sont calculés sans garder les valeurs.
+        Le minimum, le maximum et la moyenne sont exacts.
+    """
+    BUCKETS_PER_OCTAVE = 16
+
+    def __init__(self) -> None:
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value: int):
+        b = int(math.log2(value) * self.BUCKETS_PER_OCTAVE) if value > 0 else -1
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, p: float):
+        """
+            La valeur sous laquelle se trouvent p % des mesures (borne haute de son intervalle).
+        """
+        if not self.count:
+            return 0
+        rank = math.ceil(p / 100 * self.count)
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                value = 0 if b < 0 else 2 ** ((b + 1) / self.BUCKETS_PER_OCTAVE)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1e-3):
+        """
+            Résumé en microsecondes (pour des valeurs en nanosecondes).
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean * scale,
+            'p50': self.percentile(50) * scale,
+            'p95': self.percentile(95) * scale,
+            'p99': self.percentile(99) * scale,
+            'max': (self.max or 0) * scale,
+        }
+
+class StepMetrics:
+    """
+        Temps (time.perf_counter_ns) de chaque étape, par canal (voir CHANNELS). Les temps d'affichage et d'attente sont
+        comptés sur la dernière étape jouée. Chaque étape terminée alimente l'histogramme de son canal.
+    """
+    def __init__(self) -> None:
+        self.rows = []
+        self.current = None
+        self.histograms = {c: StreamingHistogram() for c in CHANNELS}
+
+    def beginStep(self, step: int):
+        self.endStep()
+        self.current = dict.fromkeys(CHANNELS, 0)
+        self.current['step'] = step
+
+    def endStep(self):
+        if self.current is None:
+            return
+        for c in CHANNELS:
+            self.histograms[c].add(self.current[c])
+        self.rows.append(self.current)
+        self.current = None
+
+    def add(self, channel: str, ns: int):
+        if self.current is not None:
+            self.current[channel] += ns
+
+    def summary(self):
+        return {c: h.summary() for c, h in self.histograms.items() if h.total}
+
+    def format(self):
+        lines = ['{:<16} {:>8} {:>10} {:>10} {:>10} {:>10} {:>10}'.format('µs / étape', 'Étapes', 'Moyenne', 'p50', 'p95', 'p99', 'Max')]
+        for c, s in self.summary().items():
+            lines.append('{:<16} {:>8} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+                c, s['count'], s['mean'], s['p50'], s['p95'], s['p99'], s['max']))
+        return '\n'.join(lines)
+
+    def export(self, path: str):
+        """
+            Écrit les temps de chaque étape (en ns) : en CSV si path se termine par .csv, sinon en JSON avec le résumé.
+        """
+        self.endStep()
+        if path.lower().endswith('.csv'):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=('step',) + CHANNELS)
+                writer.writeheader()
+                writer.writerows(self.rows)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'unit': 'ns', 'summaryUnit': 'µs', 'summary': self.summary(), 'steps': self.rows}, f)
+
+class CProfileHook:
+    """
+        Crochet de profilage des joueurs (ChallengeEngine.playerHook) : un cProfile.Profile par joueur, actif uniquement
+        pendant ses appels. Les joueurs exécutés dans leur propre processus (playerWorkers) ne sont pas profilés.
+    """
+    def __init__(self) -> None:
+        self.profiles = {}
+
+    @contextlib.contextmanager
+    def __call__(self, player):
+        profile = self.profiles.get(player)
+        if profile is None:
+            profile = self.profiles[player] = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def dump(self, directory: str):
+        """
+            Écrit un fichier <nom du joueur>.prof par joueur, lisible avec pstats ou snakeviz.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for i, (player, profile) in enumerate(self.profiles.items()):
+            name = re.sub(r'[^\w.-]+', '_', player.name) or 'player'
+            profile.dump_stats(os.path.join(directory, str(i + 1) + '-' + name + '.prof'))
@@ -0,0 +1,99 @@
+# Protocole binaire entre le serveur de parties (server.py) et les joueurs distants (client.py)
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# Chaque message est une trame : longueur (u32, petit-boutiste) du reste de la trame, type (u8), puis le contenu.
+#
+#   HELLO  client -> serveur   nom du client (utf-8)
+#   MATCH  serveur -> client   partie (u32), numéro du joueur (u8), hauteur et largeur (u32), taille du JSON (u32),
+#                              réglages de la partie (JSON de ChallengeConfig.configKwargs, avec mazeDtype), labyrinthe
+#   PLAY   serveur -> client   partie, appel (u32), positions (4 x i32, -1 sans adversaire), types (2 x i8),
+#                              scores (2 x i64), nombre de cellules modifiées depuis le dernier PLAY (u32), leurs indices
+#                              (u32) puis leurs valeurs (type du labyrinthe)
+#   MOVE   client -> serveur   partie, appel, position (2 x i32)
+#   ERROR  client -> serveur   partie, appel, message (utf-8) : le joueur a levé une exception
+#   END    serveur -> client   partie, scores (2 x i64) : le client oublie la partie
+
+from __future__ import annotations
+import json
+import struct
+import numpy as np
+
+HELLO = 1
+MATCH = 2
+PLAY = 3
+MOVE = 4
+ERROR = 5
+END = 6
+
+FRAME = struct.Struct('<IB')
+MATCH_HEADER = struct.Struct('<IBIII')
+PLAY_HEADER = struct.Struct('<IIiiiibbqqI')
+MOVE_BODY = struct.Struct('<IIii')
+CALL = struct.Struct('<II')
+END_BODY = struct.Struct('<Iqq')
+
+MAX_FRAME = 1 << 30
+
+def frame(kind: int, *parts: bytes):
+    size = 1 + sum(len(p) for p in parts)
+    return b''.join((FRAME.pack(size, kind),) + parts)
+
+def hello(name: str):
+    return frame(HELLO, name.encode('utf-8'))
+
+def match(matchId: int, player: int, configKwargs: dict, maze: np.ndarray):
+    config = json.dumps(dict(configKwargs, mazeDtype=maze.dtype.str)).encode('utf-8')
+    h, w = maze.shape
+    return frame(MATCH, MATCH_HEADER.pack(matchId, player, h, w, len(config)), config, np.ascontiguousarray(maze).tobytes())
+
+def parseMatch(body: memoryview):
+    matchId, player, h, w, n = MATCH_HEADER.unpack_from(body)
+    start = MATCH_HEADER.size
+    config = json.loads(bytes(body[start:start + n]).decode('utf-8'))
+    dtype = np.dtype(config.pop('mazeDtype'))
+    maze = np.frombuffer(body[start + n:], dtype=dtype).reshape(h, w).copy()
+    return matchId, player, config, maze
+
+def play(matchId: int, callId: int, myPos, enemyPos, myType: int, enemyType: int, myScore: int, enemyScore: int,
+         indices: np.ndarray, values: np.ndarray):
+    ex, ey = enemyPos if enemyPos is not None else (-1, -1)
+    header = PLAY_HEADER.pack(matchId, callId, myPos[0], myPos[1], ex, ey, myType, enemyType, myScore, enemyScore, len(indices))
+    return frame(PLAY, header, indices.astype('<u4').tobytes(), values.tobytes())
+
+def parsePlay(body: memoryview, dtype: np.dtype):
+    matchId, callId, mx, my, ex, ey, myType, enemyType, myScore, enemyScore, n = PLAY_HEADER.unpack_from(body)
+    start = PLAY_HEADER.size
+    indices = np.frombuffer(body[start:start + 4 * n], dtype='<u4')
+    values = np.frombuffer(body[start + 4 * n:start + 4 * n + n * dtype.itemsize], dtype=dtype)
+    enemyPos = (ex, ey) if ex >= 0 else None
+    return matchId, callId, ((mx, my), enemyPos, myType, enemyType, myScore, enemyScore), indices, values
+
+def move(matchId: int, callId: int, pos):
+    return frame(MOVE, MOVE_BODY.pack(matchId, callId, int(pos[0]), int(pos[1])))
+
+def error(matchId: int, callId: int, message: str):
+    return frame(ERROR, CALL.pack(matchId, callId), message.encode('utf-8', 'replace'))
+
+def parseError(body: memoryview):
+    matchId, callId = CALL.unpack_from(body)
+    return matchId, callId, bytes(body[CALL.size:]).decode('utf-8', 'replace')
+
+def end(matchId: int, myScore: int, enemyScore: int):
+    return frame(END, END_BODY.pack(matchId, myScore, enemyScore))
@@ -0,0 +1,263 @@
+# Dessin du labyrinthe avec pygame
+# Seule la partie visible est dessinée : le fond (murs et sol) est pré-rendu par tuiles et les icônes sont gardées à
+# la taille des cellules
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import collections
+import numpy as np
+import pygame
+from engine import ChallengeConfig
+
+class Camera:
+    """
+        Partie visible du labyrinthe : taille des cellules en pixels et première case affichée (x, y).
+
+        Sans zoom (cellSize None), tout le labyrinthe est affiché, comme avant, tant que les cellules gardent au moins
+        MIN_CELL_SIZE pixels ; au-delà, les cellules sont carrées et seule une partie du labyrinthe est visible.
+        Avec follow (1 ou 2), la caméra suit le joueur donné : elle ne se recentre que lorsqu'il sort de la zone
+        centrale de la vue, pour éviter de tout redessiner à chaque pas.
+    """
+    MIN_CELL_SIZE = 4
+    MAX_CELL_SIZE = 96
+    FOLLOW_MARGIN = 0.25
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.cellSize = None
+        self.x = 0
+        self.y = 0
+        self.follow = 0
+        self.cellWidth = 0
+        self.cellHeight = 0
+        self.columns = 0
+        self.rows = 0
+
+    @property
+    def state(self):
+        return (self.cellWidth, self.cellHeight, self.x, self.y, self.columns, self.rows)
+
+    def update(self, viewWidth: int, viewHeight: int, target=None):
+        """
+            Recalcule la vue pour une zone d'affichage de viewWidth x viewHeight pixels, en suivant target (position du
+            joueur suivi) si elle est donnée. Retourne True si la vue a changé.
+        """
+        old = self.state
+        size = self.cellSize
+        if size is None:
+            cw, ch = viewWidth // self.width, viewHeight // self.height
+            if min(cw, ch) >= self.MIN_CELL_SIZE:
+                self.cellWidth, self.cellHeight = cw, ch
+                self.x, self.y = 0, 0
+                self.columns, self.rows = self.width, self.height
+                return self.state != old
+            size = self.MIN_CELL_SIZE
+        self.cellWidth = self.cellHeight = size
+        self.columns = max(1, min(self.width, viewWidth // size))
+        self.rows = max(1, min(self.height, viewHeight // size))
+        if target is not None:
+            tx, ty = target
+            mx, my = int(self.columns * self.FOLLOW_MARGIN), int(self.rows * self.FOLLOW_MARGIN)
+            if not self.x + mx <= tx < self.x + self.columns - mx or not self.y + my <= ty < self.y + self.rows - my:
+                self.centerOn(tx, ty)
+        self.x = min(max(0, self.x), self.width - self.columns)
+        self.y = min(max(0, self.y), self.height - self.rows)
+        return self.state != old
+
+    def centerOn(self, x: int, y: int):
+        self.x = x - self.columns // 2
+        self.y = y - self.rows // 2
+
+    def pan(self, dx: int, dy: int):
+        """
+            Déplace la vue de dx, dy cases ; la caméra cesse de suivre un joueur.
+        """
+        self.follow = 0
+        if self.cellSize is None:
+            self.cellSize = min(self.cellWidth, self.cellHeight)
+        self.x += dx
+        self.y += dy
+
+    def zoom(self, factor: float, center=None):
+        """
+            Multiplie la taille des cellules par factor, en gardant la case center (par défaut le centre de la vue) au
+            même endroit de l'écran.
+        """
+        size = min(self.cellWidth, self.cellHeight) or self.MIN_CELL_SIZE
+        newSize = min(max(int(round(size * factor)), self.MIN_CELL_SIZE), self.MAX_CELL_SIZE)
+        if newSize == size and self.cellSize is not None:
+            return
+        cx, cy = center if center is not None else (self.x + self.columns // 2, self.y + self.rows // 2)
+        self.x = cx - (cx - self.x) * size // newSize
+        self.y = cy - (cy - self.y) * size // newSize
+        self.cellSize = newSize
+
+    def fit(self):
+        """
+            Revient à l'affichage du labyrinthe entier.
+        """
+        self.cellSize = None
+        self.follow = 0
+        self.x = self.y = 0
+
+class MazeRenderer:
+    """
+        Dessine la partie visible d'un labyrinthe (voir Camera et setView) sur une surface pygame.
+
+        images: dictionnaire nom -> Surface, avec les noms 'star1', 'star2', 'star3', 'refresh', 'p1' et 'p2'.
+        Le fond (murs et sol) est découpé en tuiles d'au plus TILE_PIXELS pixels de côté, construites à la première
+        utilisation pour une taille de cellule donnée et gardées dans un cache limité à MAX_TILES tuiles : seules les
+        tuiles visibles sont construites et dessinées, quelle que soit la taille du labyrinthe. Dessiner une cellule
+        revient à recopier sa zone de la tuile puis, si nécessaire, son icône déjà mise à l'échelle.
+    """
+    ICON_MARGIN = 2
+    TILE_PIXELS = 512
+    MAX_TILES = 64
+
+    def __init__(self, config: ChallengeConfig, images: dict) -> None:
+        self.config = config
+        self.images = images
+        self.cellWidth = 0
+        self.cellHeight = 0
+        self.tileCells = 1
+        self.tiles = collections.OrderedDict()
+        self.scaledImages = {}
+        self.originX = 0
+        self.originY = 0
+        self.columns = None
+        self.rows = None
+
+    def resize(self, cellWidth: int, cellHeight: int):
+        if (cellWidth, cellHeight) != (self.cellWidth, self.cellHeight):
+            self.cellWidth, self.cellHeight = cellWidth, cellHeight
+            self.tileCells = max(1, self.TILE_PIXELS // max(1, cellWidth, cellHeight))
+            self.invalidate()
+
+    def setView(self, x: int, y: int, columns: int, rows: int):
+        """
+            La première case affichée (en haut à gauche de la zone du labyrinthe) et le nombre de cases visibles.
+        """
+        self.originX, self.originY = x, y
+        self.columns, self.rows = columns, rows
+
+    def invalidate(self):
+        self.tiles = collections.OrderedDict()
+        self.scaledImages = {}
+
+    def visibleRange(self, maze: np.ndarray):
+        h, w = maze.shape
+        columns = w if self.columns is None else self.columns
+        rows = h if self.rows is None else self.rows
+        return self.originX, self.originY, min(w, self.originX + columns), min(h, self.originY + rows)
+
+    def isVisible(self, maze: np.ndarray, x: int, y: int):
+        x0, y0, x1, y1 = self.visibleRange(maze)
+        return x0 <= x < x1 and y0 <= y < y1
+
+    def viewRect(self, maze: np.ndarray):
+        x0, y0, x1, y1 = self.visibleRange(maze)
+        return pygame.Rect(self.config.marginLeft, self.config.marginTop, (x1 - x0) * self.cellWidth, (y1 - y0) * self.cellHeight)
+
+    def tile(self, maze: np.ndarray, tx: int, ty: int):
+        key = (tx, ty)
+        s = self.tiles.get(key)
+        if s is not None:
+            self.tiles.move_to_end(key)
+            return s
+        n = self.tileCells
+        walls = (maze[ty * n:(ty + 1) * n, tx * n:(tx + 1) * n] == -1).T
+        colors = np.empty(walls.shape + (3,), dtype=np.uint8)
+        colors[...] = self.config.floorColor
+        colors[walls] = self.config.wallColor
+        s = pygame.surfarray.make_surface(colors)
+        s = pygame.transform.scale(s, (walls.shape[0] * self.cellWidth, walls.shape[1] * self.cellHeight))
+        if pygame.display.get_surface() is not None:
+            s = s.convert()
+        self.tiles[key] = s
+        if len(self.tiles) > self.MAX_TILES:
+            self.tiles.popitem(last=False)
+        return s
+
+    def scaled(self, name: str, size: tuple[int, int]):
+        key = (name, size)
+        image = self.scaledImages.get(key)
+        if image is None:
+            image = pygame.transform.scale(self.images[name], size)
+            self.scaledImages[key] = image
+        return image
+
+    def sprite(self, name: str):
+        m = self.ICON_MARGIN
+        return self.scaled(name, (max(1, self.cellWidth - 2 * m), max(1, self.cellHeight - 2 * m)))
+
+    def iconName(self, cell):
+        if cell == -2:
+            return 'refresh'
+        elif cell < -2:
+            return 'star3'
+        elif cell <= self.config.score1Value:
+            return 'star1'
+        else:
+            return 'star2'
+
+    def cellRect(self, x: int, y: int):
+        return pygame.Rect(
+            self.cellWidth * (x - self.originX) + self.config.marginLeft,
+            self.cellHeight * (y - self.originY) + self.config.marginTop,
+            self.cellWidth,
+            self.cellHeight,
+        )
+
+    def drawMaze(self, surface: pygame.Surface, maze: np.ndarray):
+        x0, y0, x1, y1 = self.visibleRange(maze)
+        rect = self.viewRect(maze)
+        clip = surface.get_clip()
+        surface.set_clip(rect.clip(clip))
+        n = self.tileCells
+        for ty in range(y0 // n, (y1 - 1) // n + 1):
+            for tx in range(x0 // n, (x1 - 1) // n + 1):
+                surface.blit(self.tile(maze, tx, ty), self.cellRect(tx * n, ty * n).topleft)
+        surface.set_clip(clip)
+
+        view = maze[y0:y1, x0:x1]
+        for y, x in np.argwhere((view != 0) & (view != -1)).tolist():
+            self.drawIcon(surface, self.iconName(view[y][x]), (x0 + x, y0 + y))
+        return rect
+
+    def drawCell(self, surface: pygame.Surface, maze: np.ndarray, x: int, y: int):
+        if not self.isVisible(maze, x, y):
+            return pygame.Rect(0, 0, 0, 0)
+        rect = self.cellRect(x, y)
+        n = self.tileCells
+        area = pygame.Rect(self.cellWidth * (x % n), self.cellHeight * (y % n), self.cellWidth, self.cellHeight)
+        surface.blit(self.tile(maze, x // n, y // n), rect, area)
+        cell = maze[y][x]
+        if cell != 0 and cell != -1:
+            self.drawIcon(surface, self.iconName(cell), (x, y))
+        return rect
+
+    def drawIcon(self, surface: pygame.Surface, name: str, pos: tuple[int, int]):
+        if self.columns is not None and not (0 <= pos[0] - self.originX < self.columns and 0 <= pos[1] - self.originY < self.rows):
+            return pygame.Rect(0, 0, 0, 0)
+        m = self.ICON_MARGIN
+        rect = self.cellRect(pos[0], pos[1])
+        surface.blit(self.sprite(name), (rect.x + m, rect.y + m))
+        return rect
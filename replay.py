@@ -0,0 +1,183 @@
+# Enregistrement et relecture des parties, sans le code des joueurs
+# Exemple: python replay.py partie.npz
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import numpy as np
+from engine import ChallengeConfig, ChallengeEngine, applyChanges
+
+FORMAT_VERSION = 1
+
+# Fichiers lus ou écrits par la partie d'origine : une partie enregistrée contient déjà son labyrinthe, et sa relecture ne
+# doit écraser aucune des sorties de cette partie
+PATH_PARAMS = ('replayPath', 'videoPath', 'eventLog', 'metricsPath', 'profileDir', 'mazePath', 'scenarioPack')
+
+# Une ligne par étape (la ligne 0 est l'état initial) : les coups joués (le coup aléatoire en cas de pénalité), les
+# pénalités, le gagnant d'un croisement (0 si aucun), puis l'état après processPoints. Les événements tirés au hasard
+# sont ainsi conservés : réapparition après un croisement (positions), cellule de rafraîchissement (types) et
+# régénération des cellules (modifications du labyrinthe).
+STEP_DTYPE = np.dtype([
+    ('move1', np.int32, 2), ('move2', np.int32, 2),
+    ('penalty1', np.int32), ('penalty2', np.int32),
+    ('cross', np.int8),
+    ('position1', np.int32, 2), ('position2', np.int32, 2),
+    ('type1', np.int8), ('type2', np.int8),
+    ('score1', np.int64), ('score2', np.int64),
+])
+
+class ReplayRecorder:
+    """
+        Enregistre une partie en cours : l'état de chaque étape, et les modifications de cellules (indice plat et nouvelle
+        valeur). Une copie complète du labyrinthe (image clé) est gardée toutes les keyframeInterval étapes, pour pouvoir
+        se placer sur n'importe quelle étape en appliquant au plus keyframeInterval étapes de modifications.
+    """
+    def __init__(self, challenge: ChallengeEngine, keyframeInterval: int = 50) -> None:
+        self.challenge = challenge
+        self.keyframeInterval = keyframeInterval
+        self.initialMaze = challenge.maze.copy()
+        self.rows = [self.row((0, (-1, -1)), (0, (-1, -1)), 0)]
+        self.changeIndices = []
+        self.changeValues = []
+        self.changeOffsets = [0]
+        self.keyframes = [self.initialMaze]
+        self.keyframeSteps = [0]
+
+    def row(self, move1, move2, cross):
+        c = self.challenge
+        return (
+            move1[1], move2[1], move1[0], move2[0], cross,
+            c.player1Position, c.player2Position,
+            c.player1Type, c.player2Type,
+            c.player1Score, c.player2Score,
+        )
+
+    def cellChanged(self, i: int, value: int):
+        self.changeIndices.append(i)
+        self.changeValues.append(value)
+
+    def recordStep(self, move1, move2, cross: int):
+        """
+            move1, move2: (pénalité, position) retournés par ChallengeEngine.judgePlayer.
+        """
+        self.rows.append(self.row(move1, move2, cross))
+        self.changeOffsets.append(len(self.changeIndices))
+        step = len(self.rows) - 1
+        if step % self.keyframeInterval == 0:
+            self.keyframes.append(self.challenge.maze.copy())
+            self.keyframeSteps.append(step)
+
+    def save(self, path: str):
+        c = self.challenge
+        config = withoutPaths(c.configKwargs())
+        names = [p.name if p else '' for p in (c.player1, c.player2)]
+        np.savez_compressed(
+            path,
+            version=np.array(FORMAT_VERSION),
+            config=np.array(json.dumps(config)),
+            names=np.array(names),
+            initialMaze=self.initialMaze,
+            steps=np.array(self.rows, dtype=STEP_DTYPE),
+            changeIndices=np.array(self.changeIndices, dtype=np.int64),
+            changeValues=np.array(self.changeValues, dtype=self.initialMaze.dtype),
+            changeOffsets=np.array(self.changeOffsets, dtype=np.int64),
+            keyframes=np.stack(self.keyframes),
+            keyframeSteps=np.array(self.keyframeSteps, dtype=np.int64),
+        )
+
+def withoutPaths(configKwargs: dict):
+    return dict(configKwargs, **dict.fromkeys(PATH_PARAMS))
+
+class ReplayState:
+    def __init__(self, step: int, maze: np.ndarray, row) -> None:
+        self.step = step
+        self.maze = maze
+        self.move1 = tuple(int(v) for v in row['move1'])
+        self.move2 = tuple(int(v) for v in row['move2'])
+        self.penalty1 = int(row['penalty1'])
+        self.penalty2 = int(row['penalty2'])
+        self.cross = int(row['cross'])
+        self.player1Position = tuple(int(v) for v in row['position1'])
+        self.player2Position = tuple(int(v) for v in row['position2'])
+        self.player1Type = int(row['type1'])
+        self.player2Type = int(row['type2'])
+        self.player1Score = int(row['score1'])
+        self.player2Score = int(row['score2'])
+
+class Replay:
+    """
+        Une partie enregistrée. stateAt(step) reconstruit l'état de n'importe quelle étape à partir de l'image clé
+        précédente, en temps constant par rapport à la longueur de la partie.
+    """
+    def __init__(self, path: str) -> None:
+        with np.load(path) as data:
+            self.version = int(data['version'])
+            if self.version > FORMAT_VERSION:
+                raise ValueError('Unsupported replay version: ' + str(self.version))
+            self.configKwargs = withoutPaths(json.loads(str(data['config'])))
+            self.names = [str(n) for n in data['names']]
+            self.initialMaze = data['initialMaze']
+            self.rows = data['steps']
+            self.changeIndices = data['changeIndices']
+            self.changeValues = data['changeValues']
+            self.changeOffsets = data['changeOffsets']
+            self.keyframes = data['keyframes']
+            self.keyframeSteps = data['keyframeSteps']
+
+    @property
+    def steps(self):
+        return len(self.rows) - 1
+
+    @property
+    def config(self):
+        return ChallengeConfig(**self.configKwargs)
+
+    def changesBetween(self, step0: int, step1: int):
+        """
+            Les modifications de cellules des étapes step0 + 1 à step1 incluses.
+        """
+        a, b = self.changeOffsets[step0], self.changeOffsets[step1]
+        return self.changeIndices[a:b], self.changeValues[a:b]
+
+    def mazeAt(self, step: int):
+        k = np.searchsorted(self.keyframeSteps, step, side='right') - 1
+        maze = self.keyframes[k].copy()
+        # Une même cellule peut changer plusieurs fois : applyChanges garde sa dernière valeur
+        applyChanges(maze, *self.changesBetween(int(self.keyframeSteps[k]), step))
+        return maze
+
+    def stateAt(self, step: int):
+        step = max(0, min(step, self.steps))
+        return ReplayState(step, self.mazeAt(step), self.rows[step])
+
+def main():
+    parser = argparse.ArgumentParser(description='Relecture d\'une partie enregistrée (replayPath=...).')
+    parser.add_argument('path')
+    parser.add_argument('--step', type=int, default=0, help='Étape de départ')
+    parser.add_argument('--delay', type=int, default=50, help='Durée en millisecondes entre deux étapes')
+    args = parser.parse_args()
+
+    from viewer import ReplayViewer # pylint: disable=import-outside-toplevel
+    viewer = ReplayViewer(Replay(args.path), stepDelay=args.delay, startStep=args.step)
+    viewer.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# Paquets de scénarios : labyrinthes, bonus, positions et types de départ générés à l'avance
+# python scenarios.py build paquet --width 40 --height 30 --seeds 0-99, puis ChallengeConfig(scenarioPack='paquet')
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+from engine import ChallengeConfig, ChallengeEngine, FreeCells
+
+FORMAT_VERSION = 1
+
+# Les réglages qui changent l'état initial d'une partie ; la graine est la clé de chaque entrée du paquet
+GENERATION_PARAMS = (
+    'width', 'height', 'mazeAlgorithm',
+    'score1Value', 'score2Value', 'scoreMinValue',
+    'countScore1', 'countScore2', 'countScoreMin', 'countRefresh',
+    'enableRPCGame',
+)
+
+# random.Random.getstate() : 624 mots de l'état de Mersenne Twister, puis la position dans cet état
+RNG_STATE_SIZE = 625
+
+def configHash(config: ChallengeConfig):
+    """
+        Empreinte des réglages de génération (GENERATION_PARAMS) de config.
+    """
+    params = {name: getattr(config, name) for name in GENERATION_PARAMS}
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+class Scenario:
+    """
+        L'état initial d'une partie lu dans un paquet. Le labyrinthe est une vue projetée en mémoire en copie à
+        l'écriture : les pages du fichier sont partagées par tous les processus qui lisent le paquet, et une page n'est
+        copiée que lorsque la partie modifie une de ses cellules.
+    """
+    def __init__(self, maze: np.ndarray, freeCells: np.ndarray, positions: np.ndarray, types: np.ndarray, rngState: np.ndarray) -> None:
+        self.maze = maze
+        self.freeCells = freeCells
+        self.positions = positions
+        self.types = types
+        self.rngState = rngState
+
+    def apply(self, challenge: ChallengeEngine):
+        """
+            Place la partie dans l'état où l'aurait laissée la génération : labyrinthe, index des cellules vides (dans le
+            même ordre), positions, types et état du générateur aléatoire. La suite de la partie est donc identique.
+        """
+        challenge.maze = self.maze
+        challenge.height, challenge.width = self.maze.shape
+        challenge.freeCells = FreeCells.fromCells(self.maze, self.freeCells)
+        challenge.player1Position = tuple(int(v) for v in self.positions[0])
+        challenge.player2Position = tuple(int(v) for v in self.positions[1])
+        challenge.player1Type = int(self.types[0])
+        challenge.player2Type = int(self.types[1])
+        state = self.rngState.tolist()
+        challenge.random.setstate((3, tuple(state), None))
+
+class ScenarioPack:
+    """
+        Un dossier de fichiers .npy, lus par projection en mémoire :
+            - index.json : version, empreinte et réglages de génération, graines ;
+            - mazes.npy : (N, H, W), les labyrinthes avec leurs bonus ;
+            - freeCells.npy et freeOffsets.npy : les index des cellules vides (FreeCells), mis bout à bout ;
+            - positions.npy (N, 2, 2), types.npy (N, 2) et rngStates.npy (N, 625) : les positions et types des joueurs
+                et l'état du générateur aléatoire de chaque partie après la génération.
+        Toutes les entrées d'un paquet ont les mêmes réglages de génération.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+        if index['version'] > FORMAT_VERSION:
+            raise ValueError('Unsupported scenario pack version: ' + str(index['version']))
+        self.configHash = index['configHash']
+        self.config = index['config']
+        self.seeds = {seed: i for i, seed in enumerate(index['seeds'])}
+        self.mazesPath = os.path.join(path, 'mazes.npy')
+        with open(self.mazesPath, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            readHeader = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, _, dtype = readHeader(f)
+            self.mazesOffset = f.tell()
+        self.mazesShape = shape
+        self.mazesDtype = dtype
+        self.freeCells = np.load(os.path.join(path, 'freeCells.npy'), mmap_mode='r')
+        self.freeOffsets = np.load(os.path.join(path, 'freeOffsets.npy'))
+        self.positions = np.load(os.path.join(path, 'positions.npy'))
+        self.types = np.load(os.path.join(path, 'types.npy'))
+        self.rngStates = np.load(os.path.join(path, 'rngStates.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def maze(self, i: int):
+        """
+            Le labyrinthe de l'entrée i, projeté en mémoire en copie à l'écriture. Chaque appel crée sa propre projection :
+            les modifications d'une partie ne sont jamais vues par les parties suivantes du même processus.
+        """
+        shape = self.mazesShape[1:]
+        size = int(np.prod(shape)) * self.mazesDtype.itemsize
+        return np.memmap(self.mazesPath, dtype=self.mazesDtype, mode='c', offset=self.mazesOffset + i * size, shape=shape)
+
+    def find(self, config: ChallengeConfig):
+        """
+            Le scénario de config.randomSeed, ou None si la graine n'est pas dans le paquet ou si les réglages de
+            génération diffèrent de ceux du paquet.
+        """
+        i = self.seeds.get(config.randomSeed)
+        if i is None or configHash(config) != self.configHash:
+            return None
+        return Scenario(
+            self.maze(i),
+            self.freeCells[self.freeOffsets[i]:self.freeOffsets[i + 1]],
+            self.positions[i], self.types[i], self.rngStates[i],
+        )
+
+# Paquets déjà ouverts dans ce processus : l'index n'est lu qu'une fois par processus
+openPacks = {}
+
+def load(path: str):
+    pack = openPacks.get(path)
+    if pack is None:
+        pack = openPacks[path] = ScenarioPack(path)
+    return pack
+
+def build(path: str, config: ChallengeConfig, seeds: list[int]):
+    """
+        Génère une partie par graine avec les réglages de config, et écrit leur état initial dans le dossier path.
+    """
+    if not seeds:
+        raise ValueError('No seed given')
+    kwargs = config.configKwargs()
+    kwargs.update(playSounds=False, consoleEvents=False, replayPath=None, videoPath=None, mazePath=None, scenarioPack=None,
+                  collectMetrics=False, metricsPath=None, profileDir=None, eventLog=None)
+    os.makedirs(path, exist_ok=True)
+    mazes = None
+    freeCells = []
+    freeOffsets = [0]
+    positions = np.empty((len(seeds), 2, 2), dtype=np.int32)
+    types = np.empty((len(seeds), 2), dtype=np.int8)
+    rngStates = np.empty((len(seeds), RNG_STATE_SIZE), dtype=np.uint32)
+    for i, seed in enumerate(seeds):
+        kwargs['randomSeed'] = seed
+        g = ChallengeEngine(**kwargs)
+        if mazes is None:
+            mazes = np.lib.format.open_memmap(os.path.join(path, 'mazes.npy'), mode='w+', dtype=g.maze.dtype, shape=(len(seeds),) + g.maze.shape)
+        mazes[i] = g.maze
+        freeCells.append(np.array(g.freeCells.cells[:len(g.freeCells)], dtype=np.int32))
+        freeOffsets.append(freeOffsets[-1] + len(g.freeCells))
+        positions[i] = (g.player1Position, g.player2Position)
+        types[i] = (g.player1Type, g.player2Type)
+        version, state, gauss = g.random.getstate()
+        if version != 3 or gauss is not None:
+            raise RuntimeError('Unexpected random generator state')
+        rngStates[i] = state
+        g.close()
+    mazes.flush()
+    np.save(os.path.join(path, 'freeCells.npy'), np.concatenate(freeCells))
+    np.save(os.path.join(path, 'freeOffsets.npy'), np.array(freeOffsets, dtype=np.int64))
+    np.save(os.path.join(path, 'positions.npy'), positions)
+    np.save(os.path.join(path, 'types.npy'), types)
+    np.save(os.path.join(path, 'rngStates.npy'), rngStates)
+    with open(os.path.join(path, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': FORMAT_VERSION,
+            'configHash': configHash(config),
+            'config': {name: getattr(config, name) for name in GENERATION_PARAMS},
+            'seeds': list(seeds),
+        }, f, indent=1)
+    openPacks.pop(path, None)
+
+def main():
+    from tournament import parseSeeds # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description='Paquets de scénarios générés à l\'avance')
+    sub = parser.add_subparsers(dest='command', required=True)
+    b = sub.add_parser('build', help='Génère un paquet')
+    b.add_argument('path')
+    b.add_argument('--seeds', type=parseSeeds, default=list(range(100)), help='Graines, ex: 0-99 ou 1,5,7')
+    b.add_argument('--width', type=int, default=40)
+    b.add_argument('--height', type=int, default=30)
+    b.add_argument('--algorithm', default='backtracker')
+    b.add_argument('--no-rpc', action='store_true', help='Sans le mode Pierre-Feuille-Ciseaux (pas de cellules de rafraîchissement)')
+    i = sub.add_parser('info', help='Décrit un paquet')
+    i.add_argument('path')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        config = ChallengeConfig(width=args.width, height=args.height, steps=0, mazeAlgorithm=args.algorithm, enableRPCGame=not args.no_rpc)
+        build(args.path, config, args.seeds)
+    pack = load(args.path)
+    seeds = sorted(pack.seeds)
+    print('{} : {} parties, labyrinthes {} x {}, empreinte {}'.format(args.path, len(pack), pack.mazesShape[2], pack.mazesShape[1], pack.configHash))
+    print('Graines : {} ... {}'.format(seeds[0], seeds[-1]) if len(seeds) > 1 else 'Graine : {}'.format(seeds[0]))
+    print(json.dumps(pack.config))
+
+if __name__ == '__main__':
+    main()
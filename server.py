@@ -0,0 +1,400 @@
+# Serveur de parties asyncio : de nombreuses parties en même temps dans une seule boucle, contre des joueurs distants
+# python server.py --port 7000 --seeds 0-99, puis des clients : python client.py playerExample1 --port 7000
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import socket
+import struct
+import time
+import numpy as np
+import engine
+import protocol
+from engine import ChallengeConfig, ChallengeEngine, BasePlayer
+from tournament import TOURNAMENT_SETTINGS, GameResult, Leaderboard, parseSeeds, printGame
+
+class RemotePlayerError(Exception):
+    """
+        Le joueur distant a levé une exception ; le message contient la trace envoyée par le client.
+    """
+
+class Connection:
+    """
+        Un client connecté. Il joue une partie à la fois et retourne dans la file des clients libres à la fin de chaque
+        partie. Les réponses (MOVE, ERROR) sont associées à l'appel en attente par (partie, appel) : une réponse
+        arrivée après l'échéance est ignorée.
+    """
+    def __init__(self, name: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.closed = False
+        self.calls = 0
+
+    async def readLoop(self):
+        try:
+            while True:
+                kind, body = await readFrame(self.reader)
+                if kind == protocol.MOVE:
+                    matchId, callId, x, y = protocol.MOVE_BODY.unpack_from(body)
+                    future = self.pending.get((matchId, callId))
+                    if future is not None and not future.done():
+                        future.set_result((x, y))
+                elif kind == protocol.ERROR:
+                    matchId, callId, message = protocol.parseError(body)
+                    future = self.pending.get((matchId, callId))
+                    if future is not None and not future.done():
+                        future.set_exception(RemotePlayerError(message))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, struct.error):
+            # Connexion perdue ou trame invalide (corps trop court) : le client perd ses parties en cours par abandon
+            pass
+        finally:
+            self.close()
+
+    def send(self, data: bytes):
+        if self.closed:
+            raise ConnectionError('Client disconnected')
+        self.writer.write(data)
+
+    async def call(self, matchId: int, callId: int, data: bytes, timeout: float):
+        """
+            Envoie un PLAY et attend le coup, au plus timeout secondes en tout (asyncio.TimeoutError sinon). Un client
+            dont les tampons restent pleins pendant tout ce temps ne lit plus ses trames : il est déconnecté
+            (ConnectionError), et perd donc la partie par abandon.
+        """
+        key = (matchId, callId)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[key] = future
+        deadline = loop.time() + timeout
+        try:
+            self.send(data)
+            self.calls += 1
+            try:
+                await asyncio.wait_for(self.writer.drain(), timeout)
+            except asyncio.TimeoutError:
+                # Le coup attendu ne sera jamais lu : pas d'exception à transmettre à son attente
+                self.pending.pop(key, None)
+                self.close(abort=True)
+                raise ConnectionError('Client stopped reading') from None
+            return await asyncio.wait_for(future, max(0, deadline - loop.time()))
+        finally:
+            self.pending.pop(key, None)
+
+    def close(self, abort: bool = False):
+        """
+            abort: ferme sans attendre l'envoi des données en attente (le client ne les lit plus).
+        """
+        if abort:
+            self.writer.transport.abort()
+        if self.closed:
+            return
+        self.closed = True
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError('Client disconnected'))
+        if not abort:
+            self.writer.close()
+
+async def readFrame(reader: asyncio.StreamReader):
+    size, kind = protocol.FRAME.unpack(await reader.readexactly(protocol.FRAME.size))
+    if size < 1 or size > protocol.MAX_FRAME:
+        raise ValueError('Invalid frame size: ' + str(size))
+    return kind, memoryview(await reader.readexactly(size - 1))
+
+class ServerEngine(ChallengeEngine):
+    """
+        Garde la liste des modifications de cellules, pour n'envoyer à chaque joueur que celles qu'il n'a pas encore vues.
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        self.changeIndices = []
+        self.changeValues = []
+        super().__init__(*args, **kwargs)
+
+    def setCell(self, x, y, value):
+        super().setCell(x, y, value)
+        self.changeIndices.append(y * self.width + x)
+        self.changeValues.append(value)
+
+class RemotePlayer(BasePlayer):
+    def __init__(self, config: ChallengeConfig, connection: Connection) -> None:
+        super().__init__(config)
+        self.name = connection.name
+        self.connection = connection
+        self.seenChanges = 0
+
+class RemoteMatch:
+    """
+        Une partie entre deux clients. Les étapes sont celles de ChallengeEngine (beginStep, judgePlayer, applyMove ou
+        applySimultaneousMoves, endStep), mais le coup de chaque joueur est attendu sans bloquer la boucle : l'échéance
+        (maxTime) est celle de asyncio.wait_for.
+    """
+    def __init__(self, matchId: int, seed: int, configKwargs: dict, connection1: Connection, connection2: Connection) -> None:
+        kwargs = dict(configKwargs)
+        self.simultaneous = kwargs.pop('simultaneousMoves', False)
+        kwargs.update(randomSeed=seed, playSounds=False, consoleEvents=False, playerWorkers=False)
+        self.matchId = matchId
+        self.seed = seed
+        self.engine = ServerEngine(**kwargs)
+        # L'échéance de chaque coup est celle de la boucle (asyncio.wait_for), pas SIGALRM
+        self.engine.useAlarmSignal = False
+        self.player1 = RemotePlayer(self.engine.cloneConfig(), connection1)
+        self.player2 = RemotePlayer(self.engine.cloneConfig(), connection2)
+        self.engine.registerPlayers(self.player1, self.player2)
+        self.callId = 0
+
+    def forfeits(self):
+        """
+            Les numéros des joueurs dont le client s'est déconnecté.
+        """
+        return tuple(n for n, player in ((1, self.player1), (2, self.player2)) if player.connection.closed)
+
+    async def run(self):
+        """
+            Joue la partie. Si un client se déconnecte, la partie s'arrête à cette étape et il perd par abandon.
+        """
+        g = self.engine
+        configKwargs = g.configKwargs()
+        configKwargs['simultaneousMoves'] = self.simultaneous
+        try:
+            for n, player in ((1, self.player1), (2, self.player2)):
+                player.seenChanges = len(g.changeIndices)
+                player.connection.send(protocol.match(self.matchId, n, configKwargs, g.maze))
+            while g.currentStep < g.steps and not self.forfeits():
+                await self.step()
+        except ConnectionError:
+            pass
+        finally:
+            g.close()
+        forfeits = self.forfeits()
+        for player, score, enemyScore in ((self.player1, g.player1Score, g.player2Score), (self.player2, g.player2Score, g.player1Score)):
+            if not player.connection.closed:
+                player.connection.send(protocol.end(self.matchId, score, enemyScore))
+        return GameResult(self.player1.name, self.player2.name, self.seed, g.result(), forfeits)
+
+    async def fetch(self, player: RemotePlayer, args: tuple):
+        """
+            Demande son coup au joueur et retourne la fonction getMove attendue par ChallengeEngine.judgePlayer.
+        """
+        g = self.engine
+        start = player.seenChanges
+        player.seenChanges = len(g.changeIndices)
+        indices = np.array(g.changeIndices[start:], dtype=np.uint32)
+        values = np.array(g.changeValues[start:], dtype=g.maze.dtype)
+        self.callId += 1
+        data = protocol.play(self.matchId, self.callId, *args, indices, values)
+        try:
+            p = await player.connection.call(self.matchId, self.callId, data, g.maxTime / 1000)
+        except asyncio.TimeoutError:
+            def timeout():
+                raise engine.TimeoutError('Timed out')
+            return timeout
+        except (RemotePlayerError, ConnectionError) as e:
+            if isinstance(e, ConnectionError):
+                player.connection.close()
+            def fail(e=e):
+                raise e
+            return fail
+        return lambda: p
+
+    def trimChanges(self):
+        """
+            Oublie les modifications déjà envoyées aux deux joueurs.
+        """
+        g = self.engine
+        n = min(self.player1.seenChanges, self.player2.seenChanges)
+        if n:
+            del g.changeIndices[:n]
+            del g.changeValues[:n]
+            self.player1.seenChanges -= n
+            self.player2.seenChanges -= n
+
+    def args1(self):
+        g = self.engine
+        return (g.player1Position, g.player2Position, g.player1Type, g.player2Type, g.player1Score, g.player2Score)
+
+    def args2(self):
+        g = self.engine
+        return (g.player2Position, g.player1Position, g.player2Type, g.player1Type, g.player2Score, g.player1Score)
+
+    async def step(self):
+        g = self.engine
+        self.trimChanges()
+        g.beginStep()
+        if self.simultaneous:
+            p1, p2 = g.player1Position, g.player2Position
+            get1, get2 = await asyncio.gather(self.fetch(self.player1, self.args1()), self.fetch(self.player2, self.args2()))
+            move1 = g.judgePlayer(self.player1, p1, get1)
+            move2 = g.judgePlayer(self.player2, p2, get2)
+            g.endStep(move1, move2, crossed=g.applySimultaneousMoves(move1, move2))
+        else:
+            get1 = await self.fetch(self.player1, self.args1())
+            move1 = g.applyMove(1, g.judgePlayer(self.player1, g.player1Position, get1))
+            get2 = await self.fetch(self.player2, self.args2())
+            move2 = g.applyMove(2, g.judgePlayer(self.player2, g.player2Position, get2))
+            g.endStep(move1, move2)
+
+class MatchServer:
+    """
+        Accepte des clients (TCP ou socket Unix) et joue une partie par graine, autant de parties en même temps que de
+        paires de clients libres. Le premier client libre affronte le premier client libre d'un autre nom, s'il y en a
+        un ; les deux clients redeviennent libres à la fin de la partie. S'il reste moins de deux clients connectés, les
+        parties restantes ne sont pas jouées (unplayed).
+    """
+    def __init__(self, config: ChallengeConfig, seeds: list[int], minClients: int = 2, onResult=None) -> None:
+        self.configKwargs = config.configKwargs()
+        self.seeds = seeds
+        self.minClients = max(2, minClients)
+        self.onResult = onResult
+        self.idle = []
+        self.idleChanged = asyncio.Event()
+        self.connections = []
+        self.handlers = set()
+        self.enoughClients = asyncio.Event()
+        self.leaderboard = Leaderboard()
+        self.results = []
+        self.unplayed = []
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info('socket')
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            kind, body = await asyncio.wait_for(readFrame(reader), 10)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+            return
+        if kind != protocol.HELLO:
+            writer.close()
+            return
+        connection = Connection(bytes(body).decode('utf-8', 'replace'), reader, writer)
+        self.connections.append(connection)
+        self.release(connection)
+        if len(self.connections) >= self.minClients:
+            self.enoughClients.set()
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            await connection.readLoop()
+        finally:
+            self.handlers.discard(task)
+            # takePair doit savoir qu'un client de moins peut jouer
+            self.idleChanged.set()
+
+    def release(self, connection: Connection):
+        if not connection.closed:
+            self.idle.append(connection)
+            self.idleChanged.set()
+
+    async def takePair(self):
+        """
+            Attend deux clients libres ; retourne None s'il reste moins de deux clients connectés.
+        """
+        while True:
+            self.idle = [c for c in self.idle if not c.closed]
+            if len(self.idle) >= 2:
+                first = self.idle.pop(0)
+                i = next((i for i, c in enumerate(self.idle) if c.name != first.name), 0)
+                return first, self.idle.pop(i)
+            if sum(not c.closed for c in self.connections) < 2:
+                return None
+            self.idleChanged.clear()
+            await self.idleChanged.wait()
+
+    async def playMatch(self, matchId: int, seed: int, connection1: Connection, connection2: Connection):
+        try:
+            game = await RemoteMatch(matchId, seed, self.configKwargs, connection1, connection2).run()
+            self.results.append(game)
+            self.leaderboard.add(game)
+            if self.onResult:
+                self.onResult(game)
+        finally:
+            self.release(connection1)
+            self.release(connection2)
+
+    async def playAll(self):
+        await self.enoughClients.wait()
+        tasks = []
+        for matchId, seed in enumerate(self.seeds):
+            pair = await self.takePair()
+            if pair is None:
+                self.unplayed = self.seeds[matchId:]
+                break
+            connection1, connection2 = pair
+            # Les rôles alternent : chaque client joue aussi souvent en joueur 1 qu'en joueur 2
+            if matchId % 2:
+                connection1, connection2 = connection2, connection1
+            tasks.append(asyncio.create_task(self.playMatch(matchId + 1, seed, connection1, connection2)))
+        await asyncio.gather(*tasks)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 7000, unixPath: str = None):
+        """
+            Joue toutes les parties puis ferme les connexions (les clients s'arrêtent) ; retourne le classement.
+        """
+        if unixPath:
+            server = await asyncio.start_unix_server(self.handleClient, unixPath)
+        else:
+            server = await asyncio.start_server(self.handleClient, host, port)
+        async with server:
+            await self.playAll()
+            for connection in self.connections:
+                connection.close()
+            await asyncio.gather(*self.handlers, return_exceptions=True)
+        return self.leaderboard
+
+def main():
+    parser = argparse.ArgumentParser(description='Serveur de parties contre des joueurs distants (voir client.py)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7000)
+    parser.add_argument('--unix', default=None, help='Socket Unix à la place de TCP')
+    parser.add_argument('--seeds', type=parseSeeds, default=list(range(10)), help='Une partie par graine, ex: 0-99 ou 1,5,7')
+    parser.add_argument('--clients', type=int, default=2, help='Nombre de clients attendus avant la première partie')
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--max-time', type=int, default=500, help='Temps maximal par coup, en millisecondes')
+    parser.add_argument('--simultaneous', action='store_true', help='Les deux joueurs jouent en même temps')
+    parser.add_argument('--scenarios', default=None, help='Paquet de scénarios généré par scenarios.py build')
+    parser.add_argument('--quiet', action='store_true', help="N'affiche que le classement final")
+    args = parser.parse_args()
+
+    config = ChallengeConfig(
+        width=args.width,
+        height=args.height,
+        steps=args.steps,
+        **dict(TOURNAMENT_SETTINGS, maxTime=args.max_time),
+        simultaneousMoves=args.simultaneous,
+        scenarioPack=args.scenarios,
+    )
+    server = MatchServer(config, args.seeds, args.clients, None if args.quiet else printGame)
+    start = time.perf_counter()
+    leaderboard = asyncio.run(server.serve(args.host, args.port, args.unix))
+    elapsed = time.perf_counter() - start
+    print()
+    print(leaderboard.format())
+    moves = sum(c.calls for c in server.connections)
+    print('{} parties, {} coups en {:.1f} s ({:.0f} coups / s)'.format(len(server.results), moves, elapsed, moves / elapsed if elapsed else 0))
+    if server.unplayed:
+        print('{} parties non jouées : moins de deux clients connectés'.format(len(server.unplayed)))
+
+if __name__ == '__main__':
+    main()
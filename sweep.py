@@ -0,0 +1,292 @@
+# Balayage de réglages : grille ou tirage aléatoire de champs de ChallengeConfig x graines x paires de joueurs
+# Chaque partie jouée est gardée dans un cache sur disque : relancer ou étendre un balayage ne joue que les parties manquantes
+# Exemple: python sweep.py playerExample1 playerExample2 --seeds 0-49 --grid score1Value=3,5 --grid scoreCrossValue=10,17,25
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import ChallengeConfig, ChallengeResult, PlayerStats
+from scenarios import GENERATION_PARAMS
+from tournament import TOURNAMENT_SETTINGS, GameResult, Leaderboard, pairings, parseSeeds, runGame
+
+# Les réglages qui changent le résultat d'une partie ; les autres (affichage, sons, fichiers de sortie, paquet de
+# scénarios) ne font pas partie de la clé du cache
+RESULT_PARAMS = GENERATION_PARAMS + (
+    'steps', 'scoreNegativeValue', 'scoreCrossValue', 'scoreOnException', 'scoreOnBadMove', 'scoreOnTimeout',
+    'maxTime', 'regenerateCells', 'readOnlyMaze', 'playerWorkers', 'simultaneousMoves',
+)
+
+# Les sources du chemin de jeu font partie de la clé : modifier les règles, la génération (paquets de scénarios
+# compris), le tirage des graines de runGame ou le modèle avancé des joueurs invalide le cache
+ENGINE_SOURCES = (
+    'engine.py', 'mazes.py', 'mazetree.py', 'workers.py', 'tournament.py', 'scenarios.py', 'forward.py',
+)
+
+def sourceHash(paths: list[str]):
+    h = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def moduleHash(module: str):
+    """
+        Empreinte du fichier source du module d'un joueur (les modules qu'il importe n'en font pas partie).
+    """
+    spec = importlib.util.find_spec(module)
+    if spec is None or not spec.origin:
+        raise ValueError('Player module not found: ' + module)
+    return sourceHash([spec.origin])
+
+def engineHash():
+    here = os.path.dirname(os.path.abspath(__file__))
+    return sourceHash([os.path.join(here, name) for name in ENGINE_SOURCES])
+
+def gameKey(configKwargs: dict, seed: int, module1: str, module2: str, hashes: dict):
+    """
+        Clé d'une partie : empreinte des réglages qui changent son résultat, de la graine, des deux joueurs (nom et
+        source) et des sources du moteur.
+    """
+    key = {
+        'config': {name: configKwargs[name] for name in RESULT_PARAMS},
+        'seed': seed,
+        'players': [module1, hashes[module1], module2, hashes[module2]],
+        'engine': hashes[None],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+def resultToDict(result: ChallengeResult):
+    return {
+        'steps': result.steps,
+        'player1Name': result.player1Name,
+        'player2Name': result.player2Name,
+        'player1Score': int(result.player1Score),
+        'player2Score': int(result.player2Score),
+        'player1Stats': vars(result.player1Stats),
+        'player2Stats': vars(result.player2Stats),
+    }
+
+def resultFromDict(d: dict):
+    stats = []
+    for name in ('player1Stats', 'player2Stats'):
+        s = PlayerStats()
+        vars(s).update(d[name])
+        stats.append(s)
+    return ChallengeResult(d['steps'], d['player1Name'], d['player2Name'], d['player1Score'], d['player2Score'], stats[0], stats[1])
+
+class ResultCache:
+    """
+        Résultats des parties, un fichier JSON par partie nommé d'après sa clé (path/ab/abcd....json). Les fichiers sont
+        écrits dans un fichier temporaire puis renommés : un balayage interrompu ne laisse pas de résultat partiel.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def file(self, key: str):
+        return os.path.join(self.path, key[:2], key + '.json')
+
+    def get(self, key: str):
+        try:
+            with open(self.file(key), encoding='utf-8') as f:
+                return resultFromDict(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, result: ChallengeResult):
+        path = self.file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(resultToDict(result), f)
+        os.replace(tmp, path)
+
+def parseValue(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def parseAssignment(value: str):
+    name, sep, values = value.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError('Expected name=value: ' + value)
+    return name.strip(), values
+
+def checkParams(names):
+    known = set(inspect.signature(ChallengeConfig.__init__).parameters) - {'self'}
+    for name in names:
+        if name not in known:
+            raise ValueError('Unknown ChallengeConfig parameter: ' + name)
+
+def expandSettings(grid: dict, ranges: dict = None, samples: int = 0, sampleSeed: int = 0):
+    """
+        Les réglages à essayer : toutes les combinaisons de grid (nom -> liste de valeurs), et pour chacune samples
+        tirages uniformes de ranges (nom -> (min, max), entiers si les deux bornes le sont). Le tirage dépend de
+        sampleSeed : un balayage relancé avec les mêmes arguments retrouve les mêmes réglages, et donc son cache.
+    """
+    ranges = ranges or {}
+    checkParams(list(grid) + list(ranges))
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    if not ranges:
+        return combinations
+    rnd = random.Random(sampleSeed)
+    settings = []
+    for combination in combinations:
+        for _ in range(max(1, samples)):
+            setting = dict(combination)
+            for name, (lo, hi) in ranges.items():
+                if isinstance(lo, int) and isinstance(hi, int):
+                    setting[name] = rnd.randint(lo, hi)
+                else:
+                    setting[name] = rnd.uniform(lo, hi)
+            settings.append(setting)
+    return settings
+
+class SweepResult:
+    def __init__(self, settings: list[dict], games: list[tuple[int, GameResult]], played: int, cached: int) -> None:
+        self.settings = settings
+        self.games = games
+        self.played = played
+        self.cached = cached
+
+    def leaderboards(self):
+        boards = [Leaderboard() for _ in self.settings]
+        for i, game in self.games:
+            boards[i].add(game)
+        return boards
+
+    def format(self):
+        lines = []
+        for setting, board in zip(self.settings, self.leaderboards()):
+            lines.append(', '.join('{}={}'.format(k, v) for k, v in setting.items()) or '(réglages de base)')
+            lines.append(board.format())
+            lines.append('')
+        lines.append('{} parties : {} jouées, {} lues dans le cache'.format(len(self.games), self.played, self.cached))
+        return '\n'.join(lines)
+
+    def writeCsv(self, path: str):
+        names = sorted({name for setting in self.settings for name in setting})
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(names + ['seed', 'player1', 'player2', 'score1', 'score2', 'penalty1', 'penalty2', 'timeouts1', 'timeouts2'])
+            for i, game in self.games:
+                r = game.result
+                w.writerow([self.settings[i].get(name, '') for name in names] + [
+                    game.seed, game.module1, game.module2, r.player1Score, r.player2Score,
+                    r.player1Stats.penalty, r.player2Stats.penalty, r.player1Stats.timeouts, r.player2Stats.timeouts,
+                ])
+
+def runSweep(modules: list[str], seeds: list[int], config: ChallengeConfig, settings: list[dict], cachePath: str,
+             workers: int = None, onResult=None):
+    """
+        Joue chaque partie (réglage x graine x paire de joueurs, dans les deux rôles) qui n'est pas déjà dans le cache,
+        en parallèle comme tournament.runTournament, et l'ajoute au cache dès qu'elle est terminée.
+    """
+    cache = ResultCache(cachePath)
+    hashes = {m: moduleHash(m) for m in modules}
+    hashes[None] = engineHash()
+    base = config.configKwargs()
+    games = []
+    missing = []
+    for i, setting in enumerate(settings):
+        configKwargs = dict(base, **setting)
+        for seed in seeds:
+            for m1, m2 in pairings(modules):
+                key = gameKey(configKwargs, seed, m1, m2, hashes)
+                result = cache.get(key)
+                if result is None:
+                    missing.append((i, key, m1, m2, seed, configKwargs))
+                else:
+                    games.append((i, GameResult(m1, m2, seed, result)))
+    cached = len(games)
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(runGame, m1, m2, seed, configKwargs): (i, key)
+                for i, key, m1, m2, seed, configKwargs in missing
+            }
+            for future in as_completed(futures):
+                i, key = futures[future]
+                game = future.result()
+                cache.put(key, game.result)
+                games.append((i, game))
+                if onResult:
+                    onResult(game)
+    games.sort(key=lambda g: (g[0], g[1].seed, g[1].module1, g[1].module2))
+    return SweepResult(settings, games, len(missing), cached)
+
+def main():
+    parser = argparse.ArgumentParser(description='Balayage de réglages de ChallengeConfig, avec cache des parties déjà jouées')
+    parser.add_argument('players', nargs='+', help='Modules des joueurs (ex: playerExample1)')
+    parser.add_argument('--seeds', type=parseSeeds, default=list(range(10)), help='Graines, ex: 0-99 ou 1,5,7')
+    parser.add_argument('--grid', type=parseAssignment, action='append', default=[], help='Valeurs à essayer, ex: score1Value=3,5,7')
+    parser.add_argument('--random', type=parseAssignment, action='append', default=[], help='Intervalle tiré au hasard, ex: countScore1=0.1:0.4')
+    parser.add_argument('--samples', type=int, default=10, help='Nombre de tirages de --random par combinaison de --grid')
+    parser.add_argument('--sample-seed', type=int, default=0, help='Graine des tirages de --random')
+    parser.add_argument('--set', type=parseAssignment, action='append', default=[], help='Réglage fixe, ex: regenerateCells=true')
+    parser.add_argument('--cache', default='.sweep-cache', help='Dossier du cache des parties')
+    parser.add_argument('--workers', type=int, default=None, help='Nombre de processus (par défaut: nombre de coeurs)')
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--csv', default=None, help='Écrit une ligne par partie dans ce fichier')
+    parser.add_argument('--quiet', action='store_true', help="N'affiche que les classements")
+    args = parser.parse_args()
+
+    grid = {name: [parseValue(v) for v in values.split(',')] for name, values in args.grid}
+    ranges = {}
+    for name, values in args.random:
+        lo, sep, hi = values.partition(':')
+        if not sep:
+            parser.error('--random expects name=min:max, got ' + name + '=' + values)
+        ranges[name] = (parseValue(lo), parseValue(hi))
+    fixed = {name: parseValue(value) for name, value in args.set}
+    try:
+        checkParams(fixed)
+        settings = expandSettings(grid, ranges, args.samples, args.sample_seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    config = ChallengeConfig(width=args.width, height=args.height, steps=args.steps, **dict(TOURNAMENT_SETTINGS, **fixed))
+    onResult = None
+    if not args.quiet:
+        def onResult(game):
+            print('[graine {}] {} ({}) vs {} ({})'.format(game.seed, game.module1, int(game.result.player1Score), game.module2, int(game.result.player2Score)))
+    start = time.perf_counter()
+    result = runSweep(args.players, args.seeds, config, settings, args.cache, args.workers, onResult)
+    print()
+    print(result.format())
+    print('Durée : {:.1f} s'.format(time.perf_counter() - start))
+    if args.csv:
+        result.writeCsv(args.csv)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import random
+import pytest
+import playerExample1
+import playerExample2
+from arena import ArenaEngine
+from engine import TYPE_CISEAUX, TYPE_FEUILLE, TYPE_PIERRE
+
+def bruteNearest(positions, i):
+    x, y = positions[i]
+    others = [(abs(px - x) + abs(py - y), j) for j, (px, py) in enumerate(positions) if j != i]
+    return min(others)[1] if others else -1
+
+@pytest.mark.parametrize('players, size', [(1, 15), (2, 15), (9, 31), (64, 61)])
+def test_nearest_opponent_matches_a_full_scan(players, size):
+    random.seed(players)
+    arena = ArenaEngine(width=size, height=size, steps=40, randomSeed=players, playSounds=False, consoleEvents=False)
+    classes = [playerExample1.Player, playerExample2.Player]
+    arena.registerPlayers(*(classes[i % 2](arena.cloneConfig()) for i in range(players)))
+    while arena.currentStep < arena.steps:
+        arena.step()
+        for i in range(players):
+            assert arena.nearestOpponent(i) == bruteNearest(arena.positions, i)
+    assert sorted(j for bucket in arena.buckets.values() for j in bucket) == list(range(players))
+
+def test_two_player_outputs_are_rejected_before_any_file_is_opened(tmp_path):
+    for name in ('replayPath', 'videoPath'):
+        path = tmp_path / name
+        with pytest.raises(ValueError):
+            ArenaEngine(width=15, height=15, steps=10, playSounds=False, consoleEvents=False, **{name: str(path)})
+        assert not path.exists()
+
+def test_generation_places_no_two_player_positions():
+    arena = ArenaEngine(width=15, height=15, steps=10, randomSeed=3, playSounds=False, consoleEvents=False)
+    assert not hasattr(arena, 'player1Position')
+    assert len(arena.freeCells) == int((arena.maze == 0).sum())
+
+def crossOnOneCell(types):
+    """
+        Place les joueurs, de types donnés, sur une même case vide et résout l'étape ; retourne l'arène et la case.
+    """
+    arena = ArenaEngine(width=21, height=21, steps=10, randomSeed=4, playSounds=False, consoleEvents=False)
+    arena.registerPlayers(*(playerExample1.Player(arena.cloneConfig()) for _ in range(len(types) + 2)))
+    cell = next(p for p in (arena.freeCells.sample(arena.random) for _ in range(100)) if p not in arena.occupancy)
+    for i, t in enumerate(types):
+        arena.movePlayer(i, cell)
+        arena.types[i] = t
+    arena.processPoints()
+    return arena, cell
+
+def assertRespawned(arena, losers):
+    for i in losers:
+        x, y = arena.positions[i]
+        assert arena.maze[y, x] == 0
+        assert arena.occupancy[(x, y)] == [i]
+
+def test_each_winner_scores_per_beaten_player_and_losers_respawn():
+    arena, cell = crossOnOneCell([TYPE_PIERRE, TYPE_CISEAUX, TYPE_CISEAUX])
+    assert arena.scores[:3] == [2 * arena.scoreCrossValue, 0, 0]
+    assert arena.positions[0] == cell
+    assertRespawned(arena, [1, 2])
+    assert arena.lastCross == 1
+
+    arena, cell = crossOnOneCell([TYPE_CISEAUX, TYPE_PIERRE, TYPE_PIERRE])
+    assert arena.scores[:3] == [0, arena.scoreCrossValue, arena.scoreCrossValue]
+    assert arena.positions[1] == arena.positions[2] == cell
+    assertRespawned(arena, [0])
+
+def test_three_types_on_one_cell_is_a_draw():
+    arena, cell = crossOnOneCell([TYPE_PIERRE, TYPE_CISEAUX, TYPE_FEUILLE])
+    assert arena.scores[:3] == [0, 0, 0]
+    assert arena.positions[:3] == [cell] * 3
+    assert arena.lastCross == 0
@@ -0,0 +1,104 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import pytest
+from batch import DIRECTIONS, BatchEngine, randomPolicy
+from engine import BasePlayer, BatchPlayer, ChallengeConfig, ChallengeEngine
+from tournament import TOURNAMENT_SETTINGS
+
+SEEDS = list(range(12))
+
+class ScriptedPlayer(BasePlayer):
+    """
+        Joue les coups donnés, un par étape.
+    """
+    def __init__(self, config, moves) -> None:
+        super().__init__(config)
+        self.moves = iter(moves)
+
+    def play(self, maze, *args):
+        return tuple(int(v) for v in next(self.moves))
+
+class FirstOpenBatchPlayer(BatchPlayer):
+    """
+        Va sur la première case voisine libre (ordre de batch.DIRECTIONS) de chaque partie, en une opération vectorisée.
+    """
+    def __init__(self, config) -> None:
+        super().__init__(config)
+        self.name = 'premier'
+        self.calls = 0
+
+    def playBatch(self, mazes, myPositions, *args):
+        self.calls += 1
+        neighbours = myPositions[:, None, :] + DIRECTIONS[None, :, :]
+        k = np.arange(len(mazes))[:, None]
+        isOpen = mazes[k, neighbours[:, :, 1], neighbours[:, :, 0]] != -1
+        return neighbours[np.arange(len(mazes)), isOpen.argmax(axis=1)]
+
+class FirstOpenPlayer(BasePlayer):
+    def __init__(self, config) -> None:
+        super().__init__(config)
+        self.name = 'premier'
+
+    def play(self, maze, myPosition, *args):
+        x, y = myPosition
+        for dx, dy in DIRECTIONS.tolist():
+            if maze[y + dy][x + dx] != -1:
+                return (x + dx, y + dy)
+        return myPosition
+
+def recordingPolicy(seed: int, moves: list):
+    policy = randomPolicy(seed)
+    def record(batch, myPositions, enemyPositions):
+        m = policy(batch, myPositions, enemyPositions)
+        moves.append(m.copy())
+        return m
+    return record
+
+@pytest.mark.parametrize('settings', [{}, dict(TOURNAMENT_SETTINGS, regenerateCells=True)], ids=['default', 'tournament'])
+def test_lockstep_games_match_the_engine(settings):
+    config = ChallengeConfig(width=21, height=15, steps=150, **settings)
+    batch = BatchEngine(config, SEEDS)
+    moves1, moves2 = [], []
+    results = batch.run(recordingPolicy(1, moves1), recordingPolicy(2, moves2))
+    moves1, moves2 = np.stack(moves1), np.stack(moves2)
+
+    for k, seed in enumerate(SEEDS):
+        kwargs = config.configKwargs()
+        kwargs.update(randomSeed=seed, playSounds=False, consoleEvents=False)
+        challenge = ChallengeEngine(**kwargs)
+        challenge.registerPlayers(ScriptedPlayer(None, moves1[:, k]), ScriptedPlayer(None, moves2[:, k]))
+        expected = challenge.runHeadless()
+        assert (results[k].player1Score, results[k].player2Score) == (expected.player1Score, expected.player2Score)
+        assert np.array_equal(batch.mazes[k], challenge.maze)
+        assert tuple(batch.player1Positions[k]) == challenge.player1Position
+        assert tuple(batch.player2Positions[k]) == challenge.player2Position
+
+def test_shared_batch_player_matches_per_game_players():
+    config = ChallengeConfig(width=21, height=15, steps=80, **TOURNAMENT_SETTINGS)
+    shared = FirstOpenBatchPlayer(config)
+    batched = BatchEngine(config, SEEDS).runPlayers([shared] * len(SEEDS), [shared] * len(SEEDS))
+    assert shared.calls == config.steps
+    batch = BatchEngine(config, SEEDS)
+    single = batch.runPlayers(
+        [FirstOpenPlayer(g.cloneConfig()) for g in batch.games], [FirstOpenPlayer(g.cloneConfig()) for g in batch.games],
+    )
+    assert [(r.player1Score, r.player2Score) for r in batched] == [(r.player1Score, r.player2Score) for r in single]
+    # play (une partie) et playBatch (toutes les parties) donnent le même coup
+    challenge = batch.games[0]
+    assert shared.play(challenge.maze, challenge.player1Position, None, 0, 0, 0, 0) == FirstOpenPlayer(None).play(
+        challenge.maze, challenge.player1Position)
@@ -0,0 +1,42 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+from engine import ChallengeEngine
+
+def newEngine(seed: int):
+    return ChallengeEngine(width=61, height=41, steps=10, randomSeed=seed, playSounds=False, consoleEvents=False)
+
+def bonusCounts(c: ChallengeEngine):
+    m = c.maze
+    return (
+        int(((m >= 1) & (m <= c.score1Value)).sum()),
+        int(((m > c.score1Value) & (m <= c.score2Value)).sum()),
+        int(((m >= c.scoreMinValue) & (m <= -3)).sum()),
+        int((m == -2).sum()),
+    )
+
+def test_bulk_bonus_placement_matches_one_by_one_placement(monkeypatch):
+    expected = bonusCounts(newEngine(3))
+    monkeypatch.setattr(ChallengeEngine, 'BULK_CELLS', 0)
+    c = newEngine(3)
+    assert bonusCounts(c) == expected
+    for x, y in (c.player1Position, c.player2Position):
+        assert c.maze[y, x] == 0
+    cells = c.freeCells.cells[:len(c.freeCells)]
+    assert sorted(cells.tolist()) == np.flatnonzero(c.maze.ravel() == 0).tolist()
+    assert np.array_equal(c.freeCells.where[cells], np.arange(len(cells)))
+    assert np.array_equal(newEngine(3).maze, c.maze)
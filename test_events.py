@@ -0,0 +1,90 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+import engine
+import events
+from engine import BasePlayer, ChallengeEngine
+
+class FailingPlayer(BasePlayer):
+    def play(self, maze, *args):
+        raise ValueError('perdu')
+
+def playFailingGame(monkeypatch, *sinks, level=events.LEVEL_MOVE):
+    calls = []
+    formatExc = engine.traceback.format_exc
+    monkeypatch.setattr(engine.traceback, 'format_exc', lambda: calls.append(1) or formatExc())
+    challenge = ChallengeEngine(width=15, height=11, steps=5, randomSeed=1, playSounds=False, consoleEvents=False, eventLevel=level)
+    for sink in sinks:
+        challenge.events.addSink(sink)
+    challenge.registerPlayers(FailingPlayer(challenge.cloneConfig()))
+    challenge.runHeadless()
+    assert challenge.player1Stats.exceptions == 5
+    return calls
+
+def test_exception_events_carry_the_traceback(monkeypatch):
+    sink = events.RingBufferSink()
+    calls = playFailingGame(monkeypatch, sink)
+    failures = [e for e in sink.events if e.kind == events.EVENT_EXCEPTION]
+    assert len(calls) == len(failures) == 5
+    assert all('perdu' in e.data['traceback'] for e in failures)
+
+def test_no_traceback_without_a_listener(monkeypatch):
+    assert not playFailingGame(monkeypatch)
+    assert not playFailingGame(monkeypatch, events.RingBufferSink(), level=events.LEVEL_ERROR + 1)
+
+class GatedSink(events.EventSink):
+    """
+        Ne reçoit rien tant que gate n'est pas ouvert ; échoue sur les lots de l'étape failStep.
+    """
+    def __init__(self, failStep: int = None) -> None:
+        self.gate = threading.Event()
+        self.batches = []
+        self.failStep = failStep
+
+    def receive(self, batch):
+        self.gate.wait()
+        if batch[0].step == self.failStep:
+            raise OSError('disque plein')
+        self.batches.append(batch)
+
+def batch(step: int):
+    return [events.Event(step, events.EVENT_MOVE, 1, 'a', {'position': (1, 1)})]
+
+def test_full_threaded_sink_waits_instead_of_dropping():
+    sink = GatedSink()
+    threaded = events.ThreadedSink(sink, maxBatches=2)
+    producer = threading.Thread(target=lambda: [threaded.receive(batch(step)) for step in range(10)])
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()
+    sink.gate.set()
+    producer.join(10)
+    threaded.close()
+    assert [b[0].step for b in sink.batches] == list(range(10))
+    assert threaded.dropped == 0
+
+def test_lost_events_are_reported_on_close(capsys):
+    sink = GatedSink(failStep=3)
+    sink.gate.set()
+    threaded = events.ThreadedSink(sink, maxBatches=2)
+    for step in range(6):
+        threaded.receive(batch(step))
+    threaded.close()
+    last = sink.batches[-1][0]
+    assert last.kind == events.EVENT_DROPPED and last.data['events'] == 1
+    assert [b[0].step for b in sink.batches[:-1]] == [0, 1, 2, 4, 5]
+    assert '1 événements perdus' in capsys.readouterr().err
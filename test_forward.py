@@ -0,0 +1,96 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import random
+import numpy as np
+import pytest
+import playerExample1
+import playerExample2
+from engine import ChallengeEngine
+from forward import ForwardModel
+
+class FirstChoice(random.Random):
+    """
+        Le changement de type d'une cellule de rafraîchissement (choice) est le même dans le moteur et dans le modèle ;
+        les autres tirages (réapparition, régénération) restent aléatoires.
+    """
+    def choice(self, seq):
+        return seq[0]
+
+class RecordingEngine(ChallengeEngine):
+    """
+        Garde les coups (pénalité, position) appliqués pendant la dernière étape.
+    """
+    def applyMove(self, n: int, move):
+        self.moves[n] = move
+        return super().applyMove(n, move)
+
+def kind(c: ChallengeEngine, value: int):
+    if value == -2:
+        return 'refresh'
+    if value < 0:
+        return 'min'
+    return 'score1' if value <= c.score1Value else 'score2'
+
+@pytest.mark.parametrize('kwargs', [{}, {'regenerateCells': True}, {'regenerateCells': True, 'simultaneousMoves': True}])
+def test_forward_step_matches_the_engine(kwargs):
+    random.seed(1)
+    c = RecordingEngine(width=11, height=9, steps=400, randomSeed=1, playSounds=False, consoleEvents=False, **kwargs)
+    c.random = FirstChoice(1)
+    c.moves = {}
+    c.registerPlayers(playerExample1.Player(c.cloneConfig()), playerExample2.Player(c.cloneConfig()))
+    crosses = regenerated = 0
+    try:
+        while c.currentStep < c.steps:
+            before = c.maze.copy()
+            model = ForwardModel(c.cloneConfig(), before.copy())
+            state = model.initialState(
+                c.player1Position, c.player2Position, c.player1Type, c.player2Type, c.player1Score, c.player2Score,
+                c.currentStep,
+            )
+            c.step()
+            (s1, m1), (s2, m2) = c.moves[1], c.moves[2]
+            assert s1 == s2 == 0
+            after = model.step(state, m1, m2, FirstChoice(c.currentStep))
+
+            assert after.currentStep == c.currentStep
+            assert (after.player1Score, after.player2Score) == (c.player1Score, c.player2Score)
+            assert (after.player1Type, after.player2Type) == (c.player1Type, c.player2Type)
+            # Le perdant d'un croisement réapparaît sur une case vide tirée au hasard, différente dans les deux
+            positions = [(after.player1Position, c.player1Position), (after.player2Position, c.player2Position)]
+            for n, (p, q) in enumerate(positions, 1):
+                if c.lastCross and c.lastCross != n:
+                    assert after.cell(*p) == 0 and p != positions[2 - n][0]
+                else:
+                    assert p == q
+            crosses += bool(c.lastCross)
+
+            maze = after.maze()
+            if not c.regenerateCells:
+                assert np.array_equal(maze, c.maze)
+                continue
+            # Les cellules ramassées sont vidées dans les deux ; celles qui sont régénérées sont tirées au hasard, mais
+            # une par cellule ramassée et de la même sorte
+            cleared = (before != 0) & (c.maze == 0)
+            assert np.array_equal(cleared, (before != 0) & (maze == 0))
+            new = sorted(kind(c, v) for v in c.maze[(before == 0) & (c.maze != 0)])
+            assert sorted(kind(c, v) for v in maze[(before == 0) & (maze != 0)]) == new
+            regenerated += len(new)
+    finally:
+        c.close()
+    # La graine est choisie pour que la partie contienne des croisements
+    assert crosses
+    assert regenerated or not c.regenerateCells
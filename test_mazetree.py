@@ -0,0 +1,58 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import collections
+import random
+import playerExample1
+import playerExample2
+from engine import ChallengeEngine
+
+def newEngine(**kwargs):
+    return ChallengeEngine(width=25, height=17, steps=50, randomSeed=11, playSounds=False, consoleEvents=False, **kwargs)
+
+def bfsDistances(maze, start):
+    distances = {start: 0}
+    queue = collections.deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for p in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if p not in distances and 0 <= p[0] < maze.shape[1] and 0 <= p[1] < maze.shape[0] and maze[p[1], p[0]] != -1:
+                distances[p] = distances[(x, y)] + 1
+                queue.append(p)
+    return distances
+
+def test_distances_match_a_breadth_first_search():
+    challenge = newEngine()
+    tree = challenge.mazeTree
+    start = challenge.player1Position
+    distances = bfsDistances(challenge.maze, start)
+    for p, d in distances.items():
+        assert tree.distance(start, p) == d
+        if d:
+            step = tree.nextStepTowards(start, p)
+            assert distances[step] == 1 and tree.distance(step, p) == d - 1
+
+def test_tree_is_built_only_when_a_player_asks():
+    random.seed(11)
+    challenge = newEngine()
+    challenge.registerPlayers(
+        playerExample1.Player(challenge.cloneConfig()), playerExample2.Player(challenge.cloneConfig()),
+    )
+    challenge.runHeadless()
+    assert challenge.mazeTree.walls is None
+    assert challenge.player1.config.mazeTree is challenge.mazeTree
+    challenge.player1.config.mazeTree.distance(challenge.player1Position, challenge.player1Position)
+    assert challenge.mazeTree.walls is not None
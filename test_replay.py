@@ -0,0 +1,120 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pathlib
+import random
+import numpy as np
+import pytest
+import playerExample1
+import playerExample2
+from engine import ChallengeEngine, applyChanges
+from replay import PATH_PARAMS, Replay
+
+def newGame(tmp_path, **kwargs):
+    random.seed(7)
+    challenge = ChallengeEngine(
+        width=21, height=15, steps=120, randomSeed=7, playSounds=False, consoleEvents=False,
+        replayPath=str(tmp_path / 'game.npz'), **kwargs,
+    )
+    challenge.registerPlayers(
+        playerExample1.Player(challenge.cloneConfig()), playerExample2.Player(challenge.cloneConfig()),
+    )
+    return challenge
+
+def liveState(challenge: ChallengeEngine):
+    return (
+        challenge.maze.copy(),
+        challenge.player1Position, challenge.player2Position,
+        challenge.player1Type, challenge.player2Type,
+        challenge.player1Score, challenge.player2Score,
+    )
+
+def replayState(state):
+    return (
+        state.maze,
+        state.player1Position, state.player2Position,
+        state.player1Type, state.player2Type,
+        state.player1Score, state.player2Score,
+    )
+
+def test_state_at_matches_the_live_game(tmp_path):
+    challenge = newGame(tmp_path, regenerateCells=True)
+    states = [liveState(challenge)]
+    while challenge.currentStep < challenge.steps:
+        challenge.step()
+        states.append(liveState(challenge))
+    challenge.close()
+
+    replay = Replay(str(tmp_path / 'game.npz'))
+    assert replay.steps == challenge.steps
+    order = list(range(replay.steps + 1))
+    random.Random(1).shuffle(order)
+    for step in order:
+        expected, actual = states[step], replayState(replay.stateAt(step))
+        assert np.array_equal(expected[0], actual[0])
+        assert expected[1:] == actual[1:]
+
+def outputs(tmp_path):
+    return dict(eventLog=str(tmp_path / 'events.jsonl'), metricsPath=str(tmp_path / 'metrics.csv'))
+
+def readAll(paths: dict):
+    return {key: pathlib.Path(path).read_bytes() for key, path in paths.items()}
+
+def test_replay_keeps_no_path_of_the_original_game(tmp_path):
+    challenge = newGame(tmp_path, profileDir=str(tmp_path / 'profiles'), **outputs(tmp_path))
+    challenge.runHeadless()
+    replay = Replay(str(tmp_path / 'game.npz'))
+    assert all(replay.configKwargs[key] is None for key in PATH_PARAMS)
+
+def test_opening_a_replay_keeps_the_original_outputs(tmp_path, monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    viewer = pytest.importorskip('viewer')
+    paths = outputs(tmp_path)
+    challenge = newGame(tmp_path, **paths)
+    challenge.runHeadless()
+    before = readAll(paths)
+    assert all(before.values())
+
+    replayViewer = viewer.ReplayViewer(Replay(str(tmp_path / 'game.npz')))
+    replayViewer.seek(replayViewer.steps)
+    replayViewer.close()
+    assert readAll(paths) == before
+    assert sorted(os.listdir(tmp_path)) == sorted(['game.npz'] + [os.path.basename(p) for p in paths.values()])
+
+def test_replay_viewer_starts_from_the_recorded_state_without_generating(tmp_path, monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    viewer = pytest.importorskip('viewer')
+    newGame(tmp_path).runHeadless()
+    replay = Replay(str(tmp_path / 'game.npz'))
+
+    def generate(self):
+        raise AssertionError('the replay viewer must not generate a maze')
+    monkeypatch.setattr(ChallengeEngine, 'generate', generate)
+    replayViewer = viewer.ReplayViewer(replay)
+    state = replay.stateAt(0)
+    assert np.array_equal(replayViewer.maze, replay.initialMaze)
+    assert (replayViewer.player1Position, replayViewer.player2Position) == (state.player1Position, state.player2Position)
+    assert (replayViewer.player1Type, replayViewer.player2Type) == (state.player1Type, state.player2Type)
+    replayViewer.close()
+
+def test_repeated_cell_changes_keep_the_last_value():
+    maze = np.zeros((3, 4), dtype=np.int8)
+    cells = applyChanges(maze, np.array([5, 2, 5, 5, 2, 7]), np.array([1, 2, 3, 4, 0, 6], dtype=np.int8))
+    assert cells.tolist() == [2, 5, 7]
+    assert maze.ravel().tolist() == [0, 0, 0, 0, 0, 4, 0, 6, 0, 0, 0, 0]
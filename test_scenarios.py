@@ -0,0 +1,67 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pathlib
+import random
+import numpy as np
+import playerExample1
+import playerExample2
+import scenarios
+from engine import ChallengeConfig, ChallengeEngine
+from tournament import TOURNAMENT_SETTINGS
+
+SEEDS = [2, 9, 40]
+
+def newConfig(width: int = 25):
+    return ChallengeConfig(width=width, height=17, steps=120, **dict(TOURNAMENT_SETTINGS, regenerateCells=True))
+
+def playGame(config: ChallengeConfig, seed: int, scenarioPack: str = None):
+    random.seed(seed)
+    kwargs = config.configKwargs()
+    kwargs.update(randomSeed=seed, playSounds=False, consoleEvents=False, scenarioPack=scenarioPack)
+    challenge = ChallengeEngine(**kwargs)
+    initial = np.array(challenge.maze)
+    challenge.registerPlayers(
+        playerExample1.Player(challenge.cloneConfig()), playerExample2.Player(challenge.cloneConfig()),
+    )
+    result = challenge.runHeadless()
+    return initial, np.array(challenge.maze), (result.player1Score, result.player2Score), challenge.player1Position
+
+def test_packed_games_match_fresh_generation(tmp_path):
+    config = newConfig()
+    path = str(tmp_path / 'pack')
+    scenarios.build(path, config, SEEDS)
+    mazes = pathlib.Path(path, 'mazes.npy').read_bytes()
+    assert len(scenarios.load(path)) == len(SEEDS)
+    for seed in SEEDS:
+        fresh, packed = playGame(config, seed), playGame(config, seed, path)
+        assert np.array_equal(fresh[0], packed[0])
+        assert np.array_equal(fresh[1], packed[1])
+        assert fresh[2:] == packed[2:]
+    # Les parties modifient leur copie du labyrinthe, jamais le paquet
+    assert pathlib.Path(path, 'mazes.npy').read_bytes() == mazes
+
+def test_pack_is_ignored_for_other_settings_or_seeds(tmp_path):
+    path = str(tmp_path / 'pack')
+    scenarios.build(path, newConfig(), SEEDS)
+    pack = scenarios.load(path)
+    other = newConfig(width=27)
+    other.randomSeed = SEEDS[0]
+    assert pack.find(other) is None
+    missing = newConfig()
+    missing.randomSeed = 1
+    assert pack.find(missing) is None
+    assert np.array_equal(playGame(other, SEEDS[0], path)[1], playGame(other, SEEDS[0])[1])
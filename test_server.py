@@ -0,0 +1,135 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import pytest
+import client
+import protocol
+from engine import ChallengeConfig
+from server import MatchServer
+from tournament import TOURNAMENT_SETTINGS
+
+@pytest.fixture
+def unixPath():
+    folder = tempfile.mkdtemp()
+    yield os.path.join(folder, 'server.sock')
+    shutil.rmtree(folder)
+
+def player(module: str):
+    return lambda unixPath: client.run(module, unixPath=unixPath)
+
+def quitter(moves: int):
+    """
+        Un client qui répond moves fois par une erreur puis se déconnecte au milieu de sa première partie.
+    """
+    return lambda unixPath: playThenQuit(unixPath, moves)
+
+def playThenQuit(unixPath: str, moves: int):
+    with client.connect(None, None, unixPath) as sock:
+        sock.sendall(protocol.hello('quitter'))
+        while True:
+            size, kind = protocol.FRAME.unpack(client.recvExactly(sock, protocol.FRAME.size))
+            body = client.recvExactly(sock, size - 1)
+            if kind == protocol.PLAY:
+                if not moves:
+                    return
+                moves -= 1
+                matchId, callId = protocol.CALL.unpack_from(body)
+                sock.sendall(protocol.error(matchId, callId, 'pas de coup'))
+
+def shortMove(unixPath: str):
+    """
+        Un client qui répond à son premier coup par une trame MOVE trop courte.
+    """
+    with client.connect(None, None, unixPath) as sock:
+        sock.sendall(protocol.hello('short'))
+        while True:
+            size, kind = protocol.FRAME.unpack(client.recvExactly(sock, protocol.FRAME.size))
+            body = client.recvExactly(sock, size - 1)
+            if kind == protocol.PLAY:
+                sock.sendall(protocol.frame(protocol.MOVE, body[:protocol.CALL.size]))
+                return
+
+def stuck(unixPath: str, seconds: float = 20):
+    """
+        Un client qui se présente puis ne lit plus rien pendant seconds secondes.
+    """
+    with client.connect(None, None, unixPath) as sock:
+        sock.sendall(protocol.hello('stuck'))
+        time.sleep(seconds)
+
+def serve(unixPath: str, seeds: list, *clients, **kwargs):
+    config = ChallengeConfig(**dict(dict(width=15, height=11, steps=30, **TOURNAMENT_SETTINGS), **kwargs))
+    server = MatchServer(config, seeds, len(clients))
+    async def main():
+        task = asyncio.create_task(server.serve(unixPath=unixPath))
+        while not os.path.exists(unixPath):
+            await asyncio.sleep(0.01)
+        threads = [threading.Thread(target=target, args=(unixPath,), daemon=True) for target in clients]
+        for t in threads:
+            t.start()
+        await asyncio.wait_for(task, 60)
+        for t, target in zip(threads, clients):
+            # Le client bloqué n'a pas de fin de partie à attendre
+            if target is not stuck:
+                await asyncio.to_thread(t.join, 10)
+    asyncio.run(main())
+    return server
+
+def test_remote_games_are_played_to_the_end(unixPath):
+    server = serve(unixPath, [1, 2, 3], player('playerExample1'), player('playerExample2'))
+    assert len(server.results) == 3
+    assert all(game.result.steps == 30 and not game.forfeits for game in server.results)
+    assert sum(e.games for e in server.leaderboard.entries.values()) == 6
+
+def test_disconnect_is_a_forfeit_and_ends_the_run(unixPath):
+    server = serve(unixPath, [1, 2, 3], player('playerExample1'), quitter(5))
+    assert len(server.results) == 1
+    game = server.results[0]
+    assert game.result.steps < 30
+    quitterNumber = 1 if game.module1 == 'quitter' else 2
+    assert game.forfeits == (quitterNumber,)
+    assert server.leaderboard.entries['quitter'].losses == 1
+    assert server.leaderboard.entries['playerExample1'].wins == 1
+    assert server.unplayed == [2, 3]
+
+def test_disconnect_before_the_first_move(unixPath):
+    server = serve(unixPath, [1], player('playerExample1'), quitter(0))
+    assert [game.forfeits for game in server.results] in ([(1,)], [(2,)])
+
+def test_short_move_frame_is_a_forfeit(unixPath, caplog):
+    server = serve(unixPath, [1, 2], player('playerExample1'), shortMove)
+    # L'erreur de la trame ne sort pas de la tâche du client
+    assert not [r for r in caplog.records if r.name == 'asyncio']
+    assert len(server.results) == 1
+    game = server.results[0]
+    assert game.forfeits == ((1 if game.module1 == 'short' else 2),)
+    assert server.unplayed == [2]
+
+def test_client_that_stops_reading_forfeits(unixPath):
+    # Le labyrinthe (envoyé en début de partie) dépasse les tampons du socket : le client ne le lit jamais
+    start = time.perf_counter()
+    server = serve(unixPath, [1, 2], player('playerExample1'), stuck, width=1201, height=1201, steps=5, maxTime=200)
+    assert time.perf_counter() - start < 15
+    assert len(server.results) == 1
+    game = server.results[0]
+    assert game.forfeits == ((1 if game.module1 == 'stuck' else 2),)
+    assert server.unplayed == [2]
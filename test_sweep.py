@@ -0,0 +1,50 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+from engine import ChallengeConfig
+from sweep import expandSettings, resultToDict, runSweep
+from tournament import TOURNAMENT_SETTINGS
+
+MODULES = ['playerExample1', 'playerExample2']
+
+def newConfig():
+    return ChallengeConfig(width=21, height=15, steps=60, **TOURNAMENT_SETTINGS)
+
+def summary(result):
+    return [(i, game.seed, game.module1, game.module2, resultToDict(game.result)) for i, game in result.games]
+
+def test_rerun_reads_every_game_from_the_cache(tmp_path):
+    settings = expandSettings({'scoreCrossValue': [5, 17]})
+    cache = str(tmp_path / 'cache')
+    first = runSweep(MODULES, [1, 2], newConfig(), settings, cache, workers=2)
+    assert (first.played, first.cached) == (8, 0)
+    second = runSweep(MODULES, [1, 2], newConfig(), settings, cache, workers=2)
+    assert (second.played, second.cached) == (0, 8)
+    assert summary(second) == summary(first)
+
+    extended = runSweep(MODULES, [1, 2, 3], newConfig(), settings, cache, workers=2)
+    assert (extended.played, extended.cached) == (4, 8)
+    changed = runSweep(MODULES, [1], newConfig(), expandSettings({'scoreCrossValue': [6]}), cache, workers=2)
+    assert (changed.played, changed.cached) == (2, 0)
+
+def test_sampled_settings_are_reproducible():
+    a = expandSettings({'maxTime': [100, 200]}, {'scoreOnTimeout': (-20, -5), 'countScore1': (0.1, 0.3)}, samples=3, sampleSeed=4)
+    assert a == expandSettings({'maxTime': [100, 200]}, {'scoreOnTimeout': (-20, -5), 'countScore1': (0.1, 0.3)}, samples=3, sampleSeed=4)
+    assert len(a) == 6
+    assert all(-20 <= s['scoreOnTimeout'] <= -5 and isinstance(s['scoreOnTimeout'], int) for s in a)
+    with pytest.raises(ValueError):
+        expandSettings({'notAParameter': [1]})
@@ -0,0 +1,47 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+from engine import ChallengeConfig
+from replay import Replay
+from tournament import TOURNAMENT_SETTINGS, Leaderboard, pairings, parseSeeds, runGame, runTournament
+
+MODULES = ['playerExample1', 'playerExample2']
+SEEDS = [3, 4, 5]
+
+def newConfig():
+    return ChallengeConfig(width=21, height=15, steps=100, **TOURNAMENT_SETTINGS)
+
+def summary(leaderboard: Leaderboard):
+    return {e.module: (e.games, e.wins, e.draws, e.losses, e.score, e.penalty) for e in leaderboard.entries.values()}
+
+def test_pool_results_match_games_played_in_process(tmp_path):
+    config = newConfig()
+    games = []
+    leaderboard = runTournament(MODULES, SEEDS, config, workers=2, onResult=games.append, replaysDir=str(tmp_path))
+    expected = Leaderboard()
+    for seed in SEEDS:
+        for m1, m2 in pairings(MODULES):
+            expected.add(runGame(m1, m2, seed, config.configKwargs()))
+    assert len(games) == len(SEEDS) * 2
+    assert summary(leaderboard) == summary(expected)
+    assert len(os.listdir(tmp_path)) == len(games)
+    game = games[0]
+    replay = Replay(str(tmp_path / '{}-{}-{}.npz'.format(game.seed, game.module1, game.module2)))
+    assert int(replay.rows[-1]['score1']) == game.result.player1Score
+
+def test_parse_seeds():
+    assert parseSeeds('0-3,7,-2') == [0, 1, 2, 3, 7, -2]
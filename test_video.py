@@ -0,0 +1,133 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import random
+import time
+import numpy as np
+import pygame
+import pytest
+import playerExample1
+import playerExample2
+import video
+from engine import ChallengeEngine
+from replay import Replay
+
+SIZE = (320, 240)
+
+@pytest.fixture(scope='module', autouse=True)
+def fonts():
+    pygame.font.init()
+
+def playGame(tmp_path, steps: int = 80, **kwargs):
+    random.seed(5)
+    challenge = ChallengeEngine(
+        width=21, height=15, steps=steps, randomSeed=5, playSounds=False, consoleEvents=False,
+        replayPath=str(tmp_path / 'game.npz'), **kwargs,
+    )
+    challenge.registerPlayers(
+        playerExample1.Player(challenge.cloneConfig()), playerExample2.Player(challenge.cloneConfig()),
+    )
+    challenge.runHeadless()
+    return challenge, Replay(str(tmp_path / 'game.npz'))
+
+def snapshotAt(replay: Replay, step: int, previous: int = None):
+    row = replay.rows[step]
+    if previous is None:
+        indices = np.flatnonzero(replay.mazeAt(step).ravel() != replay.initialMaze.ravel())
+        values = replay.mazeAt(step).ravel()[indices]
+    else:
+        indices, values = replay.changesBetween(previous, step)
+    return video.Snapshot(
+        step,
+        (tuple(int(v) for v in row['position1']), tuple(int(v) for v in row['position2'])),
+        (int(row['type1']), int(row['type2'])),
+        (int(row['score1']), int(row['score2'])),
+        indices, values,
+    )
+
+def freshFrame(replay: Replay, step: int):
+    renderer = video.FrameRenderer(replay.config, replay.initialMaze, replay.names, SIZE)
+    return pygame.surfarray.array3d(renderer.draw(snapshotAt(replay, step)))
+
+def pngFrames(path):
+    return sorted(os.listdir(path))
+
+def loadFrame(path, name):
+    return pygame.surfarray.array3d(pygame.image.load(os.path.join(path, name)))
+
+def test_incremental_frames_match_full_redraws(tmp_path):
+    _, replay = playGame(tmp_path)
+    renderer = video.FrameRenderer(replay.config, replay.initialMaze, replay.names, SIZE)
+    for step in range(replay.steps + 1):
+        surface = renderer.draw(snapshotAt(replay, step, step - 1 if step else 0))
+        if step in (0, 1, 33, replay.steps):
+            assert np.array_equal(pygame.surfarray.array3d(surface), freshFrame(replay, step))
+
+def test_run_headless_keeps_the_final_state(tmp_path):
+    frames = tmp_path / 'frames'
+    challenge, replay = playGame(tmp_path, videoPath=str(frames))
+    names = pngFrames(frames)
+    assert 1 <= len(names) <= challenge.steps + 1
+    final = loadFrame(frames, names[-1])
+    renderer = video.FrameRenderer(replay.config, replay.initialMaze, replay.names, video.VideoRecorder.FRAME_SIZE)
+    expected = renderer.draw(snapshotAt(replay, replay.steps))
+    assert np.array_equal(final, pygame.surfarray.array3d(expected))
+
+def test_run_headless_does_not_wait_for_the_video(tmp_path):
+    def headlessTime(**kwargs):
+        random.seed(5)
+        challenge = ChallengeEngine(width=41, height=31, steps=300, randomSeed=5, playSounds=False, consoleEvents=False, **kwargs)
+        challenge.registerPlayers(
+            playerExample1.Player(challenge.cloneConfig()), playerExample2.Player(challenge.cloneConfig()),
+        )
+        # L'écriture des dernières images (close) a lieu une fois la partie finie : elle n'est pas mesurée
+        ended = []
+        close = challenge.close
+        def timedClose():
+            ended.append(time.perf_counter())
+            close()
+        challenge.close = timedClose
+        start = time.perf_counter()
+        challenge.runHeadless()
+        return ended[0] - start
+    plain = headlessTime()
+    # La marge couvre le démarrage du processus de rendu
+    assert headlessTime(videoPath=str(tmp_path / 'frames')) < 5 * plain + 0.5
+
+def test_dropped_frames_keep_the_final_state(tmp_path):
+    _, replay = playGame(tmp_path)
+    frames = tmp_path / 'frames'
+    recorder = video.VideoRecorder(replay.config, replay.initialMaze, replay.names, str(frames), size=SIZE)
+    for step in range(replay.steps + 1):
+        snapshot = snapshotAt(replay, step, step - 1 if step else 0)
+        recorder.cellsChanged(snapshot.indices.tolist(), snapshot.values.tolist())
+        recorder.capture(step, snapshot.positions, snapshot.types, snapshot.scores)
+    recorder.close()
+    names = pngFrames(frames)
+    assert recorder.frames == len(names) == replay.steps + 1 - recorder.dropped
+    assert np.array_equal(loadFrame(frames, names[-1]), freshFrame(replay, replay.steps))
+
+def test_close_reports_a_dead_render_process(tmp_path):
+    _, replay = playGame(tmp_path)
+    recorder = video.VideoRecorder(replay.config, replay.initialMaze, replay.names, str(tmp_path / 'frames'), size=SIZE)
+    recorder.process.kill()
+    recorder.process.join()
+    snapshot = snapshotAt(replay, 0)
+    for step in range(video.VideoRecorder.QUEUE_SIZE + 2):
+        recorder.capture(step, snapshot.positions, snapshot.types, snapshot.scores)
+    with pytest.raises(RuntimeError, match='exited with status'):
+        recorder.close()
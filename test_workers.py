@@ -0,0 +1,134 @@
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import time
+import numpy as np
+import pytest
+from arena import ArenaEngine
+from engine import BasePlayer, ChallengeEngine, TimeoutError # pylint: disable=redefined-builtin
+from workers import PlayerException, PlayerWorker
+
+MAX_TIME = 100
+
+class StayPlayer(BasePlayer):
+    """
+        Reste sur place après avoir attendu delay secondes.
+    """
+    def __init__(self, config, name: str, delay: float = 0) -> None:
+        super().__init__(config)
+        self.name = name
+        self.delay = delay
+
+    def play(self, maze, myPosition, *args):
+        time.sleep(self.delay)
+        return myPosition
+
+class FirstOpenPlayer(BasePlayer):
+    """
+        Va sur la première case voisine libre, dans un ordre qui tourne à chaque coup : un joueur déterministe.
+    """
+    DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+    def __init__(self, config) -> None:
+        super().__init__(config)
+        self.name = 'premier'
+        self.turn = 0
+
+    def play(self, maze, myPosition, *args):
+        self.turn += 1
+        x, y = myPosition
+        for i in range(4):
+            dx, dy = self.DIRECTIONS[(self.turn + i) % 4]
+            if maze[y + dy][x + dx] != -1:
+                return (x + dx, y + dy)
+        return myPosition
+
+class FailingPlayer(BasePlayer):
+    def play(self, maze, *args):
+        raise ValueError('perdu')
+
+def newEngine(cls=ChallengeEngine, **kwargs):
+    kwargs.setdefault('simultaneousMoves', True)
+    return cls(
+        width=21, height=15, steps=4, randomSeed=3, playSounds=False, consoleEvents=False, maxTime=MAX_TIME, **kwargs,
+    )
+
+@pytest.mark.parametrize('readOnlyMaze', [False, True])
+def test_worker_games_match_in_process_games(readOnlyMaze):
+    results = []
+    for playerWorkers in (False, True):
+        challenge = ChallengeEngine(
+            width=21, height=15, steps=40, randomSeed=8, playSounds=False, consoleEvents=False,
+            playerWorkers=playerWorkers, readOnlyMaze=readOnlyMaze,
+        )
+        challenge.registerPlayers(FirstOpenPlayer(challenge.cloneConfig()), FirstOpenPlayer(challenge.cloneConfig()))
+        result = challenge.runHeadless()
+        results.append((result.player1Score, result.player2Score, challenge.maze.tobytes()))
+    assert results[0] == results[1]
+
+def test_slow_player_times_out_in_sequential_mode():
+    challenge = newEngine(simultaneousMoves=False, playerWorkers=True)
+    config = challenge.cloneConfig()
+    challenge.registerPlayers(StayPlayer(config, 'lent', MAX_TIME * 1.5 / 1000), StayPlayer(config, 'rapide'))
+    challenge.runHeadless()
+    assert challenge.player1Stats.timeouts == challenge.steps
+    assert challenge.player2Stats.timeouts == 0
+
+def test_worker_replies_timeouts_and_exceptions():
+    maze = np.zeros((5, 5), dtype=np.int8)
+    worker = PlayerWorker(StayPlayer(None, 'lent', 0.3), maze)
+    fast = PlayerWorker(StayPlayer(None, 'rapide'), maze)
+    failing = PlayerWorker(FailingPlayer(None), maze)
+    try:
+        assert fast.play(maze, MAX_TIME, (1, 2)) == (1, 2)
+        with pytest.raises(TimeoutError):
+            worker.play(maze, MAX_TIME, (1, 2))
+        assert worker.restarts == 1
+        with pytest.raises(PlayerException, match='perdu'):
+            failing.play(maze, MAX_TIME, (1, 2))
+        assert failing.restarts == 0
+    finally:
+        for w in (worker, fast, failing):
+            w.close()
+
+def test_reply_read_after_the_deadline_is_not_a_timeout():
+    maze = np.zeros((5, 5), dtype=np.int8)
+    worker = PlayerWorker(StayPlayer(None, 'rapide'), maze)
+    try:
+        worker.send(maze, MAX_TIME, (1, 2))
+        time.sleep(MAX_TIME * 1.5 / 1000)
+        assert worker.receive(False) == (1, 2)
+        worker.recover()
+        assert worker.restarts == 0
+    finally:
+        worker.close()
+
+def test_slow_player_does_not_charge_a_timeout_to_the_other():
+    challenge = newEngine()
+    config = challenge.cloneConfig()
+    challenge.registerPlayers(StayPlayer(config, 'lent', MAX_TIME * 1.5 / 1000), StayPlayer(config, 'rapide'))
+    challenge.runHeadless()
+    assert challenge.player1Stats.timeouts == challenge.steps
+    assert challenge.player2Stats.timeouts == 0
+
+def test_arena_slow_player_does_not_charge_a_timeout_to_the_others():
+    challenge = newEngine(ArenaEngine)
+    config = challenge.cloneConfig()
+    challenge.registerPlayers(
+        StayPlayer(config, 'lent', MAX_TIME * 1.5 / 1000), StayPlayer(config, 'rapide1'), StayPlayer(config, 'rapide2'),
+    )
+    challenge.runHeadless()
+    assert [s.timeouts for s in challenge.stats] == [challenge.steps, 0, 0]
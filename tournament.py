@@ -0,0 +1,239 @@
+# Tournoi : fait s'affronter une liste de joueurs sur plusieurs graines, en parallèle sur tous les coeurs
+# Exemple: python tournament.py playerExample1 playerExample2 --seeds 0-99
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import importlib
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import ChallengeConfig, ChallengeEngine, ChallengeResult
+
+# Réglages des parties de tournoi, en plus des dimensions et du nombre d'étapes (aussi utilisés par server.py et sweep.py)
+TOURNAMENT_SETTINGS = dict(
+    enableRPCGame=True,
+    regenerateCells=False,
+    score1Value=3,
+    countScore1=0.25,
+    score2Value=11,
+    countScore2=0.10,
+    scoreMinValue=-10,
+    countScoreMin=0.15,
+    scoreCrossValue=17,
+    scoreOnBadMove=-35,
+    scoreOnException=-50,
+    scoreOnTimeout=-13,
+    maxTime=500,
+)
+
+class GameResult:
+    """
+        forfeits: les numéros (1, 2) des joueurs qui ont abandonné la partie (client déconnecté, voir server.py) ; un
+        abandon compte comme une défaite quel que soit le score.
+    """
+    def __init__(self, module1: str, module2: str, seed: int, result: ChallengeResult, forfeits: tuple = ()) -> None:
+        self.module1 = module1
+        self.module2 = module2
+        self.seed = seed
+        self.result = result
+        self.forfeits = tuple(forfeits)
+
+class LeaderboardEntry:
+    def __init__(self, module: str) -> None:
+        self.module = module
+        self.name = module
+        self.games = 0
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.score = 0
+        self.penalty = 0
+        self.timeouts = 0
+        self.badMoves = 0
+        self.exceptions = 0
+
+    @property
+    def points(self):
+        return 3 * self.wins + self.draws
+
+    @property
+    def averageScore(self):
+        return self.score / self.games if self.games else 0
+
+class Leaderboard:
+    def __init__(self) -> None:
+        self.entries = {}
+
+    def entry(self, module: str):
+        if module not in self.entries:
+            self.entries[module] = LeaderboardEntry(module)
+        return self.entries[module]
+
+    def addEntryResult(self, module, name, score, enemyScore, stats, forfeit=False, enemyForfeit=False):
+        e = self.entry(module)
+        if name:
+            e.name = name
+        e.games += 1
+        if forfeit:
+            e.losses += 1
+        elif enemyForfeit or score > enemyScore:
+            e.wins += 1
+        elif score < enemyScore:
+            e.losses += 1
+        else:
+            e.draws += 1
+        e.score += score
+        e.penalty += stats.penalty
+        e.timeouts += stats.timeouts
+        e.badMoves += stats.badMoves
+        e.exceptions += stats.exceptions
+
+    def add(self, game: GameResult):
+        r = game.result
+        forfeit1, forfeit2 = 1 in game.forfeits, 2 in game.forfeits
+        self.addEntryResult(game.module1, r.player1Name, r.player1Score, r.player2Score, r.player1Stats, forfeit1, forfeit2)
+        self.addEntryResult(game.module2, r.player2Name, r.player2Score, r.player1Score, r.player2Stats, forfeit2, forfeit1)
+
+    def ranking(self):
+        return sorted(self.entries.values(), key=lambda e: (e.points, e.averageScore), reverse=True)
+
+    def format(self):
+        lines = ['{:>3}  {:<30} {:>7} {:>4} {:>4} {:>4} {:>6} {:>9} {:>8} {:>8}'.format(
+            '#', 'Joueur', 'Parties', 'V', 'N', 'D', 'Points', 'Score moy', 'Pénalité', 'Timeouts'
+        )]
+        for i, e in enumerate(self.ranking()):
+            lines.append('{:>3}  {:<30} {:>7} {:>4} {:>4} {:>4} {:>6} {:>9.1f} {:>8} {:>8}'.format(
+                i + 1, e.name[:30], e.games, e.wins, e.draws, e.losses, e.points, e.averageScore, e.penalty, e.timeouts
+            ))
+        return '\n'.join(lines)
+
+def loadPlayerClass(module: str):
+    return importlib.import_module(module).Player
+
+def replayFileName(module1: str, module2: str, seed: int):
+    return str(seed) + '-' + module1 + '-' + module2 + '.npz'
+
+def runGame(module1: str, module2: str, seed: int, configKwargs: dict, replaysDir: str = None):
+    """
+        Joue une partie complète sans affichage. Exécutée dans un processus du pool.
+        Avec replaysDir, la partie est enregistrée dans ce dossier (voir replay.py).
+    """
+    random.seed(seed)
+    kwargs = dict(configKwargs)
+    kwargs['randomSeed'] = seed
+    kwargs['playSounds'] = False
+    kwargs['consoleEvents'] = False
+    if replaysDir:
+        kwargs['replayPath'] = os.path.join(replaysDir, replayFileName(module1, module2, seed))
+    challenge = ChallengeEngine(**kwargs)
+    player1 = loadPlayerClass(module1)(challenge.cloneConfig())
+    player2 = loadPlayerClass(module2)(challenge.cloneConfig())
+    challenge.registerPlayers(player1, player2)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        result = challenge.runHeadless()
+    return GameResult(module1, module2, seed, result)
+
+def pairings(modules: list[str]):
+    """
+        Chaque paire de joueurs se rencontre deux fois par graine, une fois dans chaque rôle (joueur 1 / joueur 2).
+    """
+    return list(itertools.permutations(modules, 2))
+
+def runTournament(modules: list[str], seeds: list[int], config: ChallengeConfig, workers: int = None, onResult=None, replaysDir: str = None):
+    leaderboard = Leaderboard()
+    configKwargs = config.configKwargs()
+    if replaysDir:
+        os.makedirs(replaysDir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(runGame, m1, m2, seed, configKwargs, replaysDir)
+            for seed in seeds
+            for m1, m2 in pairings(modules)
+        ]
+        for future in as_completed(futures):
+            game = future.result()
+            leaderboard.add(game)
+            if onResult:
+                onResult(game)
+    return leaderboard
+
+def parseSeeds(value: str):
+    seeds = []
+    for part in value.split(','):
+        if '-' in part[1:]:
+            a, b = part.split('-', 1)
+            seeds.extend(range(int(a), int(b) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+def printGame(game: GameResult):
+    r = game.result
+    print('[graine {}] {} ({}) vs {} ({}) | pénalités {} / {} | timeouts {} / {}'.format(
+        game.seed, game.module1, int(r.player1Score), game.module2, int(r.player2Score),
+        r.player1Stats.penalty, r.player2Stats.penalty,
+        r.player1Stats.timeouts, r.player2Stats.timeouts,
+    ) + ''.join(' | abandon de {}'.format(game.module1 if n == 1 else game.module2) for n in game.forfeits))
+
+def main():
+    parser = argparse.ArgumentParser(description='Tournoi entre plusieurs joueurs, sans affichage.')
+    parser.add_argument('players', nargs='+', help='Modules des joueurs (ex: playerExample1)')
+    parser.add_argument('--seeds', type=parseSeeds, default=list(range(10)), help='Graines, ex: 0-99 ou 1,5,7')
+    parser.add_argument('--workers', type=int, default=None, help='Nombre de processus (par défaut: nombre de coeurs)')
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--isolate', action='store_true', help='Exécute chaque joueur dans son propre processus (limite de temps précise)')
+    parser.add_argument('--simultaneous', action='store_true', help='Les deux joueurs jouent en même temps, chacun dans son processus')
+    parser.add_argument('--replays', default=None, help='Dossier où enregistrer chaque partie (relecture: python replay.py fichier.npz)')
+    parser.add_argument('--scenarios', default=None, help='Paquet de scénarios généré par scenarios.py build (mêmes dimensions et graines)')
+    parser.add_argument('--batch', action='store_true', help='Toutes les parties en même temps dans un BatchEngine (voir batch.py) : un appel de playBatch par joueur et par étape (sans --workers, --isolate, --simultaneous ni --replays)')
+    parser.add_argument('--quiet', action='store_true', help="N'affiche que le classement final")
+    args = parser.parse_args()
+    if args.batch:
+        # Le BatchEngine joue toutes les parties dans ce processus, sans processus par joueur ni enregistrement
+        for option, value in (('--workers', args.workers), ('--isolate', args.isolate),
+                              ('--simultaneous', args.simultaneous), ('--replays', args.replays)):
+            if value:
+                parser.error('--batch ne peut pas être utilisé avec ' + option)
+
+    config = ChallengeConfig(
+        width=args.width,
+        height=args.height,
+        steps=args.steps,
+        **TOURNAMENT_SETTINGS,
+        playerWorkers=args.isolate,
+        simultaneousMoves=args.simultaneous,
+        scenarioPack=args.scenarios,
+    )
+
+    if args.batch:
+        import batch # pylint: disable=import-outside-toplevel
+        leaderboard = batch.runTournament(args.players, args.seeds, config, None if args.quiet else printGame)
+    else:
+        leaderboard = runTournament(args.players, args.seeds, config, args.workers, None if args.quiet else printGame, args.replays)
+    print()
+    print(leaderboard.format())
+
+if __name__ == "__main__":
+    main()
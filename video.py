@@ -0,0 +1,353 @@
+# Enregistrement vidéo des parties : images rendues hors écran dans un processus séparé, en PNG ou envoyées à ffmpeg
+# ChallengeConfig(videoPath='partie.mp4') ou videoPath='images' (un PNG par étape), ou python video.py partie.npz partie.mp4
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import multiprocessing
+import queue
+import shutil
+import subprocess
+import sys
+import traceback
+import numpy as np
+import pygame
+import assets
+from engine import ChallengeConfig, ChallengeEngine, applyChanges
+from renderer import Camera, MazeRenderer
+
+# Extensions écrites par ffmpeg ; tout autre chemin est un dossier d'images PNG
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.avi', '.mov', '.gif')
+
+class Snapshot:
+    """
+        L'état d'une étape tel que nécessaire au dessin : positions, types, scores, et les cellules modifiées depuis
+        l'image précédente mise dans la file.
+    """
+    __slots__ = ('step', 'positions', 'types', 'scores', 'indices', 'values')
+
+    def __init__(self, step: int, positions, types, scores, indices, values) -> None:
+        self.step = step
+        self.positions = positions
+        self.types = types
+        self.scores = scores
+        self.indices = indices
+        self.values = values
+
+class PngWriter:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, surface: pygame.Surface):
+        pygame.image.save(surface, os.path.join(self.path, 'frame{:06d}.png'.format(self.count)))
+        self.count += 1
+
+    def close(self):
+        pass
+
+class FfmpegWriter:
+    """
+        Envoie les images brutes (RGB) à un processus ffmpeg local, qui les encode dans path.
+    """
+    def __init__(self, path: str, size: tuple[int, int], fps: int) -> None:
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise RuntimeError('ffmpeg not found: install it, or give a folder to write PNG images instead')
+        self.process = subprocess.Popen([
+            executable, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', '{}x{}'.format(*size), '-r', str(fps), '-i', '-',
+            '-pix_fmt', 'yuv420p', path,
+        ], stdin=subprocess.PIPE)
+
+    def write(self, surface: pygame.Surface):
+        self.process.stdin.write(pygame.image.tobytes(surface, 'RGB'))
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError('ffmpeg exited with status ' + str(self.process.returncode))
+
+def openWriter(path: str, size: tuple[int, int], fps: int):
+    if path.lower().endswith(VIDEO_EXTENSIONS):
+        return FfmpegWriter(path, size, fps)
+    return PngWriter(path)
+
+class FrameRenderer:
+    """
+        Dessine les étapes d'une partie sur une surface hors écran (sans fenêtre) : une barre d'état en haut, puis le
+        labyrinthe vu par une Camera qui suit le joueur 1 lorsqu'il ne tient pas en entier. Comme dans Challenge, seules
+        les cellules modifiées et celles quittées ou atteintes par les joueurs sont redessinées d'une image à l'autre.
+        La hauteur de la barre est un vingtième de celle de l'image.
+    """
+    def __init__(self, config: ChallengeConfig, maze: np.ndarray, names: list[str], size: tuple[int, int]) -> None:
+        self.config = ChallengeConfig(**config.configKwargs())
+        self.config.marginLeft = 0
+        self.barHeight = max(20, size[1] // 20)
+        self.config.marginTop = self.barHeight
+        self.maze = np.array(maze)
+        self.height, self.width = self.maze.shape
+        self.names = names
+        self.size = size
+        self.surface = pygame.Surface(size)
+        self.renderer = MazeRenderer(self.config, assets.Images())
+        self.camera = Camera(self.width, self.height)
+        self.camera.follow = 1
+        self.font = assets.font(self.barHeight * 4 // 5)
+        self.drawn = False
+        self.drawnPositions = ()
+
+    def draw(self, snapshot: Snapshot):
+        dirty = set()
+        if len(snapshot.indices):
+            cells = applyChanges(self.maze, snapshot.indices, snapshot.values)
+            dirty = {(int(i) % self.width, int(i) // self.width) for i in cells}
+        changed = self.camera.update(self.size[0], self.size[1] - self.barHeight, snapshot.positions[0])
+        self.renderer.resize(self.camera.cellWidth, self.camera.cellHeight)
+        self.renderer.setView(self.camera.x, self.camera.y, self.camera.columns, self.camera.rows)
+        if changed or not self.drawn:
+            self.surface.fill(self.config.bgColor)
+            self.renderer.drawMaze(self.surface, self.maze)
+            self.drawn = True
+        else:
+            for x, y in dirty.union(self.drawnPositions):
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    self.renderer.drawCell(self.surface, self.maze, x, y)
+        self.renderer.drawIcon(self.surface, 'p1', snapshot.positions[0])
+        if self.names[1]:
+            self.renderer.drawIcon(self.surface, 'p2', snapshot.positions[1])
+        self.drawnPositions = tuple(snapshot.positions)
+        self.drawBar(snapshot)
+        return self.surface
+
+    def drawBar(self, snapshot: Snapshot):
+        self.surface.fill(self.config.bgColor, pygame.Rect(0, 0, self.size[0], self.barHeight))
+        x = 10
+        parts = [('Étape: {} / {}'.format(snapshot.step, self.config.steps), self.config.miscColor)]
+        for n, color in ((0, self.config.player1Color), (1, self.config.player2Color)):
+            if self.names[n]:
+                label = ChallengeEngine.TYPE_LABELS[snapshot.types[n]]
+                parts.append(('{} : {} ({})'.format(self.names[n], int(snapshot.scores[n]), label), color))
+        for text, color in parts:
+            t = self.font.render(text, True, color, self.config.bgColor)
+            self.surface.blit(t, (x, (self.barHeight - t.get_height()) // 2))
+            x += t.get_width() + self.barHeight
+
+class VideoRecorder:
+    """
+        Enregistre une partie sans ralentir la simulation : capture ne fait que mettre un Snapshot dans une file de
+        QUEUE_SIZE images, qu'un processus séparé (qui ne partage donc pas le GIL avec la simulation) dessine
+        (FrameRenderer) et écrit (PNG ou ffmpeg). Seul close attend ce processus : la file garde les premières images
+        le temps qu'il démarre.
+        Avec dropFrames (parties en cours), une image est abandonnée si la file est pleine ; ses modifications de
+        cellules sont reportées sur l'image suivante, qui reste donc exacte, et la dernière image abandonnée est écrite
+        par close. Sans dropFrames (conversion d'une partie enregistrée, exportReplay), capture attend qu'une place se
+        libère, tant que le processus de rendu est en vie.
+    """
+    QUEUE_SIZE = 32
+    # Intervalle (secondes) entre deux vérifications que le processus de rendu est en vie pendant une attente de la file
+    PUT_TIMEOUT = 0.5
+    FRAME_SIZE = (1280, 720)
+
+    def __init__(self, config: ChallengeConfig, maze: np.ndarray, names: list[str], path: str, fps: int = 30,
+                 dropFrames: bool = True, size: tuple[int, int] = None) -> None:
+        size = size or self.FRAME_SIZE
+        # Les encodeurs vidéo (yuv420p) demandent des dimensions paires
+        self.size = (size[0] // 2 * 2, size[1] // 2 * 2)
+        if path.lower().endswith(VIDEO_EXTENSIONS) and shutil.which('ffmpeg') is None:
+            raise RuntimeError('ffmpeg not found: install it, or give a folder to write PNG images instead')
+        self.dropFrames = dropFrames
+        self.changeIndices = []
+        self.changeValues = []
+        self.dtype = maze.dtype
+        self.frames = 0
+        self.dropped = 0
+        self.ready = False
+        self.last = None
+        context = multiprocessing.get_context('spawn')
+        self.queue = context.Queue(self.QUEUE_SIZE)
+        self.results, child = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=renderFrames,
+            args=(self.queue, child, config.configKwargs(), np.array(maze), names, path, fps, self.size),
+            name='video',
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def cellChanged(self, i: int, value: int):
+        self.changeIndices.append(i)
+        self.changeValues.append(value)
+
+    def cellsChanged(self, indices, values):
+        self.changeIndices.extend(indices)
+        self.changeValues.extend(values)
+
+    def waitReady(self):
+        """
+            Attend que le processus de rendu ait ouvert sa sortie (ou échoué : l'erreur est alors retournée par close).
+        """
+        if self.ready:
+            return
+        self.ready = True
+        try:
+            self.results.recv()
+        except EOFError:
+            pass
+
+    def put(self, item):
+        """
+            Met item dans la file en attendant qu'une place se libère ; retourne False si le processus de rendu s'est
+            arrêté entre-temps (la file ne sera alors plus jamais vidée).
+        """
+        while True:
+            try:
+                self.queue.put(item, timeout=self.PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                if not self.process.is_alive():
+                    return False
+
+    def capture(self, step: int, positions, types, scores):
+        snapshot = Snapshot(
+            step, positions, types, scores,
+            np.array(self.changeIndices, dtype=np.int64), np.array(self.changeValues, dtype=self.dtype),
+        )
+        if self.dropFrames:
+            try:
+                self.queue.put(snapshot, block=False)
+            except queue.Full:
+                self.dropped += 1
+                self.last = snapshot
+                return
+        elif not self.put(snapshot):
+            # Le processus de rendu s'est arrêté : close en retourne l'erreur
+            return
+        self.last = None
+        self.changeIndices = []
+        self.changeValues = []
+
+    def close(self):
+        """
+            Écrit la dernière image si elle a été abandonnée, attend que les images en file soient écrites puis ferme la
+            sortie. Si le processus de rendu s'arrête avant, close retourne une erreur avec son code de sortie au lieu
+            d'attendre.
+        """
+        alive = True
+        if self.last is not None:
+            alive = self.put(self.last)
+            if alive:
+                self.dropped -= 1
+                self.last = None
+        alive = alive and self.put(None)
+        error = None
+        try:
+            if not alive:
+                raise EOFError()
+            self.waitReady()
+            self.frames, error = self.results.recv()
+        except EOFError:
+            self.process.join()
+            error = 'Video process exited with status ' + str(self.process.exitcode)
+            # Les images encore en file ne seront jamais lues : ne pas attendre leur envoi à la fermeture
+            self.queue.cancel_join_thread()
+        self.process.join()
+        self.queue.close()
+        self.results.close()
+        if error is not None:
+            raise RuntimeError(error)
+        if self.dropped:
+            sys.stderr.write('Vidéo : {} images abandonnées sur {} (le rendu est plus lent que la partie)\n'.format(
+                self.dropped, self.frames + self.dropped))
+
+def renderFrames(frames, results, configKwargs: dict, maze: np.ndarray, names: list[str], path: str, fps: int, size: tuple[int, int]):
+    """
+        Boucle du processus de VideoRecorder : signale qu'il est prêt, dessine et écrit chaque Snapshot jusqu'à None,
+        puis envoie le nombre d'images écrites et l'erreur éventuelle. La file est vidée même après une erreur, pour ne
+        jamais bloquer capture.
+    """
+    count = 0
+    error = None
+    writer = None
+    try:
+        pygame.font.init()
+        writer = openWriter(path, size, fps)
+        renderer = FrameRenderer(ChallengeConfig(**configKwargs), maze, names, size)
+    except Exception: # pylint: disable=broad-except
+        error = traceback.format_exc()
+    results.send(None)
+    while True:
+        snapshot = frames.get()
+        if snapshot is None:
+            break
+        if error is not None:
+            continue
+        try:
+            writer.write(renderer.draw(snapshot))
+            count += 1
+        except Exception: # pylint: disable=broad-except
+            error = traceback.format_exc()
+    if writer is not None:
+        try:
+            writer.close()
+        except Exception: # pylint: disable=broad-except
+            error = error or traceback.format_exc()
+    results.send((count, error))
+    results.close()
+
+def exportReplay(replay, path: str, fps: int = 30, size: tuple[int, int] = None):
+    """
+        Écrit toutes les étapes d'une partie enregistrée (voir replay.py), sans en abandonner aucune.
+    """
+    recorder = VideoRecorder(replay.config, replay.initialMaze, replay.names + [''] * (2 - len(replay.names)), path, fps, False, size)
+    try:
+        for step in range(replay.steps + 1):
+            if step:
+                indices, values = replay.changesBetween(step - 1, step)
+                recorder.cellsChanged(indices.tolist(), values.tolist())
+            row = replay.rows[step]
+            recorder.capture(
+                step,
+                (tuple(int(v) for v in row['position1']), tuple(int(v) for v in row['position2'])),
+                (int(row['type1']), int(row['type2'])),
+                (int(row['score1']), int(row['score2'])),
+            )
+    finally:
+        recorder.close()
+    return recorder.frames
+
+def main():
+    from replay import Replay # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description="Vidéo (ou images PNG) d'une partie enregistrée avec replayPath=...")
+    parser.add_argument('replay', help='Partie enregistrée (.npz)')
+    parser.add_argument('output', help='Fichier vidéo (' + ', '.join(VIDEO_EXTENSIONS) + ', avec ffmpeg) ou dossier d\'images PNG')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--width', type=int, default=VideoRecorder.FRAME_SIZE[0])
+    parser.add_argument('--height', type=int, default=VideoRecorder.FRAME_SIZE[1])
+    args = parser.parse_args()
+
+    frames = exportReplay(Replay(args.replay), args.output, args.fps, (args.width, args.height))
+    print('{} images écrites dans {}'.format(frames, args.output))
+
+if __name__ == '__main__':
+    main()
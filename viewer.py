@@ -0,0 +1,479 @@
+# Affichage des parties avec pygame
+# Importé uniquement à la création d'une fenêtre : challenge.Challenge et challenge.ReplayViewer pointent ici
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import time
+import numpy as np
+import pygame
+import assets
+from engine import ChallengeEngine, BasePlayer, FreeCells
+from renderer import Camera, MazeRenderer
+
+class Challenge(ChallengeEngine):
+    FAST_FORWARD_FPS = 30
+    PAN_KEYS = {pygame.K_w: (0, -1), pygame.K_a: (-1, 0), pygame.K_s: (0, 1), pygame.K_d: (1, 0)}
+    def __init__(self, *args, **kwargs) -> None:
+        self.dirtyCells = set()
+        super().__init__(*args, **kwargs)
+        self.runTime = None
+        self.runTimeElapsed = False
+
+        self.running = False
+        self.surface = None
+
+        # Seuls l'affichage et les polices sont initialisés ; le son ne l'est qu'au premier son joué (voir assets.py)
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_caption(self.title)
+        self.createSurface()
+
+        self.renderer = MazeRenderer(self, assets.Images())
+        self.camera = Camera(self.width, self.height)
+        self.dragPixels = None
+        self.fullRedraw = True
+        self.drawnPlayerPositions = ()
+        self.drawnStep = None
+
+        font = assets.font(32)
+        self.star1Text = font.render("Entre 1 et " + str(self.score1Value) + " points", True, self.miscColor)
+        self.star2Text = font.render("Entre " + str(self.score1Value + 1) + " et " + str(self.score2Value) + " points", True, self.miscColor)
+        self.star3Text = font.render("Entre -3 et " + str(self.scoreMinValue) + " points", True, self.miscColor)
+        self.refreshText = font.render("Changement de type", True, self.miscColor)
+        self.fastForwardText = font.render("Avance rapide (F)", True, self.miscColor)
+
+        self.typeTexts = []
+        for t in self.TYPE_LABELS:
+            t = font.render(t, True, self.miscColor)
+            self.typeTexts.append(t)
+
+        self.scoreFont = assets.font(42)
+
+        self.player1Text = None
+        self.player2Text = None
+
+    @property
+    def cellHeight(self):
+        return self.camera.cellHeight
+
+    @property
+    def cellWidth(self):
+        return self.camera.cellWidth
+
+    def updateView(self):
+        """
+            Met la caméra à jour pour la taille de la fenêtre et le joueur suivi. Retourne True (et demande une image
+            complète) si la partie visible du labyrinthe a changé.
+        """
+        sw = self.windowWidth - self.marginLeft - self.marginRight
+        sh = self.windowHeight - self.marginTop - self.marginBottom
+        target = None
+        if self.camera.follow == 1:
+            target = self.player1Position
+        elif self.camera.follow == 2 and self.player2:
+            target = self.player2Position
+        changed = self.camera.update(sw, sh, target)
+        self.renderer.resize(self.camera.cellWidth, self.camera.cellHeight)
+        self.renderer.setView(self.camera.x, self.camera.y, self.camera.columns, self.camera.rows)
+        if changed:
+            self.fullRedraw = True
+        return changed
+
+    @property
+    def P1Image(self):
+        return assets.image('p1')
+
+    @property
+    def P2Image(self):
+        return assets.image('p2')
+
+    def createSurface(self):
+        self.surface = pygame.display.set_mode((self.windowWidth, self.windowHeight), pygame.RESIZABLE)
+
+    def playSound(self, name: str):
+        if not self.playSounds or self.fastForward:
+            return
+        sound = assets.sound(name)
+        sound.stop()
+        sound.play()
+
+    def drawMargin(self):
+        x0, y0 = 10, 50
+        mx0, mx1, mx2 = 40, 10, 64
+        my1, my2, my3, my4, my5 = 10, 100, 100, 100, 35
+
+        maxTextWidth = self.marginLeft - self.P1Image.get_width() - mx0
+
+        self.surface.blit(self.P1Image, (x0, y0 + (self.player1Text.get_height() - self.P1Image.get_height()) // 2))
+        t = self.drawText(self.player1Text, pygame.Rect(x0 + mx1 + self.P1Image.get_width(), y0, min(maxTextWidth, self.player1Text.get_width()), self.player1Text.get_height()))
+
+        y0 += t.get_height() + my1
+        t = self.typeTexts[self.player1Type]
+        self.drawText(t, pygame.Rect(x0 + mx2 + mx1, y0, t.get_width(), t.get_height()))
+
+        y0 += t.get_height() + my1
+        st = str(int(self.player1Score))
+        st = self.scoreFont.render(st, True, self.scoreColor)
+        self.drawText(st, pygame.Rect(x0 + mx1 + self.P1Image.get_width(), y0, min(maxTextWidth, st.get_width()), st.get_height()))
+
+        if self.player2:
+            y0 += my2
+            self.surface.blit(self.P2Image, (x0, y0 + (self.player2Text.get_height() - self.P2Image.get_height()) // 2))
+            t = self.drawText(self.player2Text, pygame.Rect(x0 + mx1 + self.P2Image.get_width(), y0, min(maxTextWidth, self.player2Text.get_width()), self.player2Text.get_height()))
+
+            y0 += t.get_height() + my1
+            t = self.typeTexts[self.player2Type]
+            self.drawText(t, pygame.Rect(x0 + mx2 + mx1, y0, t.get_width(), t.get_height()))
+
+            y0 += t.get_height() + my1
+            st = str(int(self.player2Score))
+            st = self.scoreFont.render(st, True, self.scoreColor)
+            self.drawText(st, pygame.Rect(x0 + mx1 + self.P2Image.get_width(), y0, min(maxTextWidth, st.get_width()), st.get_height()))
+
+        y0 += my3
+        st = 'Étape: ' + str(int(self.currentStep)) + " / " + str(int(self.steps)) 
+        st = self.scoreFont.render(st, True, self.scoreColor)
+        self.drawText(st, pygame.Rect(x0 + mx1, y0, min(maxTextWidth, st.get_width()), st.get_height()))
+        if self.fastForward:
+            t = self.fastForwardText
+            self.drawText(t, pygame.Rect(x0 + mx1, y0 + st.get_height(), min(maxTextWidth, t.get_width()), t.get_height()))
+
+        y0 += my4
+        for i, t in (('star1', self.star1Text),('star2', self.star2Text),('star3', self.star3Text),('refresh', self.refreshText) if self.enableRPCGame else (None, None),):
+            if not i:
+                continue
+            i = self.renderer.scaled(i, (32, 32))
+            self.surface.blit(i, (x0, y0 + (t.get_height() - i.get_height()) // 2))
+            self.drawText(t, pygame.Rect(x0 + mx1 + i.get_width(), y0, x0 + mx1 + min(maxTextWidth, t.get_width()), y0 + t.get_height()))
+            y0 += my5
+
+    def drawText(self, t: pygame.Surface, rect: pygame.Rect):
+        tr = t.get_rect()
+        r = min(rect.width / tr.width, rect.height / tr.height)
+        rect.width = int(tr.width * r)
+        rect.height = int(tr.height * r)
+        t = pygame.transform.scale(t, rect.size)
+        self.surface.blit(t, rect)
+        return t
+
+    def drawMaze(self):
+        return self.renderer.drawMaze(self.surface, self.maze)
+
+    def drawPlayers(self):
+        rects = [self.renderer.drawIcon(self.surface, 'p1', self.player1Position)]
+        if self.player2:
+            rects.append(self.renderer.drawIcon(self.surface, 'p2', self.player2Position))
+        return rects
+
+    def drawEnd(self):
+        font = assets.font(74)
+        text = font.render(f"Fin de partie.", True, (255, 255, 0))
+        text_rect = text.get_rect(center=(self.windowWidth // 2, self.windowHeight // 2))
+        background_rect = pygame.Rect(text_rect.left - 40, text_rect.top - 40, text_rect.width + 80, text_rect.height + 80)
+        pygame.draw.rect(self.surface, (0, 0, 255), background_rect)
+        self.surface.blit(text, text_rect)
+
+    def drawRemainingTime(self, r):
+        r = round(r)
+        font = assets.font(74)
+        text = font.render(f"Début dans: " + str(r), True, (255, 255, 0))
+        text_rect = text.get_rect(center=(self.windowWidth // 2, self.windowHeight // 2))
+        background_rect = pygame.Rect(text_rect.left - 40, text_rect.top - 40, text_rect.width + 80, text_rect.height + 80)
+        pygame.draw.rect(self.surface, (0, 0, 255), background_rect)
+        self.surface.blit(text, text_rect)
+
+    def draw(self):
+        self.updateView()
+        if self.fullRedraw or self.currentStep >= self.steps or not self.runTimeElapsed:
+            self.drawAll()
+        else:
+            self.drawChanges()
+
+    def drawAll(self):
+        self.updateView()
+        self.surface.fill(self.bgColor)
+        self.drawMargin()
+        self.drawMaze()
+        self.drawPlayers()
+        if self.currentStep >= self.steps:
+            self.drawEnd()
+        if not self.runTimeElapsed:
+            self.drawRemainingTime(self.delayToRun - time.time() + self.runTime)
+        pygame.display.flip()
+        self.fullRedraw = False
+        self.dirtyCells.clear()
+        self.drawnPlayerPositions = (self.player1Position, self.player2Position)
+
+    def drawChanges(self):
+        """
+            Ne redessine que le panneau de gauche, les cellules modifiées depuis la dernière image, et les cellules
+            quittées ou atteintes par les joueurs.
+        """
+        if self.updateView():
+            self.drawAll()
+            return
+        marginRect = pygame.Rect(0, 0, self.marginLeft, self.windowHeight)
+        self.surface.fill(self.bgColor, marginRect)
+        self.drawMargin()
+        rects = [marginRect]
+
+        for x, y in self.dirtyCells.union(self.drawnPlayerPositions):
+            if 0 <= x < self.width and 0 <= y < self.height:
+                rects.append(self.renderer.drawCell(self.surface, self.maze, x, y))
+        rects.extend(self.drawPlayers())
+        pygame.display.update(rects)
+        self.dirtyCells.clear()
+        self.drawnPlayerPositions = (self.player1Position, self.player2Position)
+
+    def playScoreSound(self, x, y):
+        if not self.playSounds or self.fastForward:
+            return
+        oldCell = self.maze[y][x]
+        if oldCell == -2:
+            self.playSound('refresh')
+        elif oldCell < 0:
+            self.playSound('star3')
+        elif oldCell > 0:
+            if oldCell <= self.score1Value:
+                self.playSound('star1')
+            else:
+                self.playSound('star2')
+
+    def setCell(self, x, y, value):
+        super().setCell(x, y, value)
+        self.dirtyCells.add((x, y))
+
+    def onCellConsumed(self, x, y, cell):
+        self.playScoreSound(x, y)
+
+    def onCross(self, winner):
+        self.playSound('cross')
+
+    def registerPlayers(self, player1: BasePlayer, player2: BasePlayer = None):
+        super().registerPlayers(player1, player2)
+
+        font = assets.font(56)
+        self.player1Text = font.render(self.player1.name, True, self.player1Color)
+        if self.player2:
+            self.player2Text = font.render(self.player2.name, True, self.player2Color)
+
+    def handleEvents(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.VIDEORESIZE:
+                self.windowWidth = event.w
+                self.windowHeight = event.h
+                self.createSurface()
+                self.fullRedraw = True
+                self.draw()
+            elif event.type == pygame.KEYDOWN:
+                self.onKey(event.key)
+            elif event.type == pygame.MOUSEWHEEL:
+                self.camera.zoom(2 if event.y > 0 else 0.5, self.cellAt(pygame.mouse.get_pos()))
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.dragPixels = (0, 0)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.dragPixels = None
+            elif event.type == pygame.MOUSEMOTION and self.dragPixels is not None:
+                self.drag(event.rel)
+
+    def cellAt(self, pixel):
+        """
+            La case sous le pixel donné de la fenêtre, None hors du labyrinthe.
+        """
+        c = self.camera
+        if not c.cellWidth or not c.cellHeight:
+            return None
+        x = (pixel[0] - self.marginLeft) // c.cellWidth
+        y = (pixel[1] - self.marginTop) // c.cellHeight
+        if 0 <= x < c.columns and 0 <= y < c.rows:
+            return (c.x + x, c.y + y)
+        return None
+
+    def drag(self, rel):
+        """
+            Déplace la vue avec la souris (bouton gauche enfoncé), d'une case chaque fois que le déplacement cumulé
+            atteint la taille d'une cellule.
+        """
+        px, py = self.dragPixels[0] + rel[0], self.dragPixels[1] + rel[1]
+        c = self.camera
+        dx, dy = int(px / c.cellWidth), int(py / c.cellHeight)
+        if dx or dy:
+            c.pan(-dx, -dy)
+        self.dragPixels = (px - dx * c.cellWidth, py - dy * c.cellHeight)
+
+    def onKey(self, key):
+        """
+            F : avance rapide. Caméra : Page haut / Page bas (zoom), W A S D (déplacement), 1 / 2 (suivre un joueur),
+            0 (labyrinthe entier). La molette zoome sous le curseur et le bouton gauche déplace la vue.
+        """
+        c = self.camera
+        if key == pygame.K_f:
+            self.fastForward = not self.fastForward
+        elif key == pygame.K_PAGEUP:
+            c.zoom(2)
+        elif key == pygame.K_PAGEDOWN:
+            c.zoom(0.5)
+        elif key in self.PAN_KEYS:
+            dx, dy = self.PAN_KEYS[key]
+            c.pan(dx * max(1, c.columns // 4), dy * max(1, c.rows // 4))
+        elif key in (pygame.K_1, pygame.K_KP1):
+            c.follow = 0 if c.follow == 1 else 1
+        elif key in (pygame.K_2, pygame.K_KP2) and self.player2:
+            c.follow = 0 if c.follow == 2 else 2
+        elif key in (pygame.K_0, pygame.K_KP0):
+            c.fit()
+
+    def run(self):
+        """
+            La simulation et l'affichage ont chacun leur horloge : une étape est jouée toutes les stepDelay ms (ou dès que
+            possible en avance rapide), et l'état le plus récent est affiché au plus targetFps fois par seconde. Les étapes
+            jouées entre deux images ne sont pas affichées.
+            La touche F active ou désactive l'avance rapide ; les autres touches déplacent la caméra (voir onKey).
+        """
+        self.running = True
+        self.runTime = time.time()
+        self.draw()
+        nextStep = nextFrame = time.perf_counter()
+        while self.running:
+            self.handleEvents()
+
+            fps = self.FAST_FORWARD_FPS if self.fastForward else self.targetFps
+            frameInterval = 1 / fps if fps > 0 else 0
+            now = time.perf_counter()
+
+            if not self.runTimeElapsed:
+                self.runTimeElapsed = time.time() - self.runTime >= self.delayToRun
+                self.fullRedraw = self.runTimeElapsed
+                nextStep = now
+            elif self.currentStep < self.steps:
+                if self.fastForward:
+                    self.step()
+                    while self.currentStep < self.steps and time.perf_counter() < nextFrame:
+                        self.step()
+                elif now >= nextStep:
+                    self.step()
+                    nextStep = max(nextStep + self.stepDelay / 1000, now)
+
+            now = time.perf_counter()
+            if now >= nextFrame:
+                if not self.runTimeElapsed or self.fullRedraw or self.drawnStep != self.currentStep:
+                    start = time.perf_counter_ns()
+                    self.draw()
+                    self.recordTime('render', time.perf_counter_ns() - start)
+                    self.drawnStep = self.currentStep
+                nextFrame = max(nextFrame + frameInterval, now)
+
+            # Sans étape à jouer (compte à rebours, partie finie, attente de l'étape suivante), la boucle dort jusqu'à
+            # la prochaine échéance au lieu de tourner à vide, y compris en avance rapide
+            wake = nextFrame
+            if self.runTimeElapsed and self.currentStep < self.steps:
+                wake = now if self.fastForward else min(nextStep, nextFrame)
+            wait = wake - time.perf_counter()
+            if wait > 0:
+                start = time.perf_counter_ns()
+                pygame.time.wait(min(int(wait * 1000), 10))
+                self.recordTime('idle', time.perf_counter_ns() - start)
+        self.close()
+        assets.clear()
+        pygame.quit()
+        if self.metrics is not None:
+            print(self.metrics.format())
+
+class ReplayViewer(Challenge):
+    """
+        Affiche une partie enregistrée (voir replay.py) sans le code des joueurs.
+        Touches : espace (pause), gauche / droite (une étape), haut / bas (50 étapes), début / fin, + / - (vitesse), F.
+    """
+    SEEK_STEPS = 50
+
+    def __init__(self, replay, stepDelay: int = None, startStep: int = 0) -> None:
+        # Replay.configKwargs ne contient aucun chemin de la partie d'origine (replay.PATH_PARAMS)
+        kwargs = dict(replay.configKwargs)
+        kwargs.update(delayToRun=0, playerWorkers=False, simultaneousMoves=False)
+        if stepDelay is not None:
+            kwargs['stepDelay'] = stepDelay
+        # initState (appelée par le constructeur du moteur) part de l'état enregistré
+        self.replay = replay
+        super().__init__(**kwargs)
+        self.paused = False
+
+        players = []
+        for name in replay.names:
+            if name:
+                player = BasePlayer(self)
+                player.name = name
+                players.append(player)
+        self.registerPlayers(*players)
+        self.steps = replay.steps
+        self.seek(startStep)
+
+    def initState(self):
+        """
+            L'état de l'étape 0 de la partie enregistrée, sans rien générer : la relecture ne dépend pas du générateur
+            actuel.
+        """
+        state = self.replay.stateAt(0)
+        self.maze = state.maze
+        self.height, self.width = self.maze.shape
+        self.freeCells = FreeCells(self.maze)
+        self.player1Position, self.player2Position = state.player1Position, state.player2Position
+        self.player1Type, self.player2Type = state.player1Type, state.player2Type
+        self.player1Score, self.player2Score = state.player1Score, state.player2Score
+
+    def seek(self, step: int):
+        """
+            Place l'affichage sur l'état de l'étape donnée ; seules les cellules qui diffèrent de l'état courant sont
+            modifiées (et redessinées).
+        """
+        state = self.replay.stateAt(step)
+        for y, x in np.argwhere(state.maze != self.maze).tolist():
+            self.setCell(x, y, state.maze[y, x])
+        self.currentStep = state.step
+        self.player1Position, self.player2Position = state.player1Position, state.player2Position
+        self.player1Type, self.player2Type = state.player1Type, state.player2Type
+        self.player1Score, self.player2Score = state.player1Score, state.player2Score
+
+    def step(self):
+        if not self.paused:
+            self.seek(self.currentStep + 1)
+
+    def onKey(self, key):
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_RIGHT:
+            self.seek(self.currentStep + 1)
+        elif key == pygame.K_LEFT:
+            self.seek(self.currentStep - 1)
+        elif key == pygame.K_UP:
+            self.seek(self.currentStep + self.SEEK_STEPS)
+        elif key == pygame.K_DOWN:
+            self.seek(self.currentStep - self.SEEK_STEPS)
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(self.steps)
+        elif key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+            self.stepDelay = max(1, self.stepDelay // 2)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.stepDelay = min(2000, self.stepDelay * 2)
+        else:
+            super().onKey(key)
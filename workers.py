@@ -0,0 +1,241 @@
+# Exécution des joueurs dans des processus dédiés et persistants
+# Activé par ChallengeConfig(playerWorkers=True)
+
+# #################################################################################################
+
+"""
+Copyright 2024 Sadi Samy <samy.sadi at ummto.dz>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+import multiprocessing
+import pickle
+import time
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from engine import TimeoutError, BasePlayer, readOnlyView
+
+class PlayerException(Exception):
+    """
+        Exception levée par le joueur dans son processus ; le message contient la trace d'origine.
+    """
+
+def workerMain(conn, playerBytes: bytes, shmName: str, shape: tuple[int, int], dtype: str, readOnly: bool):
+    player = pickle.loads(playerBytes)
+    shm = SharedMemory(name=shmName)
+    maze = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    view = readOnlyView(maze)
+    conn.send(('ready',))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message[0] == 'stop':
+            break
+        callId, args = message[1], message[2:]
+        m = view if readOnly else np.copy(maze)
+        start = time.perf_counter_ns()
+        try:
+            p = player.play(m, *args)
+            reply = (callId, 'ok', p, time.perf_counter_ns() - start)
+        except Exception: # pylint: disable=broad-except
+            reply = (callId, 'error', traceback.format_exc(), time.perf_counter_ns() - start)
+        try:
+            conn.send(reply)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            conn.send((callId, 'error', traceback.format_exc(), time.perf_counter_ns() - start))
+
+class PlayerWorker:
+    """
+        Un joueur exécuté dans son propre processus, qui reste en vie pendant toute la partie.
+
+        Le labyrinthe est recopié dans un bloc de mémoire partagée avant chaque appel ; le reste de l'état passe par un
+        tube. L'échéance de chaque coup est mesurée avec une horloge monotone : si le joueur ne répond pas à temps, son
+        processus est tué et un nouveau est lancé (avec l'état initial du joueur) pendant que la partie continue. Le
+        moteur n'attend jamais ce redémarrage au-delà de l'échéance du coup suivant. Quand plusieurs joueurs réfléchissent
+        en même temps, receive(restart=False) puis recover() repoussent ce redémarrage après la lecture de toutes les
+        réponses.
+    """
+    STARTUP_TIMEOUT = 30
+
+    def __init__(self, player: BasePlayer, maze: np.ndarray, readOnly: bool = False) -> None:
+        self.name = player.name
+        self.playerBytes = pickle.dumps(player)
+        self.readOnly = readOnly
+        self.context = multiprocessing.get_context('spawn')
+
+        self.shm = SharedMemory(create=True, size=max(1, maze.nbytes))
+        self.maze = np.ndarray(maze.shape, dtype=maze.dtype, buffer=self.shm.buf)
+
+        self.process = None
+        self.conn = None
+        self.ready = False
+        self.callId = 0
+        self.pending = None
+        self.crashed = False
+        self.failed = False
+        self.deadline = 0
+        self.maxNs = 0
+        self.startNs = 0
+
+        self.calls = 0
+        self.restarts = 0
+        self.thinkNs = 0
+        self.overheadNs = 0
+
+        self.start()
+        self.waitReady(time.monotonic() + self.STARTUP_TIMEOUT)
+
+    def start(self):
+        self.conn, child = self.context.Pipe()
+        self.process = self.context.Process(
+            target=workerMain,
+            args=(child, self.playerBytes, self.shm.name, self.maze.shape, self.maze.dtype.str, self.readOnly),
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self.ready = False
+
+    def kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+            self.process = None
+
+    def restart(self):
+        self.kill()
+        self.pending = None
+        self.restarts += 1
+        self.start()
+
+    def waitReady(self, deadline: float):
+        if self.ready:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self.conn.poll(remaining):
+            raise TimeoutError('Player process is not ready')
+        self.conn.recv()
+        self.ready = True
+
+    @property
+    def averageOverheadUs(self):
+        """
+            Coût moyen d'un appel en plus du temps de réflexion du joueur (copie du labyrinthe, tube, réveil du processus).
+        """
+        return self.overheadNs / self.calls / 1000 if self.calls else 0
+
+    def send(self, maze: np.ndarray, maxTime: int, *args):
+        """
+            Démarre un appel à BasePlayer.play avec une limite de maxTime ms, sans attendre la réponse (voir receive).
+            Permet de faire réfléchir plusieurs joueurs en même temps.
+        """
+        self.deadline = time.monotonic() + maxTime / 1000
+        self.maxNs = maxTime * 1000000
+        self.startNs = time.perf_counter_ns()
+        self.maze[...] = maze
+        self.callId += 1
+        self.pending = ('play', self.callId) + args
+        self.crashed = False
+        try:
+            self.flush()
+        except (EOFError, OSError):
+            self.crashed = True
+
+    def flush(self):
+        if self.pending is None:
+            return
+        if not self.ready:
+            if not self.conn.poll(0):
+                return
+            self.conn.recv()
+            self.ready = True
+        self.conn.send(self.pending)
+        self.pending = None
+
+    def receive(self, restart: bool = True):
+        """
+            Attend la réponse de l'appel démarré par send. Lève TimeoutError si le joueur est trop lent, et
+            PlayerException si le joueur a levé une exception. Une réponse déjà arrivée est lue même après l'échéance
+            (le joueur a pu attendre qu'un autre soit lu) : c'est alors son temps de réflexion qui compte.
+            Avec restart=False, le processus d'un joueur trop lent ou arrêté n'est relancé que par recover.
+        """
+        try:
+            if self.crashed:
+                raise EOFError()
+            if self.pending is not None:
+                try:
+                    self.waitReady(self.deadline)
+                except TimeoutError:
+                    self.pending = None
+                    raise
+                self.flush()
+            while True:
+                remaining = self.deadline - time.monotonic()
+                if not self.conn.poll(max(0, remaining)):
+                    self.fail(restart)
+                    raise TimeoutError('Timed out')
+                reply = self.conn.recv()
+                if reply[0] == self.callId:
+                    break
+        except (EOFError, OSError):
+            self.fail(restart)
+            raise PlayerException('Player process crashed')
+
+        _, status, value, thinkNs = reply
+        if thinkNs > self.maxNs:
+            raise TimeoutError('Timed out')
+        self.calls += 1
+        self.thinkNs += thinkNs
+        self.overheadNs += time.perf_counter_ns() - self.startNs - thinkNs
+        if status == 'error':
+            raise PlayerException(value)
+        return value
+
+    def fail(self, restart: bool):
+        if restart:
+            self.restart()
+        else:
+            self.failed = True
+
+    def recover(self):
+        """
+            Relance le processus si le dernier receive(restart=False) a échoué.
+        """
+        if self.failed:
+            self.failed = False
+            self.restart()
+
+    def play(self, maze: np.ndarray, maxTime: int, *args):
+        """
+            Comme BasePlayer.play, avec une limite de maxTime ms (voir send et receive).
+        """
+        self.send(maze, maxTime, *args)
+        return self.receive()
+
+    def close(self):
+        if self.process is not None:
+            try:
+                self.conn.send(('stop',))
+            except (OSError, BrokenPipeError):
+                pass
+            self.process.join(1)
+            self.kill()
+        self.maze = None
+        self.shm.close()
+        self.shm.unlink()